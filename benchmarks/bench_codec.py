@@ -0,0 +1,56 @@
+# bench_codec.py
+"""
+Microbenchmark of the generated LCM decode against the reusable decoder.
+
+Reports the time per decoded agent_move_t message and the memory allocated while decoding one
+message, as traced by tracemalloc.
+"""
+import argparse
+import timeit
+import tracemalloc
+
+from coding_challenge.codec import ReusableDecoder
+import coding_challenge.messages as messages
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark LCM message decoding")
+    parser.add_argument("--iterations", type=int, default=200_000, help="Number of decoded messages per run")
+    return parser.parse_args()
+
+
+def measure_allocated_bytes(decode, data: bytes) -> int:
+    """
+    Measure the peak memory allocated while decoding a single message.
+    """
+    decode(data)  # Warm up caches before tracing
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    decode(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - baseline
+
+
+def main(args):
+    msg = messages.agent_move_t()
+    msg.agent_id = "determined_lederberg"
+    msg.x = 3
+    msg.y = 7
+    data = msg.encode()
+
+    decoder = ReusableDecoder(messages.agent_move_t)
+    candidates = {
+        "generated": messages.agent_move_t.decode,
+        "reusable": decoder.decode,
+    }
+
+    for name, decode in candidates.items():
+        seconds = min(timeit.repeat(lambda: decode(data), number=args.iterations, repeat=5))
+        allocated = measure_allocated_bytes(decode, data)
+        print(f"{name:>10}: {seconds / args.iterations * 1e9:8.1f} ns/msg, {allocated:5d} B allocated/msg")
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,54 @@
+# bench_env.py
+"""
+Benchmark of the vectorized environment in environment steps per second, in-process and split
+across worker processes.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from coding_challenge.env import VecFreezeTagEnv, SubprocVecFreezeTagEnv
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized environment")
+    parser.add_argument("--width", type=int, default=32, help="Width of the game boards")
+    parser.add_argument("--height", type=int, default=32, help="Height of the game boards")
+    parser.add_argument("--num-not-it", type=int, default=8, help="Number of NotIt agents per game")
+    parser.add_argument("--num-envs", nargs="+", type=int, default=[1, 16, 256, 4096], help="Numbers of games stepped at once")
+    parser.add_argument("--workers", nargs="+", type=int, default=[0, 2, 4], help="Numbers of worker processes, 0 steps in-process")
+    parser.add_argument("--steps", type=int, default=200, help="Steps per measurement")
+    return parser.parse_args()
+
+
+def measure(env, num_envs: int, steps: int) -> float:
+    """
+    Measure the environment steps per second with random It actions.
+    """
+    rng = np.random.default_rng(0)
+    actions = rng.integers(-1, 2, (steps, num_envs, 1, 2))
+    env.reset(seed=0)
+    start_time = time.perf_counter()
+    for step in range(steps):
+        env.step(actions[step])
+    return num_envs * steps / (time.perf_counter() - start_time)
+
+
+def main(args):
+    kwargs = {"N": args.height, "M": args.width, "num_not_it": args.num_not_it, "controlled": "it"}
+    for num_workers in args.workers:
+        for num_envs in args.num_envs:
+            if num_workers:
+                env = SubprocVecFreezeTagEnv(num_envs, num_workers, seed=0, **kwargs)
+            else:
+                env = VecFreezeTagEnv(num_envs, seed=0, **kwargs)
+            try:
+                steps_per_s = measure(env, num_envs, args.steps)
+            finally:
+                env.close()
+            print(f"workers={num_workers} B={num_envs:5d}: {steps_per_s:12,.0f} env steps/s")
+
+
+if __name__ == "__main__":
+    main(parse_args())
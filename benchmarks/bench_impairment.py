@@ -0,0 +1,162 @@
+# bench_impairment.py
+"""
+Benchmark matrix of the game under emulated network impairments.
+
+For every impairment profile, small games are played to measure how long the It agent takes to
+freeze all NotIt agents, and a stream of agent_move messages measures the fraction of messages the
+emulated link delivers and their latency. All nodes run as threads of this process, on the local LCM
+bus, so the numbers describe the emulated link at a rate the emulator sustains, not the capacity of
+a real network.
+"""
+import argparse
+import statistics
+import threading
+import time
+
+import lcm
+import numpy as np
+
+from coding_challenge.agents import ItAgent, NotItAgent
+from coding_challenge.game_node import GameNode
+from coding_challenge.impairment import PROFILES
+from coding_challenge.node import Node
+from coding_challenge.codec import ReusableDecoder
+from coding_challenge.policies import RandomWalkPolicy
+import coding_challenge.messages as messages
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the game under network impairments")
+    parser.add_argument("--profiles", nargs="+", choices=PROFILES, default=list(PROFILES), help="Impairment profiles to measure")
+    parser.add_argument("--width", type=int, default=8, help="Width of the game board")
+    parser.add_argument("--height", type=int, default=8, help="Height of the game board")
+    parser.add_argument("--num-not-it", type=int, default=2, help="Number of NotIt agents")
+    parser.add_argument("--games", type=int, default=3, help="Number of games per profile")
+    parser.add_argument("--speed", type=float, default=4.0, help="Time dilation factor of the games")
+    parser.add_argument("--game-timeout", type=float, default=60.0, help="Game seconds after which a game counts as not captured")
+    parser.add_argument("--stream-rate", type=float, default=500.0, help="Messages per second sent to measure the delivery and latency")
+    parser.add_argument("--stream-duration", type=float, default=2.0, help="Duration in seconds of the message stream")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the impairments and random walks")
+    return parser.parse_args()
+
+
+def play_game(args, profile, seed: int):
+    """
+    Play one game and return the capture time in game seconds, or None if it timed out.
+    """
+    N, M = args.height, args.width
+    game_node = GameNode(1 + args.num_not_it, N, M, speed=args.speed)
+    agents = [ItAgent(0, 0, N, M, speed=args.speed)]
+    for i in range(args.num_not_it):
+        x, y = M - 1 - i % M, N - 1 - i // M
+        agents.append(
+            NotItAgent(x, y, N, M, speed=args.speed, policy=RandomWalkPolicy(N, M, seed=seed + i))
+        )
+    for i, node in enumerate([game_node] + agents):
+        node.set_impairment(profile, seed + 2 * i)
+
+    threads = [threading.Thread(target=node.launch_node) for node in [game_node] + agents]
+    for thread in threads:
+        thread.start()
+
+    # The capture time starts once all agents have registered.
+    timeout_s = args.game_timeout / args.speed
+    deadline = time.time() + timeout_s
+    while not game_node.has_game_started and threads[0].is_alive() and time.time() < deadline:
+        time.sleep(0.001)
+    capture_start_time = time.time()
+    threads[0].join(max(0.0, deadline - capture_start_time))
+    capture_time_s = (time.time() - capture_start_time) * args.speed
+    captured = not threads[0].is_alive() and game_node.num_not_it_agents == 0
+
+    for node in [game_node] + agents:
+        node.stop_node()
+    for thread in threads:
+        thread.join()
+    return capture_time_s if captured else None
+
+
+class StreamSink(Node):
+    """
+    A node that records when every agent_move message is received.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.received_seqs = []
+        self.receive_times = []
+        self._move_decoder = ReusableDecoder(messages.agent_move_t)
+
+    def handler(self, _channel, data: bytes):
+        self.receive_times.append(time.monotonic())
+        self.received_seqs.append(self._move_decoder.decode(data).seq)
+
+    def on_start(self):
+        self.subscribe("agent_move", self.handler)
+
+    def run(self):
+        while self.running:
+            time.sleep(0.01)
+
+    def on_stop(self):
+        pass
+
+
+def stream(args, profile, seed: int):
+    """
+    Publish agent_move messages at the stream rate and return the fraction of messages delivered
+    and the 50th and 99th percentiles of their latency in seconds.
+    """
+    sink = StreamSink()
+    sink.set_impairment(profile, seed)
+    thread = threading.Thread(target=sink.launch_node)
+    thread.start()
+    time.sleep(0.1)
+
+    lc = lcm.LCM()
+    msg = messages.agent_move_t()
+    msg.agent_id = "stream"
+    num_messages = int(args.stream_rate * args.stream_duration)
+    send_times = np.zeros(num_messages)
+    start_time = time.monotonic()
+    for i in range(num_messages):
+        msg.seq = i
+        send_times[i] = time.monotonic()
+        lc.publish("agent_move", msg.encode())
+        time.sleep(max(0.0, start_time + (i + 1) / args.stream_rate - time.monotonic()))
+
+    # Wait for the delayed messages, which may still be queued behind the bandwidth cap.
+    time.sleep(profile["max_backlog_s"] + profile["delay_s"] + profile["reorder_delay_s"] + 0.2)
+    sink.stop_node()
+    thread.join()
+
+    delivered = len(sink.received_seqs) / num_messages
+    if not sink.received_seqs:
+        return delivered, float("nan"), float("nan")
+    latencies = np.array(sink.receive_times) - send_times[sink.received_seqs]
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return delivered, p50, p99
+
+
+def main(args):
+    print(
+        f"{'profile':>10} | {'capture time (game s)':>22} | {'captured':>8} | {'delivered':>9} | "
+        f"{'p50 latency (ms)':>16} | {'p99 latency (ms)':>16}"
+    )
+    for name in args.profiles:
+        profile = PROFILES[name]
+        capture_times = [play_game(args, profile, args.seed + 100 * game) for game in range(args.games)]
+        captured = [capture_time for capture_time in capture_times if capture_time is not None]
+        delivered, p50, p99 = stream(args, profile, args.seed)
+
+        capture_time = f"{statistics.mean(captured):.1f}" if captured else "n/a"
+        if len(captured) > 1:
+            capture_time += f" ± {statistics.stdev(captured):.1f}"
+        print(
+            f"{name:>10} | {capture_time:>22} | {len(captured):>4}/{len(capture_times):<3} | "
+            f"{delivered * 100:>8.1f}% | {p50 * 1e3:>16.1f} | {p99 * 1e3:>16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(parse_args())
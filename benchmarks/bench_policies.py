@@ -0,0 +1,46 @@
+# bench_policies.py
+"""
+Benchmark of deciding the moves of many agents one call at a time against one batched call.
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from coding_challenge.policies import POLICIES, make_observations, make_policy
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark batched policies")
+    parser.add_argument("--width", type=int, default=100, help="Width of the game board")
+    parser.add_argument("--height", type=int, default=100, help="Height of the game board")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 10, 100, 1000, 10000], help="Numbers of agents per decision")
+    return parser.parse_args()
+
+
+def main(args):
+    rng = np.random.default_rng(0)
+    for name in POLICIES:
+        policy = make_policy(name, args.height, args.width)
+        for batch_size in args.batch_sizes:
+            positions = np.stack(
+                [rng.integers(0, args.width, batch_size), rng.integers(0, args.height, batch_size)],
+                axis=1,
+            )
+            targets = positions[rng.permutation(batch_size)]
+            batch = make_observations(positions, targets)
+            singles = [make_observations(positions[i], targets[i]) for i in range(batch_size)]
+
+            number = max(1, 10000 // batch_size)
+            batched_s = min(timeit.repeat(lambda: policy.act(batch), number=number, repeat=3)) / number
+            single_s = min(
+                timeit.repeat(lambda: [policy.act(obs) for obs in singles], number=number, repeat=3)
+            ) / number
+            print(
+                f"{name:>12} B={batch_size:6d}: {single_s / batch_size * 1e6:8.2f} us/agent one at a time, "
+                f"{batched_s / batch_size * 1e6:8.3f} us/agent batched"
+            )
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,94 @@
+# bench_time_dilation.py
+"""
+Find the highest time dilation factor the distributed stack sustains.
+
+For every speed, a headless game node runs in this process while the agents are split across
+worker processes, exactly as in setup_game. The game is stopped after a fixed amount of game time, and the
+speed is sustainable if no node overran more than the allowed fraction of its ticks and the game
+node did not detect dropped moves.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import threading
+import time
+
+from coding_challenge.agents import ItAgent, NotItAgent
+from coding_challenge.game import launch_nodes
+from coding_challenge.game_node import GameNode
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark time dilation of the distributed game")
+    parser.add_argument("--width", type=int, default=20, help="Width of the game board")
+    parser.add_argument("--height", type=int, default=20, help="Height of the game board")
+    parser.add_argument("--num-not-it", type=int, default=8, help="Number of NotIt agents")
+    parser.add_argument("--game-seconds", type=float, default=20.0, help="Game time simulated per speed")
+    parser.add_argument("--max-speed", type=float, default=64.0, help="Highest speed to try")
+    parser.add_argument("--max-overrun-ratio", type=float, default=0.01, help="Allowed fraction of overrun ticks")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="Number of processes the agents are split across")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the initial positions")
+    return parser.parse_args()
+
+
+def run_game(args, speed: float) -> dict:
+    """
+    Run one game at the given speed and collect the statistics of every node.
+    """
+    rng = random.Random(args.seed)
+    N, M = args.height, args.width
+    nodes = [ItAgent(rng.randrange(M), rng.randrange(N), N, M, speed=speed)]
+    nodes += [
+        NotItAgent(rng.randrange(M), rng.randrange(N), N, M, speed=speed)
+        for _ in range(args.num_not_it)
+    ]
+    game_node = GameNode(len(nodes), N, M, speed=speed)
+
+    num_processes = min(args.processes, len(nodes))
+    groups = [nodes[i::num_processes] for i in range(num_processes)]
+
+    with multiprocessing.Pool(processes=num_processes) as pool:
+        result = pool.map_async(launch_nodes, groups)
+        timer = threading.Timer(args.game_seconds / speed, game_node.stop_node)
+        timer.start()
+        start_time = time.time()
+        game_stats = game_node.launch_node()
+        wall_time = time.time() - start_time
+        timer.cancel()
+        agent_stats = [stats for group_stats in result.get(timeout=30.0) for stats in group_stats]
+
+    all_stats = [game_stats] + agent_stats
+    ticks = sum(stats["ticks"] for stats in all_stats)
+    overruns = sum(stats["overruns"] for stats in all_stats)
+    return {
+        "wall_time_s": wall_time,
+        "overrun_ratio": overruns / max(1, ticks),
+        "max_tick_lag_s": max(stats["max_tick_lag_s"] for stats in all_stats),
+        "dropped": game_stats["dropped"],
+        "received_per_s": game_stats["received"] / max(wall_time, 1e-9),
+    }
+
+
+def main(args):
+    best_speed = None
+    speed = 1.0
+    while speed <= args.max_speed:
+        report = run_game(args, speed)
+        sustained = report["overrun_ratio"] <= args.max_overrun_ratio and report["dropped"] == 0
+        print(
+            f"speed {speed:6.1f}x: {report['wall_time_s']:6.2f} s wall, "
+            f"{report['overrun_ratio'] * 100:5.1f}% overrun ticks, "
+            f"{report['max_tick_lag_s'] * 1e3:7.1f} ms max lag, {report['dropped']} dropped, "
+            f"{report['received_per_s']:8.1f} msg/s at game node -> {'ok' if sustained else 'overloaded'}"
+        )
+        if not sustained:
+            break
+        best_speed = speed
+        speed *= 2
+
+    print(f"Highest sustainable speed: {best_speed}x" if best_speed else "No sustainable speed")
+
+
+if __name__ == "__main__":
+    main(parse_args())
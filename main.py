@@ -1,22 +1,104 @@
 # game.py
 import argparse
+import os
 
-from coding_challenge.game import setup_game, process_initial_positions
+from coding_challenge.game import setup_game, process_initial_positions, resume_game
+from coding_challenge.channels import DEFAULT_TILE_SIZE
+from coding_challenge.policies import POLICIES
+from coding_challenge.board import load_board
+from coding_challenge.impairment import PROFILES
+from coding_challenge.scenario import PLACEMENTS, make_scenario, generate_scenario, load_scenario, save_scenario, validate_scenario
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Distributed Freeze Tag Game")
-    parser.add_argument("--width", type=int, required=True, help="Width of the game board")
-    parser.add_argument("--height", type=int, required=True, help="Height of the game board")
-    parser.add_argument("--num-not-it", type=int, required=True, help="Number of NotIt agents")
-    parser.add_argument("--positions", nargs='+', type=int, required=True, help="Initial positions of agents in the format: x1 y1 x2 y2 ... x_it y_it")
-    return parser.parse_args()
+    parser.add_argument("--width", type=int, help="Width of the game board")
+    parser.add_argument("--height", type=int, help="Height of the game board")
+    parser.add_argument("--map", help="Map file of the game board, with '#' for walls and '.' for free cells. Replaces --width and --height")
+    parser.add_argument("--num-not-it", type=int, help="Number of NotIt agents")
+    parser.add_argument("--num-it", type=int, default=1, help="Number of It agents")
+    parser.add_argument("--positions", nargs='+', type=int, help="Initial positions of agents in the format: x1 y1 x2 y2 ... x_it y_it")
+    parser.add_argument("--scenario", help="Scenario file (.json or .npz) with the board size, rates and positions of the agents. Replaces the board and agent arguments")
+    parser.add_argument("--placement", choices=PLACEMENTS, help="Generate random initial positions instead of --positions")
+    parser.add_argument("--seed", type=int, help="Seed of the generated positions")
+    parser.add_argument("--save-scenario", help="Save the scenario to a .json or .npz file instead of launching the game")
+    parser.add_argument("--tile-size", type=int, default=DEFAULT_TILE_SIZE, help="Side length in cells of the tiles used for area-of-interest move channels")
+    parser.add_argument("--speed", type=float, default=1.0, help="Time dilation factor applied to the rates and timeouts of every node")
+    parser.add_argument("--agent-timeout", type=float, default=5.0, help="Game seconds without messages from an agent after which it is evicted")
+    parser.add_argument("--it-policy", choices=POLICIES, default="greedy_chase", help="Policy of the It agents")
+    parser.add_argument("--not-it-policy", choices=POLICIES, default="random_walk", help="Policy of the NotIt agents")
+    parser.add_argument("--impairment", choices=PROFILES, help="Emulate a network with the given impairment profile on the messages received by every node")
+    parser.add_argument("--impairment-seed", type=int, default=0, help="Seed of the network impairment emulation")
+    parser.add_argument("--processes", type=int, help="Number of processes the agents are split across. Defaults to the number of CPUs")
+    parser.add_argument("--checkpoint", help="File to which snapshots of the game are periodically saved")
+    parser.add_argument("--checkpoint-interval", type=float, default=5.0, help="Interval in seconds between snapshots")
+    parser.add_argument("--resume", action="store_true", help="Relaunch only the game node from --checkpoint and re-admit the running agents")
+    args = parser.parse_args()
+
+    if args.resume:
+        if args.checkpoint is None:
+            parser.error("--resume requires --checkpoint")
+    elif args.scenario is None:
+        required = ("num_not_it",) if args.placement is not None else ("num_not_it", "positions")
+        if args.map is None:
+            required = ("width", "height") + required
+        missing = [name for name in required if getattr(args, name) is None]
+        if missing:
+            parser.error("the following arguments are required: " + ", ".join("--" + name.replace("_", "-") for name in missing))
+
+    return args
 
 def main(args):
     """
     Main function to parse arguments and launch the required nodes.
     """
-    it_agent_position, not_it_agent_positions = process_initial_positions(args.positions, args.height, args.width, args.num_not_it)
-    setup_game(it_agent_position, not_it_agent_positions, args.height, args.width)
+    board = load_board(args.map) if args.map is not None else None
+
+    if args.resume:
+        resume_game(args.checkpoint, args.checkpoint_interval, args.speed, args.agent_timeout, board)
+        return
+
+    if args.scenario is not None:
+        scenario = load_scenario(args.scenario)
+        if board is None and scenario["map"] is not None:
+            board = load_board(scenario["map"])
+    else:
+        if board is not None:
+            args.height, args.width = board.N, board.M
+
+        if args.placement is not None:
+            scenario = generate_scenario(args.height, args.width, args.num_it, args.num_not_it, args.placement, args.seed, board)
+        else:
+            it_agent_position, not_it_agent_positions = process_initial_positions(args.positions, args.height, args.width, args.num_not_it, args.num_it, board)
+            scenario = make_scenario(args.height, args.width, it_agent_position, not_it_agent_positions)
+        scenario["map"] = args.map
+    validate_scenario(scenario, board)
+
+    if args.save_scenario is not None:
+        if scenario["map"] is not None:
+            # Map paths in scenario files are relative to the scenario file.
+            scenario["map"] = os.path.relpath(scenario["map"], os.path.dirname(os.path.abspath(args.save_scenario)))
+        save_scenario(args.save_scenario, scenario)
+        return
+
+    setup_game(
+        scenario["it_positions"].tolist(),
+        scenario["not_it_positions"].tolist(),
+        scenario["N"],
+        scenario["M"],
+        args.tile_size,
+        args.checkpoint,
+        args.checkpoint_interval,
+        args.speed,
+        args.agent_timeout,
+        args.it_policy,
+        args.not_it_policy,
+        board,
+        scenario["it_rate_hz"],
+        scenario["not_it_rate_hz"],
+        PROFILES[args.impairment] if args.impairment is not None else None,
+        args.impairment_seed,
+        args.processes,
+    )
     
 if __name__ == "__main__":
     main(parse_args())
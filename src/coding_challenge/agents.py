@@ -1,9 +1,25 @@
 from typing import Tuple, Optional
 import time
-import random
 from names_generator import generate_name
 
 from coding_challenge.node import Node
+from coding_challenge.codec import ReusableDecoder
+from coding_challenge.board import Board
+from coding_challenge.policies import (
+    Policy,
+    RandomWalkPolicy,
+    GreedyChasePolicy,
+    make_observations,
+    apply_actions,
+)
+from coding_challenge.channels import (
+    DEFAULT_TILE_SIZE,
+    get_tile,
+    get_num_tiles,
+    agent_move_channel,
+    agent_move_channels_around,
+    game_freeze_agent_channel,
+)
 import coding_challenge.messages as messages
 
 
@@ -20,6 +36,12 @@ class Agent(Node):
         N: int,
         M: int,
         rate_hz: float,
+        tile_size: int = DEFAULT_TILE_SIZE,
+        speed: float = 1.0,
+        heartbeat_interval_s: float = 1.0,
+        game_node_timeout_s: float = 10.0,
+        policy: Optional[Policy] = None,
+        board: Optional[Board] = None,
     ):
         """
         Initialize the agent with the given parameters.
@@ -30,6 +52,12 @@ class Agent(Node):
             N (int): Number of rows in the grid.
             M (int): Number of columns in the grid.
             rate_hz (float): The rate in Hz at which the agent operates.
+            tile_size (int): The side length in cells of the tiles used for area-of-interest move channels.
+            speed (float): The time dilation factor by which the rate is multiplied.
+            heartbeat_interval_s (float): The game seconds after which an agent that has not moved re-sends its position.
+            game_node_timeout_s (float): The game seconds without game heartbeats after which the game node is considered dead.
+            policy (Optional[Policy]): The policy deciding the moves of the agent.
+            board (Optional[Board]): The board with the walls the agent cannot enter. Defaults to no walls.
         """
         super().__init__()
 
@@ -37,7 +65,13 @@ class Agent(Node):
         self.agent_type = agent_type
         self.current_position_x = initial_position_x
         self.current_position_y = initial_position_y
-        self.rate_hz = rate_hz
+        self.speed = speed
+        self.rate_hz = rate_hz * speed
+        self.tile_size = tile_size
+        self.policy = policy
+        self.board = board
+        self.heartbeat_interval_s = heartbeat_interval_s / speed
+        self.game_node_timeout_s = game_node_timeout_s / speed
 
         self.N = N
         self.M = M
@@ -45,6 +79,11 @@ class Agent(Node):
         self._is_game_running = False
         self.game_state = None
 
+        self._freeze_decoder = ReusableDecoder(messages.game_freeze_agent_t)
+        self._move_seq = 0
+        self._last_move_time = 0.0
+        self._last_game_heartbeat_time = None
+
         print(
             f"Agent {self.agent_id} of type {self.agent_type} created at position ({initial_position_x}, {initial_position_y})"
         )
@@ -57,12 +96,15 @@ class Agent(Node):
         self.running = False
 
     def game_freeze_agent_handler(self, _channel, data: bytes):
-        msg = messages.game_freeze_agent_t.decode(data)
+        msg = self._freeze_decoder.decode(data)
         if msg.agent_id == self.agent_id:
             self._is_game_running = False
             self.running = False
             print(f"Agent {self.agent_id} has been frozen")
 
+    def game_heartbeat_handler(self, _channel, data: bytes):
+        self._last_game_heartbeat_time = time.time()
+
     def game_state_handler(self, _channel, data: bytes):
         msg = messages.game_state_t.decode(data)
         self.game_state = msg.game_state
@@ -79,21 +121,43 @@ class Agent(Node):
     def on_start(self):
         self.subscribe("game_start", self.game_start_handler)
         self.subscribe("game_stop", self.game_stop_handler)
-        self.subscribe("game_freeze_agent", self.game_freeze_agent_handler)
+        self.subscribe(
+            game_freeze_agent_channel(self.agent_id), self.game_freeze_agent_handler
+        )
         self.subscribe("game_state", self.game_state_handler)
-    
+        self.subscribe("game_heartbeat", self.game_heartbeat_handler)
+
+    def is_game_node_alive(self) -> bool:
+        """
+        Check whether the game node has sent a heartbeat recently. Before the first heartbeat, the
+        game node may simply not be launched yet and is assumed to be alive.
+        """
+        last_heartbeat_time = self._last_game_heartbeat_time
+        return (
+            last_heartbeat_time is None
+            or time.time() - last_heartbeat_time <= self.game_node_timeout_s
+        )
+
     def run(self):
         while self.running:
             start_time = time.time()
 
+            if not self.is_game_node_alive():
+                print(f"Agent {self.agent_id} lost the game node")
+                self.stop_node()
+                break
+
             if self._is_game_running:
                 self.step()
+
+                if start_time - self._last_move_time >= self.heartbeat_interval_s:
+                    # Piggyback the heartbeat on a move to the current position.
+                    self.move(*self.get_current_position())
             else:
                 print(f"Agent {self.agent_id} is waiting for the game to start")
                 self.send_agent_start()
 
-            elapsed_time = time.time() - start_time
-            time.sleep(max(0, 1.0 / self.rate_hz - elapsed_time))
+            self.sleep_until_next_tick(start_time, self.rate_hz)
 
     def on_stop(self):
         msg = messages.agent_stop_t()
@@ -111,10 +175,13 @@ class Agent(Node):
         msg.agent_id = self.agent_id
         msg.x = int(x)
         msg.y = int(y)
+        msg.seq = self._move_seq
+        self._move_seq += 1
+        self._last_move_time = time.time()
         self.current_position_x = x
         self.current_position_y = y
 
-        self.publish("agent_move", msg)
+        self.publish(agent_move_channel(x, y, self.tile_size), msg)
 
     def get_current_position(self) -> Tuple[int, int]:
         """
@@ -124,6 +191,31 @@ class Agent(Node):
         """
         return self.current_position_x, self.current_position_y
 
+    def decide_move(
+        self,
+        target: Optional[Tuple[int, int]] = None,
+        position: Optional[Tuple[int, int]] = None,
+    ) -> Tuple[int, int]:
+        """
+        Ask the policy for the next position of the agent, as a batch of one.
+        Args:
+            target (Optional[Tuple[int, int]]): The x and y coordinates of the target, if any.
+            position (Optional[Tuple[int, int]]): The x and y coordinates to move from. Defaults to the current position.
+        Returns:
+            Tuple[int, int]: The x and y coordinates of the next position.
+        """
+        if position is None:
+            position = self.get_current_position()
+        observations = make_observations(
+            [position], None if target is None else [target]
+        )
+        actions = self.policy.act(observations)
+        new_positions = apply_actions(
+            observations["positions"], actions, self.N, self.M, self.board
+        )
+        new_x, new_y = new_positions[0].tolist()
+        return new_x, new_y
+
     def step(self):
         """
         Perform one step of the agent's logic.
@@ -143,6 +235,10 @@ class NotItAgent(Agent):
         N: int,
         M: int,
         rate_hz: Optional[float] = 1.0,
+        tile_size: int = DEFAULT_TILE_SIZE,
+        speed: float = 1.0,
+        policy: Optional[Policy] = None,
+        board: Optional[Board] = None,
     ):
         """
         Initialize the agent with the given parameters.
@@ -152,37 +248,40 @@ class NotItAgent(Agent):
             N (int): Number of rows in the grid.
             M (int): Number of columns in the grid.
             rate_hz (Optional[float]): The rate in Hz at which the agent operates. Defaults to 1.0 Hz.
+            tile_size (int): The side length in cells of the tiles used for area-of-interest move channels.
+            speed (float): The time dilation factor by which the rate is multiplied.
+            policy (Optional[Policy]): The policy deciding the moves of the agent. Defaults to a random walk.
+            board (Optional[Board]): The board with the walls the agent cannot enter. Defaults to no walls.
         """
         super().__init__(
-            "not_it", initial_position_x, initial_position_y, N, M, rate_hz
+            "not_it",
+            initial_position_x,
+            initial_position_y,
+            N,
+            M,
+            rate_hz,
+            tile_size,
+            speed,
+            policy=policy if policy is not None else RandomWalkPolicy(N, M, board),
+            board=board,
         )
 
     def get_random_adjacent_cell(self, x: int, y: int) -> Tuple[int, int]:
         """
-        Get a random adjacent cell to the given cell.
+        Get the adjacent cell of the given cell chosen by the policy, a random free cell by default.
         Args:
             x (int): The x-coordinate of the cell.
             y (int): The y-coordinate of the cell.
         Returns:
             Tuple[int, int]: The x and y coordinates of the adjacent cell.
         """
-        x_action = random.choice([-1, 0, 1])
-        y_action = random.choice([-1, 0, 1])
-
-        new_x = x + x_action
-        new_y = y + y_action
-
-        if new_x < 0 or new_x >= self.M or new_y < 0 or new_y >= self.N:
-            return self.get_random_adjacent_cell(x, y)
-
-        return new_x, new_y
+        return self.decide_move(position=(x, y))
 
     def step(self):
         """
-        Move to a random adjacent cell in the grid.
+        Move to the cell chosen by the policy, a random adjacent cell by default.
         """
-        x, y = self.get_current_position()
-        new_x, new_y = self.get_random_adjacent_cell(x, y)
+        new_x, new_y = self.get_random_adjacent_cell(*self.get_current_position())
         self.move(new_x, new_y)
 
 
@@ -200,6 +299,11 @@ class ItAgent(Agent):
         rate_hz: Optional[
             float
         ] = 2.0,  # Currently set to 2 Hz, as described in the challenge
+        tile_size: int = DEFAULT_TILE_SIZE,
+        aoi_radius: int = 1,
+        speed: float = 1.0,
+        policy: Optional[Policy] = None,
+        board: Optional[Board] = None,
     ):
         """
         Initialize the agent with the given parameters.
@@ -209,25 +313,98 @@ class ItAgent(Agent):
             N (int): Number of rows in the grid.
             M (int): Number of columns in the grid.
             rate_hz (Optional[float]): The rate in Hz at which the agent operates. Defaults to 2 Hz.
+            tile_size (int): The side length in cells of the tiles used for area-of-interest move channels.
+            aoi_radius (int): The minimum radius in tiles of the area of interest around the agent.
+            speed (float): The time dilation factor by which the rate is multiplied.
+            policy (Optional[Policy]): The policy deciding the moves of the agent. Defaults to a chase of the target around the walls.
+            board (Optional[Board]): The board with the walls the agent cannot enter. Defaults to no walls.
         """
-        super().__init__("it", initial_position_x, initial_position_y, N, M, rate_hz)
+        super().__init__(
+            "it",
+            initial_position_x,
+            initial_position_y,
+            N,
+            M,
+            rate_hz,
+            tile_size,
+            speed,
+            policy=policy if policy is not None else GreedyChasePolicy(N, M, board),
+            board=board,
+        )
         self.target = None
         self.distance_squared_to_target = float("inf")
         self.target_id = None
 
+        self.min_aoi_radius = aoi_radius
+        self.aoi_radius = aoi_radius
+        self.max_aoi_radius = max(get_num_tiles(N, M, tile_size))
+        self._move_subscriptions = {}
+        self._target_freeze_subscription = None
+        self._target_freeze_id = None
+
+        self._move_decoder = ReusableDecoder(messages.agent_move_t)
+
     def on_start(self):
         """
-        Subscribe to the agent_move and agent_stop messages.
+        Subscribe to the agent_move channels of the area of interest.
         """
-        self.subscribe("agent_move", self.agent_move_handler)
-        self.subscribe("game_freeze_agent", self.agent_stop_handler)
         super().on_start()
+        # The handler thread is not running yet, so the subscriptions can be made directly.
+        self.update_subscriptions()
+
+    def update_subscriptions(self):
+        """
+        Adjust the subscriptions to the area of interest around the agent. Must run on the handler
+        thread once the node is launched, since LCM subscriptions cannot change while it handles
+        messages.
+
+        The area always contains the tile of the current target and the tiles next to it, so the
+        target cannot leave it in one step. Without a target, the area grows by one tile per step
+        until an agent is heard or the whole grid is covered.
+        """
+        target = self.target
+        if target is not None:
+            tile_x, tile_y = get_tile(*self.get_current_position(), self.tile_size)
+            target_tile_x, target_tile_y = get_tile(*target, self.tile_size)
+            tile_distance = max(abs(target_tile_x - tile_x), abs(target_tile_y - tile_y))
+            self.aoi_radius = max(self.min_aoi_radius, tile_distance + 1)
+        elif self._move_subscriptions:
+            self.aoi_radius = min(self.max_aoi_radius, self.aoi_radius + 1)
+
+        channels = set(
+            agent_move_channels_around(
+                *self.get_current_position(),
+                self.aoi_radius,
+                self.N,
+                self.M,
+                self.tile_size,
+            )
+        )
+        for channel in list(self._move_subscriptions):
+            if channel not in channels:
+                self.unsubscribe(self._move_subscriptions.pop(channel))
+        for channel in channels:
+            if channel not in self._move_subscriptions:
+                self._move_subscriptions[channel] = self.subscribe(
+                    channel, self.agent_move_handler
+                )
+
+        target_id = self.target_id
+        if target_id != self._target_freeze_id:
+            if self._target_freeze_subscription is not None:
+                self.unsubscribe(self._target_freeze_subscription)
+                self._target_freeze_subscription = None
+            if target_id is not None:
+                self._target_freeze_subscription = self.subscribe(
+                    game_freeze_agent_channel(target_id), self.agent_stop_handler
+                )
+            self._target_freeze_id = target_id
 
     def agent_stop_handler(self, _channel, data: bytes):
         """
         Handle the agent_stop message. Reset the target if the target agent is out of the game.
         """
-        msg = messages.game_freeze_agent_t.decode(data)
+        msg = self._freeze_decoder.decode(data)
         if msg.agent_id == self.target_id:
             self.target_id = None
             self.target = None
@@ -238,7 +415,7 @@ class ItAgent(Agent):
         Handle the agent_move message. Update the current target based on the closest agent.
         """
 
-        msg = messages.agent_move_t.decode(data)
+        msg = self._move_decoder.decode(data)
         if msg.agent_id == self.agent_id:
             return
 
@@ -260,23 +437,11 @@ class ItAgent(Agent):
 
     def get_action(self) -> Tuple[int, int]:
         """
-        Get the action to move towards the target.
+        Get the action to move towards the target, as decided by the policy.
         Returns:
             Tuple[int, int]: The x and y coordinates of the resulting action.
         """
-        x, y = self.get_current_position()
-        target_x, target_y = self.target
-
-        # Move towards the target, clipping the action to [-1, 1]
-        x_action = max(-1, min(1, target_x - x))
-        y_action = max(-1, min(1, target_y - y))
-
-        new_x, new_y = x + x_action, y + y_action
-
-        if new_x < 0 or new_x >= self.M or new_y < 0 or new_y >= self.N:
-            return x, y
-
-        return new_x, new_y
+        return self.decide_move(self.target)
 
     def step(self):
         """ "
@@ -285,3 +450,5 @@ class ItAgent(Agent):
         if self.target is not None:
             new_x, new_y = self.get_action()
             self.move(new_x, new_y)
+
+        self.call_in_handler_thread(self.update_subscriptions)
@@ -0,0 +1,368 @@
+# analytics.py
+"""
+Streaming analytics of freeze tag games.
+
+The analytics follow the agent_start, agent_move, game_freeze_agent and game_start messages, either
+live through an AnalyticsNode or by replaying an LCM log, and fold every message into fixed-size
+NumPy accumulators: occupancy heatmaps per agent type, a histogram of the times to freeze and the
+distance travelled by every agent. Memory stays constant in the number of moves, so arbitrarily long
+games can be analyzed without storing them.
+
+Run with ``python -m coding_challenge.analytics --help``.
+"""
+from typing import Dict, Optional
+import argparse
+import time
+
+import lcm
+import numpy as np
+
+from coding_challenge.node import Node
+from coding_challenge.codec import ReusableDecoder
+from coding_challenge.channels import AGENT_MOVE, AGENT_MOVE_ALL, GAME_FREEZE_AGENT, GAME_FREEZE_AGENT_ALL
+import coding_challenge.messages as messages
+
+# Index of the occupancy heatmap of each agent type. Agents whose agent_start was missed are unknown.
+AGENT_TYPES = ("not_it", "it", "unknown")
+UNKNOWN_TYPE = AGENT_TYPES.index("unknown")
+
+
+class GameAnalytics:
+    """
+    Accumulators of the statistics of a game, updated one message at a time.
+    """
+
+    def __init__(
+        self,
+        N: int,
+        M: int,
+        max_time_to_freeze_s: float = 60.0,
+        num_bins: int = 60,
+        initial_agent_capacity: int = 64,
+    ):
+        """
+        Initialize empty accumulators for an NxM grid.
+
+        Args:
+            N (int): Number of rows in the grid.
+            M (int): Number of columns in the grid.
+            max_time_to_freeze_s (float): The upper edge of the time to freeze histogram. Longer times are counted as overflow.
+            num_bins (int): The number of bins of the time to freeze histogram.
+            initial_agent_capacity (int): The number of agents the per-agent accumulators hold before they grow.
+        """
+        self.N = N
+        self.M = M
+        self.occupancy = np.zeros((len(AGENT_TYPES), N, M), dtype=np.int64)
+        self.freeze_bin_edges = np.linspace(0.0, max_time_to_freeze_s, num_bins + 1)
+        self.freeze_histogram = np.zeros(num_bins, dtype=np.int64)
+        self.freeze_overflow = 0
+        self.freeze_time_sum_s = 0.0
+        self.num_moves = 0
+        self.num_freezes = 0
+        self.game_start_time: Optional[float] = None
+
+        self._bin_width_s = max_time_to_freeze_s / num_bins
+        self._agent_index: Dict[str, int] = {}
+        self._agent_ids = np.empty(initial_agent_capacity, dtype=object)
+        self._types = np.full(initial_agent_capacity, UNKNOWN_TYPE, dtype=np.int8)
+        self._positions = np.full((initial_agent_capacity, 2), -1, dtype=np.int64)
+        self._distances = np.zeros(initial_agent_capacity, dtype=np.int64)
+        self._start_times = np.zeros(initial_agent_capacity, dtype=np.float64)
+        self._frozen = np.zeros(initial_agent_capacity, dtype=bool)
+
+        self._start_decoder = ReusableDecoder(messages.agent_start_t)
+        self._move_decoder = ReusableDecoder(messages.agent_move_t)
+        self._freeze_decoder = ReusableDecoder(messages.game_freeze_agent_t)
+
+    def _get_agent(self, agent_id: str, timestamp_s: float) -> int:
+        index = self._agent_index.get(agent_id)
+        if index is not None:
+            return index
+
+        index = len(self._agent_index)
+        if index == len(self._agent_ids):
+            # Double the capacity of the per-agent accumulators.
+            self._agent_ids = np.concatenate([self._agent_ids, np.empty(index, dtype=object)])
+            self._types = np.concatenate([self._types, np.full(index, UNKNOWN_TYPE, dtype=np.int8)])
+            self._positions = np.concatenate([self._positions, np.full((index, 2), -1, dtype=np.int64)])
+            self._distances = np.concatenate([self._distances, np.zeros(index, dtype=np.int64)])
+            self._start_times = np.concatenate([self._start_times, np.zeros(index)])
+            self._frozen = np.concatenate([self._frozen, np.zeros(index, dtype=bool)])
+
+        self._agent_index[agent_id] = index
+        self._agent_ids[index] = agent_id
+        self._start_times[index] = timestamp_s
+        return index
+
+    def _set_position(self, index: int, x: int, y: int):
+        # Scalar item access avoids creating NumPy scalars on the hot path.
+        positions = self._positions
+        last_x = positions.item(index, 0)
+        if last_x >= 0:
+            # Agents move one cell per step, including diagonally, unless moves were dropped.
+            last_y = positions.item(index, 1)
+            self._distances[index] = self._distances.item(index) + max(abs(x - last_x), abs(y - last_y))
+        positions[index, 0] = x
+        positions[index, 1] = y
+
+    def on_agent_start(self, data: bytes, timestamp_s: float):
+        msg = self._start_decoder.decode(data)
+        index = self._get_agent(msg.agent_id, timestamp_s)
+        if msg.agent_type in AGENT_TYPES:
+            self._types[index] = AGENT_TYPES.index(msg.agent_type)
+
+        if self._frozen[index]:
+            # A frozen agent that starts again, e.g. a respawned agent of the load generator.
+            self._frozen[index] = False
+            self._start_times[index] = timestamp_s
+            self._positions[index] = -1
+        if self._positions[index, 0] < 0 and 0 <= msg.x < self.M and 0 <= msg.y < self.N:
+            self._positions[index] = msg.x, msg.y
+
+    def on_game_start(self, data: bytes, timestamp_s: float):
+        if self.game_start_time is None:
+            self.game_start_time = timestamp_s
+
+    def on_agent_move(self, data: bytes, timestamp_s: float):
+        msg = self._move_decoder.decode(data)
+        x, y = msg.x, msg.y
+        if not (0 <= x < self.M and 0 <= y < self.N):
+            return
+
+        index = self._get_agent(msg.agent_id, timestamp_s)
+        self._set_position(index, x, y)
+        self.occupancy[self._types.item(index), y, x] += 1
+        self.num_moves += 1
+
+    def on_game_freeze_agent(self, data: bytes, timestamp_s: float):
+        msg = self._freeze_decoder.decode(data)
+        index = self._get_agent(msg.agent_id, timestamp_s)
+        if self._frozen[index]:
+            # The game node may freeze an agent several times before it leaves the game.
+            return
+        self._frozen[index] = True
+        self.num_freezes += 1
+
+        start_time = self._start_times[index]
+        if self.game_start_time is not None:
+            start_time = max(start_time, self.game_start_time)
+        time_to_freeze_s = max(0.0, timestamp_s - start_time)
+        self.freeze_time_sum_s += time_to_freeze_s
+
+        bin_index = int(time_to_freeze_s / self._bin_width_s)
+        if bin_index < len(self.freeze_histogram):
+            self.freeze_histogram[bin_index] += 1
+        else:
+            self.freeze_overflow += 1
+
+    def handle(self, channel: str, data: bytes, timestamp_s: float):
+        """
+        Fold a message into the accumulators. Messages on other channels are ignored.
+
+        Args:
+            channel (str): The channel of the message.
+            data (bytes): The encoded message.
+            timestamp_s (float): The time in seconds at which the message was received.
+        """
+        if channel.startswith(AGENT_MOVE):
+            self.on_agent_move(data, timestamp_s)
+        elif channel.startswith(GAME_FREEZE_AGENT):
+            self.on_game_freeze_agent(data, timestamp_s)
+        elif channel == "agent_start":
+            self.on_agent_start(data, timestamp_s)
+        elif channel == "game_start":
+            self.on_game_start(data, timestamp_s)
+
+    def get_distances(self) -> Dict[str, int]:
+        """
+        Get the distance in cells travelled by every agent.
+        """
+        num_agents = len(self._agent_index)
+        return dict(zip(self._agent_ids[:num_agents].tolist(), self._distances[:num_agents].tolist()))
+
+    def get_time_to_freeze_percentile(self, q: float) -> Optional[float]:
+        """
+        Estimate a percentile of the times to freeze from the histogram, by the upper edge of the
+        bin that contains it.
+
+        Args:
+            q (float): The percentile in [0, 100].
+
+        Returns:
+            Optional[float]: The estimated time in seconds, inf if it overflows the histogram, or None without freezes.
+        """
+        if self.num_freezes == 0:
+            return None
+        counts = np.cumsum(self.freeze_histogram)
+        bin_index = int(np.searchsorted(counts, q / 100.0 * self.num_freezes))
+        if bin_index >= len(counts):
+            return float("inf")
+        return float(self.freeze_bin_edges[bin_index + 1])
+
+    def summary(self) -> dict:
+        """
+        Summarize the accumulators in a few numbers.
+        """
+        num_agents = len(self._agent_index)
+        distances = self._distances[:num_agents]
+        return {
+            "agents": num_agents,
+            "moves": self.num_moves,
+            "freezes": self.num_freezes,
+            "mean_time_to_freeze_s": self.freeze_time_sum_s / self.num_freezes if self.num_freezes else None,
+            "p50_time_to_freeze_s": self.get_time_to_freeze_percentile(50),
+            "p90_time_to_freeze_s": self.get_time_to_freeze_percentile(90),
+            "total_distance": int(distances.sum()),
+            "max_distance": int(distances.max()) if num_agents else 0,
+        }
+
+    def export(self, path: str):
+        """
+        Export the accumulators to an NPZ file.
+
+        Args:
+            path (str): The path of the NPZ file.
+        """
+        num_agents = len(self._agent_index)
+        np.savez_compressed(
+            path,
+            agent_types=np.array(AGENT_TYPES),
+            occupancy=self.occupancy,
+            freeze_bin_edges=self.freeze_bin_edges,
+            freeze_histogram=self.freeze_histogram,
+            freeze_overflow=self.freeze_overflow,
+            agent_ids=self._agent_ids[:num_agents].astype(str),
+            agent_type_indices=self._types[:num_agents],
+            distances=self._distances[:num_agents],
+            num_moves=self.num_moves,
+            num_freezes=self.num_freezes,
+        )
+
+
+def replay_log(path: str, analytics: GameAnalytics) -> GameAnalytics:
+    """
+    Fold all messages of an LCM log into the analytics, with their logged timestamps.
+
+    Args:
+        path (str): The path of the LCM log, e.g. recorded with lcm-logger.
+        analytics (GameAnalytics): The analytics to update.
+
+    Returns:
+        GameAnalytics: The updated analytics.
+    """
+    log = lcm.EventLog(path, "r")
+    try:
+        for event in log:
+            analytics.handle(event.channel, event.data, event.timestamp * 1e-6)
+    finally:
+        log.close()
+    return analytics
+
+
+class AnalyticsNode(Node):
+    """
+    A node that follows a live game and keeps its analytics.
+    """
+
+    def __init__(
+        self,
+        N: int,
+        M: int,
+        export_path: Optional[str] = None,
+        export_interval_s: float = 10.0,
+        stop_on_game_stop: bool = True,
+        rate_hz: float = 1.0,
+        **kwargs,
+    ):
+        """
+        Initialize the node with the given parameters.
+
+        Args:
+            N (int): Number of rows in the grid.
+            M (int): Number of columns in the grid.
+            export_path (Optional[str]): The NPZ file to which the analytics are exported periodically and when the node stops. Disabled if None.
+            export_interval_s (float): The interval in seconds between exports.
+            stop_on_game_stop (bool): Whether the node stops when the game stops.
+            rate_hz (float): The rate in Hz at which the node checks whether to export.
+            **kwargs: Additional arguments passed to GameAnalytics.
+        """
+        super().__init__()
+        self.analytics = GameAnalytics(N, M, **kwargs)
+        self.export_path = export_path
+        self.export_interval_s = export_interval_s
+        self.stop_on_game_stop = stop_on_game_stop
+        self.rate_hz = rate_hz
+
+    def handler(self, channel: str, data: bytes):
+        self.analytics.handle(channel, data, time.time())
+
+    def game_stop_handler(self, _channel: str, data: bytes):
+        if self.stop_on_game_stop:
+            self.stop_node()
+
+    def export(self):
+        """
+        Export the analytics to the export file, if any.
+        """
+        if self.export_path is not None:
+            self.analytics.export(self.export_path)
+
+    def on_start(self):
+        for channel in ("agent_start", "game_start", AGENT_MOVE_ALL, GAME_FREEZE_AGENT_ALL):
+            self.subscribe(channel, self.handler)
+        self.subscribe("game_stop", self.game_stop_handler)
+
+    def run(self):
+        last_export_time = time.time()
+        while self.running:
+            tick_start_time = time.time()
+            if tick_start_time - last_export_time >= self.export_interval_s:
+                # Export on the handler thread, so the accumulators are not updated meanwhile.
+                self.call_in_handler_thread(self.export)
+                last_export_time = tick_start_time
+            self.sleep_until_next_tick(tick_start_time, self.rate_hz)
+
+    def on_stop(self):
+        self.export()
+        print(format_summary(self.analytics.summary()))
+
+
+def format_summary(summary: dict) -> str:
+    def seconds(value):
+        return "n/a" if value is None else f"{value:.2f}s"
+
+    return (
+        f"{summary['agents']} agents, {summary['moves']} moves, {summary['freezes']} freezes, "
+        f"time to freeze mean {seconds(summary['mean_time_to_freeze_s'])} "
+        f"p50 {seconds(summary['p50_time_to_freeze_s'])} p90 {seconds(summary['p90_time_to_freeze_s'])}, "
+        f"{summary['total_distance']} cells travelled, at most {summary['max_distance']} by one agent"
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Streaming analytics of freeze tag games")
+    parser.add_argument("--width", type=int, required=True, help="Width of the game board")
+    parser.add_argument("--height", type=int, required=True, help="Height of the game board")
+    parser.add_argument("--log", help="Replay an LCM log instead of following a live game")
+    parser.add_argument("--export", help="NPZ file to which the analytics are exported")
+    parser.add_argument("--export-interval", type=float, default=10.0, help="Interval in seconds between exports of a live game")
+    parser.add_argument("--max-time-to-freeze", type=float, default=60.0, help="Upper edge in seconds of the time to freeze histogram")
+    parser.add_argument("--num-bins", type=int, default=60, help="Number of bins of the time to freeze histogram")
+    return parser.parse_args()
+
+
+def main(args):
+    kwargs = {"max_time_to_freeze_s": args.max_time_to_freeze, "num_bins": args.num_bins}
+    if args.log is None:
+        node = AnalyticsNode(args.height, args.width, args.export, args.export_interval, **kwargs)
+        node.launch_node()
+        return
+
+    analytics = replay_log(args.log, GameAnalytics(args.height, args.width, **kwargs))
+    if args.export is not None:
+        analytics.export(args.export)
+    print(format_summary(analytics.summary()))
+
+
+if __name__ == "__main__":
+    main(parse_args())
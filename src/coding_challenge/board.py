@@ -0,0 +1,216 @@
+# board.py
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+WALL = "#"
+FREE = "."
+# Every process holding a board, e.g. every It agent, keeps its own cache.
+DEFAULT_MAX_CACHED_DISTANCE_BYTES = 64 * 2**20
+
+
+class Board:
+    """
+    A grid of N rows and M columns with walls that agents cannot enter.
+
+    Distances between cells are the number of moves, including diagonal ones, on the shortest path
+    around the walls. They are computed with an O(NM) BFS from each target cell on demand and the
+    distance maps of the most recently used targets are cached within a memory budget. A step towards
+    a target whose distance map is cached costs O(1), while a step towards a new target cell pays
+    for a BFS.
+    """
+
+    def __init__(
+        self,
+        walls: np.ndarray,
+        max_cached_distance_bytes: int = DEFAULT_MAX_CACHED_DISTANCE_BYTES,
+        max_cached_distance_maps: Optional[int] = None,
+    ):
+        """
+        Initialize the board with the given walls.
+
+        Args:
+            walls (np.ndarray): The (N, M) boolean array which is True at the walls, indexed by y and x.
+            max_cached_distance_bytes (int): The memory the cached distance maps may use. At least one map is always kept.
+            max_cached_distance_maps (Optional[int]): An additional limit on the number of cached distance maps.
+        """
+        self.walls = np.array(walls, dtype=bool)
+        self.N, self.M = self.walls.shape
+        self.has_walls = bool(self.walls.any())
+
+        # One bit per cell for the hot path of the game node.
+        self._wall_bits = np.packbits(self.walls.ravel(), bitorder="little").tobytes()
+
+        # The grid is padded with a border of walls, so the BFS and the neighbor lookups can move
+        # by flat offsets without bounds checks.
+        self._width = self.M + 2
+        padded = np.ones((self.N + 2, self._width), dtype=bool)
+        padded[1:-1, 1:-1] = self.walls
+        self._free = ~padded.ravel()
+        self._neighbor_offsets = np.array(
+            [dy * self._width + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy]
+        )
+        self._distance_maps: OrderedDict[Tuple[int, int], np.ndarray] = OrderedDict()
+
+        # Every distance map holds one int32 per cell of the padded grid.
+        distance_map_bytes = self._free.size * np.dtype(np.int32).itemsize
+        self.max_cached_distance_maps = max(1, max_cached_distance_bytes // distance_map_bytes)
+        if max_cached_distance_maps is not None:
+            self.max_cached_distance_maps = max(1, min(self.max_cached_distance_maps, max_cached_distance_maps))
+
+    @classmethod
+    def empty(cls, N: int, M: int, **kwargs) -> "Board":
+        """
+        Create a board without walls.
+
+        Args:
+            N (int): Number of rows in the grid.
+            M (int): Number of columns in the grid.
+            **kwargs: Additional arguments passed to the constructor.
+        """
+        return cls(np.zeros((N, M), dtype=bool), **kwargs)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str], **kwargs) -> "Board":
+        """
+        Create a board from the rows of a map, where '#' marks a wall and '.' a free cell. The first
+        row is y = 0.
+
+        Args:
+            lines (Iterable[str]): The rows of the map. Empty lines are ignored.
+            **kwargs: Additional arguments passed to the constructor.
+
+        Raises:
+            ValueError: If the map is empty, not rectangular or contains unknown characters.
+        """
+        rows: List[str] = [line.strip() for line in lines if line.strip()]
+        if not rows:
+            raise ValueError("The map is empty")
+        if any(len(row) != len(rows[0]) for row in rows):
+            raise ValueError("All rows of the map must have the same length")
+        unknown = set("".join(rows)) - {WALL, FREE}
+        if unknown:
+            raise ValueError(f"Unknown characters in the map: {''.join(sorted(unknown))}")
+
+        return cls(np.array([[cell == WALL for cell in row] for row in rows]), **kwargs)
+
+    def is_inside(self, x: int, y: int) -> bool:
+        """
+        Check whether a cell is inside the grid.
+        """
+        return 0 <= x < self.M and 0 <= y < self.N
+
+    def is_wall(self, x: int, y: int) -> bool:
+        """
+        Check whether a cell inside the grid is a wall, with a single bit lookup.
+        """
+        index = y * self.M + x
+        return bool(self._wall_bits[index >> 3] >> (index & 7) & 1)
+
+    def is_free(self, x: int, y: int) -> bool:
+        """
+        Check whether an agent can stand on a cell.
+        """
+        return self.is_inside(x, y) and not self.is_wall(x, y)
+
+    def free_cells(self) -> np.ndarray:
+        """
+        Get the x and y coordinates of all free cells as an (F, 2) array.
+        """
+        y, x = np.nonzero(~self.walls)
+        return np.stack([x, y], axis=1)
+
+    def _padded_distance_map(self, x: int, y: int) -> np.ndarray:
+        key = (x, y)
+        distance_map = self._distance_maps.get(key)
+        if distance_map is not None:
+            self._distance_maps.move_to_end(key)
+            return distance_map
+
+        distance_map = self._bfs((y + 1) * self._width + x + 1)
+        self._distance_maps[key] = distance_map
+        if len(self._distance_maps) > self.max_cached_distance_maps:
+            self._distance_maps.popitem(last=False)
+        return distance_map
+
+    def _bfs(self, start: int) -> np.ndarray:
+        """
+        Compute the distances of all cells of the padded grid to a start cell, one level at a time.
+        Unreachable cells and walls are -1.
+        """
+        distances = np.full(self._free.size, -1, dtype=np.int32)
+        distances[start] = 0
+        frontier = np.array([start])
+        distance = 0
+        while frontier.size:
+            distance += 1
+            neighbors = (frontier[:, None] + self._neighbor_offsets).ravel()
+            neighbors = np.unique(neighbors[self._free[neighbors] & (distances[neighbors] < 0)])
+            distances[neighbors] = distance
+            frontier = neighbors
+
+        distances.flags.writeable = False
+        return distances
+
+    def distance_map(self, x: int, y: int) -> np.ndarray:
+        """
+        Get the distances of all cells to a target cell. Unreachable cells and walls are -1.
+
+        Args:
+            x (int): The x-coordinate of the target.
+            y (int): The y-coordinate of the target.
+
+        Returns:
+            np.ndarray: The read-only (N, M) distances, indexed by y and x.
+        """
+        padded = self._padded_distance_map(x, y).reshape(self.N + 2, self._width)
+        return padded[1:-1, 1:-1]
+
+    def distance(self, x: int, y: int, target_x: int, target_y: int) -> Optional[int]:
+        """
+        Get the number of moves from a cell to a target cell, or None if it is unreachable.
+        """
+        distance = int(self.distance_map(target_x, target_y)[y, x])
+        return distance if distance >= 0 else None
+
+    def step_towards(self, positions: np.ndarray, target: Tuple[int, int]) -> np.ndarray:
+        """
+        Get the actions that move a batch of agents one step along a shortest path to a target.
+        Agents that are on the target or cannot reach it stay in place.
+
+        Args:
+            positions (np.ndarray): The (B, 2) positions of the agents.
+            target (Tuple[int, int]): The x and y coordinates of the target.
+
+        Returns:
+            np.ndarray: The (B, 2) actions in {-1, 0, 1}.
+        """
+        distance_map = self._padded_distance_map(*target)
+        cells = (positions[:, 1] + 1) * self._width + positions[:, 0] + 1
+        distances = distance_map[cells[:, None] + self._neighbor_offsets].astype(np.int64)
+        distances[distances < 0] = np.iinfo(np.int64).max
+        best = np.argmin(distances, axis=1)
+
+        current = distance_map[cells]
+        moves = (current > 0) & (distances[np.arange(len(cells)), best] < current)
+        offsets = self._neighbor_offsets[best]
+        # Recover dx and dy from the flat offsets, which are in [-width - 1, width + 1].
+        dy = (offsets + self._width + 1) // self._width - 1
+        dx = offsets - dy * self._width
+        return np.stack([dx, dy], axis=1) * moves[:, None]
+
+
+def load_board(path: str, **kwargs) -> Board:
+    """
+    Load a board from a map file, where '#' marks a wall and '.' a free cell.
+
+    Args:
+        path (str): The path of the map file.
+        **kwargs: Additional arguments passed to the Board constructor.
+
+    Returns:
+        Board: The loaded board.
+    """
+    with open(path) as f:
+        return Board.from_lines(f, **kwargs)
@@ -0,0 +1,89 @@
+# channels.py
+from typing import List, Tuple
+
+DEFAULT_TILE_SIZE = 4
+
+AGENT_MOVE = "agent_move"
+GAME_FREEZE_AGENT = "game_freeze_agent"
+
+# LCM channel subscriptions are regular expressions matched against the whole channel name.
+AGENT_MOVE_ALL = AGENT_MOVE + "(/.*)?"
+GAME_FREEZE_AGENT_ALL = GAME_FREEZE_AGENT + "(/.*)?"
+
+
+def get_tile(x: int, y: int, tile_size: int = DEFAULT_TILE_SIZE) -> Tuple[int, int]:
+    """
+    Get the tile containing the given cell.
+
+    Args:
+        x (int): The x-coordinate of the cell.
+        y (int): The y-coordinate of the cell.
+        tile_size (int): The side length of a tile in cells.
+
+    Returns:
+        Tuple[int, int]: The x and y indices of the tile.
+    """
+    return x // tile_size, y // tile_size
+
+
+def get_num_tiles(N: int, M: int, tile_size: int = DEFAULT_TILE_SIZE) -> Tuple[int, int]:
+    """
+    Get the number of tiles covering an NxM grid.
+
+    Args:
+        N (int): Number of rows in the grid.
+        M (int): Number of columns in the grid.
+        tile_size (int): The side length of a tile in cells.
+
+    Returns:
+        Tuple[int, int]: The number of tiles along x and y.
+    """
+    return -(-M // tile_size), -(-N // tile_size)
+
+
+def agent_move_tile_channel(tile_x: int, tile_y: int) -> str:
+    """
+    Get the agent_move channel of a tile.
+    """
+    return f"{AGENT_MOVE}/{tile_x}/{tile_y}"
+
+
+def agent_move_channel(x: int, y: int, tile_size: int = DEFAULT_TILE_SIZE) -> str:
+    """
+    Get the agent_move channel on which a move to the given cell is published.
+    """
+    return agent_move_tile_channel(*get_tile(x, y, tile_size))
+
+
+def agent_move_channels_around(
+    x: int, y: int, radius: int, N: int, M: int, tile_size: int = DEFAULT_TILE_SIZE
+) -> List[str]:
+    """
+    Get the agent_move channels of all tiles within a Chebyshev radius (in tiles) of a cell.
+
+    Args:
+        x (int): The x-coordinate of the cell.
+        y (int): The y-coordinate of the cell.
+        radius (int): The radius in tiles.
+        N (int): Number of rows in the grid.
+        M (int): Number of columns in the grid.
+        tile_size (int): The side length of a tile in cells.
+
+    Returns:
+        List[str]: The channels of the tiles in the area of interest.
+    """
+    tile_x, tile_y = get_tile(x, y, tile_size)
+    num_tiles_x, num_tiles_y = get_num_tiles(N, M, tile_size)
+
+    return [
+        agent_move_tile_channel(tx, ty)
+        for tx in range(max(0, tile_x - radius), min(num_tiles_x, tile_x + radius + 1))
+        for ty in range(max(0, tile_y - radius), min(num_tiles_y, tile_y + radius + 1))
+    ]
+
+
+def game_freeze_agent_channel(agent_id: str) -> str:
+    """
+    Get the channel on which the freeze of the given agent is published.
+    """
+    return f"{GAME_FREEZE_AGENT}/{agent_id}"
@@ -0,0 +1,115 @@
+# checkpoint.py
+from typing import Dict, Optional, Tuple, TypedDict
+import base64
+import json
+import os
+import tempfile
+
+import numpy as np
+
+CHECKPOINT_VERSION = 1
+
+
+class AgentSnapshot(TypedDict):
+    type: str
+    x: int
+    y: int
+
+
+class GameSnapshot(TypedDict):
+    version: int
+    num_agents: int
+    N: int
+    M: int
+    agents: Dict[str, AgentSnapshot]
+    num_it_agents: int
+    num_not_it_agents: int
+    has_game_started: bool
+    walls: Optional[str]  # Walls of the board as base64 packed bits, None without walls
+    rng_state: Tuple
+    saved_at: float
+
+
+def _to_json(value):
+    if isinstance(value, tuple):
+        return [_to_json(item) for item in value]
+    return value
+
+
+def _to_tuple(value):
+    if isinstance(value, list):
+        return tuple(_to_tuple(item) for item in value)
+    return value
+
+
+def save_checkpoint(path: str, snapshot: GameSnapshot):
+    """
+    Atomically write a snapshot to disk.
+
+    The snapshot is written to a temporary file in the same directory and renamed over the previous
+    checkpoint, so a crash while saving never leaves a partial checkpoint behind.
+
+    Args:
+        path (str): The path of the checkpoint file.
+        snapshot (GameSnapshot): The snapshot to write.
+    """
+    snapshot = dict(snapshot, rng_state=_to_json(snapshot["rng_state"]))
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".checkpoint-", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_checkpoint(path: str) -> GameSnapshot:
+    """
+    Load a snapshot from disk.
+
+    Args:
+        path (str): The path of the checkpoint file.
+
+    Returns:
+        GameSnapshot: The loaded snapshot.
+
+    Raises:
+        ValueError: If the checkpoint was written by an incompatible version.
+    """
+    with open(path) as f:
+        snapshot = json.load(f)
+
+    if snapshot.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {snapshot.get('version')}")
+
+    snapshot["rng_state"] = _to_tuple(snapshot["rng_state"])
+    return snapshot
+
+
+def encode_walls(walls: Optional[np.ndarray]) -> Optional[str]:
+    """
+    Encode the walls of a board as base64 packed bits, one bit per cell. Returns None without walls.
+    """
+    if walls is None or not walls.any():
+        return None
+    return base64.b64encode(np.packbits(walls.ravel())).decode("ascii")
+
+
+def decode_walls(data: str, N: int, M: int) -> np.ndarray:
+    """
+    Decode walls encoded by encode_walls into an (N, M) boolean array.
+    """
+    bits = np.frombuffer(base64.b64decode(data), dtype=np.uint8)
+    return np.unpackbits(bits, count=N * M).reshape(N, M).astype(bool)
+
+
+def remove_checkpoint(path: Optional[str]):
+    """
+    Remove a checkpoint if it exists.
+    """
+    if path is not None and os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,162 @@
+# codec.py
+from typing import Callable, Dict, Generic, List, Tuple, Type, TypeVar, Union
+import struct
+
+Buffer = Union[bytes, bytearray, memoryview]
+MessageType = TypeVar("MessageType")
+
+_PRIMITIVE_FORMATS = {
+    "int8_t": "b",
+    "int16_t": "h",
+    "int32_t": "i",
+    "int64_t": "q",
+    "float": "f",
+    "double": "d",
+    "boolean": "?",
+    "byte": "B",
+}
+
+_FINGERPRINT = struct.Struct(">Q")
+_STRING_LENGTH = struct.Struct(">I")
+
+
+class ReusableDecoder(Generic[MessageType]):
+    """
+    Decoder for flat LCM types that decodes every message into the same preallocated instance.
+
+    Fields are unpacked with ``struct.unpack_from`` directly from the received buffer, so no
+    intermediate BytesIO or copies of the payload are created. Decoded strings are interned in a
+    bounded cache keyed by their encoded bytes, so recurring strings such as agent ids are looked up
+    instead of decoded again.
+
+    The returned instance is overwritten by the next call to ``decode``; handlers must copy out the
+    fields they keep instead of holding on to the message.
+    """
+
+    def __init__(self, msg_type: Type[MessageType], max_cached_strings: int = 4096):
+        """
+        Initialize the decoder for the given LCM type.
+
+        Args:
+            msg_type (Type[MessageType]): The lcm-gen generated class to decode.
+            max_cached_strings (int): The maximum number of interned strings before the cache is cleared.
+
+        Raises:
+            TypeError: If the type contains arrays or nested types.
+        """
+        self.msg_type = msg_type
+        self.max_cached_strings = max_cached_strings
+        self._fingerprint = _FINGERPRINT.unpack(msg_type._get_packed_fingerprint())[0]
+        self._plan = self._compile_plan(msg_type)
+        self._strings: Dict[bytes, str] = {}
+        self.out: MessageType = msg_type()
+        self._decode = self._compile_decode()
+
+    @staticmethod
+    def _compile_plan(msg_type: type) -> List[Tuple]:
+        """
+        Group the fields of the type into strings and runs of fixed-size primitives.
+        """
+        plan = []
+        formats, attributes = "", []
+
+        for attribute, typename, dimension in zip(
+            msg_type.__slots__, msg_type.__typenames__, msg_type.__dimensions__
+        ):
+            if dimension is not None:
+                raise TypeError(f"{msg_type.__name__}.{attribute} is an array")
+
+            if typename in _PRIMITIVE_FORMATS:
+                formats += _PRIMITIVE_FORMATS[typename]
+                attributes.append(attribute)
+                continue
+
+            if typename != "string":
+                raise TypeError(f"{msg_type.__name__}.{attribute} has nested type {typename}")
+
+            if attributes:
+                plan.append(("struct", struct.Struct(">" + formats), tuple(attributes)))
+                formats, attributes = "", []
+            plan.append(("string", attribute))
+
+        if attributes:
+            plan.append(("struct", struct.Struct(">" + formats), tuple(attributes)))
+
+        return plan
+
+    def _compile_decode(self) -> Callable[[Buffer], MessageType]:
+        """
+        Generate a straight-line decode function for the plan, so that decoding a message does not
+        loop over fields or call setattr.
+        """
+        namespace = {
+            "fingerprint": self._fingerprint,
+            "unpack_fingerprint": _FINGERPRINT.unpack_from,
+            "unpack_length": _STRING_LENGTH.unpack_from,
+            "strings": self._strings,
+            "intern": self._intern,
+            "out": self.out,
+        }
+        lines = [
+            "def decode(data):",
+            "    if unpack_fingerprint(data, 0)[0] != fingerprint:",
+            "        raise ValueError('Decode error')",
+            "    offset = 8",
+        ]
+
+        for i, step in enumerate(self._plan):
+            if step[0] == "string":
+                # The encoded length includes the trailing null byte.
+                lines += [
+                    "    length = unpack_length(data, offset)[0]",
+                    "    if length == 0 or offset + 4 + length > len(data):",
+                    "        raise ValueError('Decode error')",
+                    "    key = data[offset + 4:offset + 3 + length]",
+                    "    value = strings.get(key)",
+                    "    out.%s = intern(key) if value is None else value" % step[1],
+                    "    offset += 4 + length",
+                ]
+            else:
+                _, packer, attributes = step
+                namespace[f"unpack_{i}"] = packer.unpack_from
+                targets = ", ".join(f"out.{attribute}" for attribute in attributes)
+                lines += [
+                    f"    {targets}, = unpack_{i}(data, offset)",
+                    f"    offset += {packer.size}",
+                ]
+
+        lines.append("    return out")
+        exec("\n".join(lines), namespace)
+        return namespace["decode"]
+
+    def __reduce__(self):
+        # struct.Struct cannot be pickled, so nodes holding a decoder are rebuilt from the type.
+        return ReusableDecoder, (self.msg_type, self.max_cached_strings)
+
+    def _intern(self, key: bytes) -> str:
+        if len(self._strings) >= self.max_cached_strings:
+            self._strings.clear()
+        value = key.decode("utf-8", "replace")
+        self._strings[key] = value
+        return value
+
+    def decode(self, data: Buffer) -> MessageType:
+        """
+        Decode a message into the reused instance.
+
+        Args:
+            data (Buffer): The encoded message, including its fingerprint.
+
+        Returns:
+            MessageType: The reused instance holding the decoded fields.
+
+        Raises:
+            ValueError: If the fingerprint does not match the type or the message is truncated.
+        """
+        if type(data) is not bytes:
+            # Slices of mutable buffers cannot be used as cache keys.
+            data = bytes(data)
+        try:
+            return self._decode(data)
+        except struct.error as e:
+            raise ValueError("Decode error") from e
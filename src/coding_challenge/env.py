@@ -0,0 +1,449 @@
+# env.py
+from typing import Any, Dict, List, Optional, Tuple, TypedDict
+import multiprocessing
+
+import numpy as np
+
+from coding_challenge.board import Board
+from coding_challenge.policies import Policy, make_policy, make_observations, apply_actions
+from coding_challenge.scenario import Scenario, generate_uniform_positions
+
+CONTROLLED = ("it", "not_it", None)
+
+
+class EnvObservations(TypedDict):
+    """
+    Observations of B independent games with K It agents and L NotIt agents each.
+    """
+
+    it_positions: np.ndarray  # (B, K, 2) int, x and y of every It agent
+    not_it_positions: np.ndarray  # (B, L, 2) int, x and y of every NotIt agent
+    active: np.ndarray  # (B, L) bool, whether the NotIt agent is still in the game
+    steps: np.ndarray  # (B,) int, steps since the game was reset
+
+
+def _nearest(
+    positions: np.ndarray, others: np.ndarray, mask: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the nearest of the other agents of every agent in each game, by squared distance as
+    ItAgent picks its target.
+
+    Args:
+        positions (np.ndarray): The (B, K, 2) positions of the agents.
+        others (np.ndarray): The (B, L, 2) positions of the other agents.
+        mask (Optional[np.ndarray]): The (B, L) flags telling which other agents can be picked.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The (B, K, 2) positions of the nearest agents and the
+        (B, K) flags telling whether there is one.
+    """
+    squared_distances = ((positions[:, :, None, :] - others[:, None, :, :]) ** 2).sum(axis=-1)
+    if mask is None:
+        has_target = np.ones(positions.shape[:2], dtype=bool)
+    else:
+        squared_distances = np.where(mask[:, None, :], squared_distances, np.iinfo(np.int64).max)
+        has_target = np.broadcast_to(mask.any(axis=1)[:, None], positions.shape[:2])
+    nearest = np.argmin(squared_distances, axis=2)
+    targets = np.take_along_axis(others, nearest[..., None], axis=1)
+    return targets, has_target
+
+
+def _check_actions(
+    actions: Optional[np.ndarray], action_shape: Optional[Tuple[int, int, int]]
+) -> Optional[np.ndarray]:
+    """
+    Check that the actions passed to step match the controlled agents.
+
+    Args:
+        actions (Optional[np.ndarray]): The actions passed to step.
+        action_shape (Optional[Tuple[int, int, int]]): The expected shape, None if no agent type is controlled.
+
+    Returns:
+        Optional[np.ndarray]: The actions as an array.
+
+    Raises:
+        ValueError: If the actions are missing or do not have the expected shape.
+    """
+    if action_shape is None:
+        if actions is not None:
+            raise ValueError("Expected no actions since no agent type is controlled")
+        return None
+
+    if actions is None:
+        raise ValueError(f"Expected actions of shape {action_shape}, got None")
+    actions = np.asarray(actions)
+    if actions.shape != action_shape:
+        raise ValueError(f"Expected actions of shape {action_shape}, got {actions.shape}")
+    return actions
+
+
+class VecFreezeTagEnv:
+    """
+    Gym-style environment that steps B independent freeze tag games at once with NumPy.
+
+    The games follow the rules of the GameNode: a NotIt agent is frozen and leaves the game when it
+    shares a cell with an It agent after a move, and a game ends when all NotIt agents are frozen.
+    Moves out of the grid or into walls are rejected. Every step is one tick at the rate of the
+    faster agent type, and each agent type moves on the ticks matching its rate, so It agents at
+    2 Hz move twice for every move of the NotIt agents at 1 Hz.
+
+    One agent type is controlled by the actions passed to step, the other is driven by a policy.
+    Games that end are reset automatically and their last observations are returned in the info.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        N: int,
+        M: int,
+        num_it: int = 1,
+        num_not_it: int = 1,
+        controlled: Optional[str] = "it",
+        it_policy: str = "greedy_chase",
+        not_it_policy: str = "random_walk",
+        it_rate_hz: float = 2.0,
+        not_it_rate_hz: float = 1.0,
+        max_steps: int = 200,
+        board: Optional[Board] = None,
+        scenario: Optional[Scenario] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the environment with the given parameters.
+
+        Args:
+            num_envs (int): The number B of games stepped at once.
+            N (int): Number of rows in the grid.
+            M (int): Number of columns in the grid.
+            num_it (int): Number K of It agents per game.
+            num_not_it (int): Number L of NotIt agents per game.
+            controlled (Optional[str]): The agent type controlled by the actions, "it", "not_it" or None if both follow their policies.
+            it_policy (str): The name of the policy of the It agents when they are not controlled.
+            not_it_policy (str): The name of the policy of the NotIt agents when they are not controlled.
+            it_rate_hz (float): The rate in Hz of the It agents.
+            not_it_rate_hz (float): The rate in Hz of the NotIt agents.
+            max_steps (int): The number of steps after which a game is truncated.
+            board (Optional[Board]): The board with the walls agents cannot enter. Defaults to no walls.
+            scenario (Optional[Scenario]): The scenario whose positions every game starts from. Defaults to uniformly random positions.
+            seed (Optional[int]): The seed of the random placements and policies.
+        """
+        if controlled not in CONTROLLED:
+            raise ValueError(f"Unknown controlled agent type {controlled}")
+
+        self.num_envs = num_envs
+        self.N = N
+        self.M = M
+        self.num_it = num_it
+        self.num_not_it = num_not_it
+        self.controlled = controlled
+        self.max_steps = max_steps
+        self.board = board
+        self.scenario = scenario
+
+        tick_rate_hz = max(it_rate_hz, not_it_rate_hz)
+        self.it_period = max(1, round(tick_rate_hz / it_rate_hz))
+        self.not_it_period = max(1, round(tick_rate_hz / not_it_rate_hz))
+
+        self.it_policy: Policy = make_policy(it_policy, N, M, board=board)
+        self.not_it_policy: Policy = make_policy(not_it_policy, N, M, board=board)
+        self.seed(seed)
+
+        self.it_positions = np.zeros((num_envs, num_it, 2), dtype=np.int64)
+        self.not_it_positions = np.zeros((num_envs, num_not_it, 2), dtype=np.int64)
+        self.active = np.ones((num_envs, num_not_it), dtype=bool)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+
+    @classmethod
+    def from_scenario(cls, num_envs: int, scenario: Scenario, **kwargs) -> "VecFreezeTagEnv":
+        """
+        Create an environment whose games all start from a scenario.
+
+        Args:
+            num_envs (int): The number B of games stepped at once.
+            scenario (Scenario): The scenario with the board size, rates and positions.
+            **kwargs: Additional arguments passed to the constructor.
+        """
+        return cls(
+            num_envs,
+            scenario["N"],
+            scenario["M"],
+            len(scenario["it_positions"]),
+            len(scenario["not_it_positions"]),
+            it_rate_hz=scenario["it_rate_hz"],
+            not_it_rate_hz=scenario["not_it_rate_hz"],
+            scenario=scenario,
+            **kwargs,
+        )
+
+    @property
+    def action_shape(self) -> Optional[Tuple[int, int, int]]:
+        """
+        The shape of the actions passed to step, None if no agent type is controlled.
+        """
+        if self.controlled is None:
+            return None
+        num_agents = self.num_it if self.controlled == "it" else self.num_not_it
+        return (self.num_envs, num_agents, 2)
+
+    def seed(self, seed: Optional[int] = None):
+        """
+        Reseed the random placements and the policies, so that games restarted with the same seed
+        play out the same.
+
+        Args:
+            seed (Optional[int]): The seed from which the generators of the placements and policies are derived.
+        """
+        self.rng = np.random.default_rng(seed)
+        it_seed, not_it_seed = self.rng.integers(0, 2**32, 2).tolist()
+        self.it_policy.rng = np.random.default_rng(it_seed)
+        self.not_it_policy.rng = np.random.default_rng(not_it_seed)
+
+    def get_observations(self) -> EnvObservations:
+        """
+        Get a copy of the observations of all games.
+        """
+        return {
+            "it_positions": self.it_positions.copy(),
+            "not_it_positions": self.not_it_positions.copy(),
+            "active": self.active.copy(),
+            "steps": self.steps.copy(),
+        }
+
+    def reset_envs(self, envs: np.ndarray):
+        """
+        Reset some of the games to their initial positions.
+
+        Args:
+            envs (np.ndarray): The indices of the games to reset.
+        """
+        num_envs = len(envs)
+        if self.scenario is not None:
+            self.it_positions[envs] = self.scenario["it_positions"]
+            self.not_it_positions[envs] = self.scenario["not_it_positions"]
+        else:
+            positions = generate_uniform_positions(
+                num_envs * (self.num_it + self.num_not_it), self.N, self.M, self.rng, self.board
+            ).reshape(num_envs, -1, 2)
+            self.it_positions[envs] = positions[:, : self.num_it]
+            self.not_it_positions[envs] = positions[:, self.num_it :]
+        self.active[envs] = True
+        self.steps[envs] = 0
+
+    def reset(self, seed: Optional[int] = None) -> EnvObservations:
+        """
+        Reset all games.
+
+        Args:
+            seed (Optional[int]): The seed of the random placements and policies. Keeps the current generators if None.
+
+        Returns:
+            EnvObservations: The observations of the new games.
+        """
+        if seed is not None:
+            self.seed(seed)
+        self.reset_envs(np.arange(self.num_envs))
+        return self.get_observations()
+
+    def _policy_actions(
+        self, policy: Policy, positions: np.ndarray, targets: np.ndarray, has_target: np.ndarray
+    ) -> np.ndarray:
+        observations = make_observations(
+            positions.reshape(-1, 2), targets.reshape(-1, 2), has_target.reshape(-1)
+        )
+        return policy.act(observations).reshape(positions.shape)
+
+    def _move(self, positions: np.ndarray, actions: np.ndarray, moving: np.ndarray) -> np.ndarray:
+        actions = np.clip(actions, -1, 1) * moving[..., None]
+        new_positions = apply_actions(
+            positions.reshape(-1, 2), actions.reshape(-1, 2), self.N, self.M, self.board
+        )
+        return new_positions.reshape(positions.shape)
+
+    def step(
+        self, actions: Optional[np.ndarray] = None
+    ) -> Tuple[EnvObservations, np.ndarray, np.ndarray, Dict[str, Any]]:
+        """
+        Step all games by one tick.
+
+        Args:
+            actions (Optional[np.ndarray]): The (B, K, 2) actions of the It agents or the (B, L, 2)
+                actions of the NotIt agents in {-1, 0, 1}, depending on the controlled agent type.
+                Actions of agents that do not move on this tick are ignored.
+
+        Returns:
+            Tuple[EnvObservations, np.ndarray, np.ndarray, Dict[str, Any]]: The observations, the
+            (B,) rewards, the (B,) done flags and the info. The reward is the number of NotIt agents
+            frozen in the step, negated when the NotIt agents are controlled. The info holds the (B,)
+            "terminated" and "truncated" flags, the (B, L) "frozen" flags and, if a game ended, the
+            "final_observations" before the automatic reset.
+
+        Raises:
+            ValueError: If the actions do not match the shape of the controlled agents, or are
+                given while no agent type is controlled.
+        """
+        actions = _check_actions(actions, self.action_shape)
+        self.steps += 1
+
+        if self.controlled == "it":
+            it_actions = actions
+        else:
+            targets, has_target = _nearest(self.it_positions, self.not_it_positions, self.active)
+            it_actions = self._policy_actions(self.it_policy, self.it_positions, targets, has_target)
+
+        if self.controlled == "not_it":
+            not_it_actions = actions
+        else:
+            targets, has_target = _nearest(self.not_it_positions, self.it_positions)
+            not_it_actions = self._policy_actions(
+                self.not_it_policy, self.not_it_positions, targets, has_target
+            )
+
+        it_moving = np.broadcast_to(
+            (self.steps % self.it_period == 0)[:, None], self.it_positions.shape[:2]
+        )
+        not_it_moving = self.active & (self.steps % self.not_it_period == 0)[:, None]
+        self.it_positions = self._move(self.it_positions, it_actions, it_moving)
+        self.not_it_positions = self._move(self.not_it_positions, not_it_actions, not_it_moving)
+
+        # A NotIt agent sharing a cell with an It agent is frozen, as in GameNode.verify_interception.
+        same_cell = (self.it_positions[:, :, None, :] == self.not_it_positions[:, None, :, :]).all(axis=-1)
+        frozen = self.active & same_cell.any(axis=1)
+        self.active &= ~frozen
+
+        reward = frozen.sum(axis=1).astype(np.float64)
+        if self.controlled == "not_it":
+            reward = -reward
+        terminated = ~self.active.any(axis=1)
+        truncated = ~terminated & (self.steps >= self.max_steps)
+        done = terminated | truncated
+
+        info: Dict[str, Any] = {"terminated": terminated, "truncated": truncated, "frozen": frozen}
+        if done.any():
+            info["final_observations"] = self.get_observations()
+            self.reset_envs(np.flatnonzero(done))
+
+        return self.get_observations(), reward, done, info
+
+    def close(self):
+        pass
+
+
+def _worker(remote, kwargs: Dict[str, Any]):
+    env = VecFreezeTagEnv(**kwargs)
+    try:
+        while True:
+            command, data = remote.recv()
+            if command == "step":
+                remote.send(env.step(data))
+            elif command == "reset":
+                remote.send(env.reset(data))
+            elif command == "action_shape":
+                remote.send(env.action_shape)
+            elif command == "close":
+                break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        remote.close()
+
+
+def _concatenate(items: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    return {key: np.concatenate([item[key] for item in items]) for key in items[0]}
+
+
+class SubprocVecFreezeTagEnv:
+    """
+    VecFreezeTagEnv split across worker processes, each stepping a slice of the B games, with the
+    same reset and step interface.
+    """
+
+    def __init__(self, num_envs: int, num_workers: int, seed: Optional[int] = None, **kwargs):
+        """
+        Start the worker processes.
+
+        Args:
+            num_envs (int): The total number B of games stepped at once.
+            num_workers (int): The number of worker processes.
+            seed (Optional[int]): The seed of the first worker, the others use the following seeds.
+            **kwargs: Additional arguments passed to VecFreezeTagEnv.
+        """
+        self.num_envs = num_envs
+        self.sizes = [len(chunk) for chunk in np.array_split(np.arange(num_envs), num_workers)]
+        self.sizes = [size for size in self.sizes if size]
+        self.splits = np.cumsum(self.sizes)[:-1]
+
+        self.remotes = []
+        self.processes = []
+        for worker, size in enumerate(self.sizes):
+            remote, worker_remote = multiprocessing.Pipe()
+            worker_kwargs = dict(kwargs, num_envs=size, seed=None if seed is None else seed + worker)
+            process = multiprocessing.Process(
+                target=_worker, args=(worker_remote, worker_kwargs), daemon=True
+            )
+            process.start()
+            worker_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+
+        self.remotes[0].send(("action_shape", None))
+        worker_action_shape = self.remotes[0].recv()
+        self.action_shape = (
+            None if worker_action_shape is None else (num_envs,) + worker_action_shape[1:]
+        )
+
+    def reset(self, seed: Optional[int] = None) -> EnvObservations:
+        """
+        Reset all games.
+
+        Args:
+            seed (Optional[int]): The seed of the first worker, the others use the following seeds.
+        """
+        for worker, remote in enumerate(self.remotes):
+            remote.send(("reset", None if seed is None else seed + worker))
+        return _concatenate([remote.recv() for remote in self.remotes])
+
+    def step(
+        self, actions: Optional[np.ndarray] = None
+    ) -> Tuple[EnvObservations, np.ndarray, np.ndarray, Dict[str, Any]]:
+        """
+        Step all games by one tick, see VecFreezeTagEnv.step.
+        """
+        # Checked before sending, so that invalid actions do not step only some of the workers.
+        actions = _check_actions(actions, self.action_shape)
+        worker_actions = (
+            [None] * len(self.remotes) if actions is None else np.split(actions, self.splits)
+        )
+        for remote, action in zip(self.remotes, worker_actions):
+            remote.send(("step", action))
+        results = [remote.recv() for remote in self.remotes]
+
+        observations = _concatenate([result[0] for result in results])
+        reward = np.concatenate([result[1] for result in results])
+        done = np.concatenate([result[2] for result in results])
+
+        infos = [result[3] for result in results]
+        info = _concatenate([{key: info[key] for key in ("terminated", "truncated", "frozen")} for info in infos])
+        if any("final_observations" in worker_info for worker_info in infos):
+            # Workers without finished games report their current observations.
+            info["final_observations"] = _concatenate(
+                [
+                    worker_info.get("final_observations", result[0])
+                    for worker_info, result in zip(infos, results)
+                ]
+            )
+        return observations, reward, done, info
+
+    def close(self):
+        """
+        Stop the worker processes.
+        """
+        for remote in self.remotes:
+            try:
+                remote.send(("close", None))
+            except (BrokenPipeError, EOFError):
+                pass
+        for process in self.processes:
+            process.join()
+        for remote in self.remotes:
+            remote.close()
@@ -1,16 +1,31 @@
 # game.py
-from typing import List, Tuple
+from typing import List, Tuple, Optional
 import multiprocessing
+import threading
 import logging
+import os
+
+import numpy as np
 
 from coding_challenge.agents import ItAgent, NotItAgent, Node
+from coding_challenge.node import NodeStats
 from coding_challenge.game_node import GameNodeWithGUI
+from coding_challenge.channels import DEFAULT_TILE_SIZE
+from coding_challenge.policies import make_policy
+from coding_challenge.board import Board
+from coding_challenge.scenario import validate_positions
+from coding_challenge.impairment import ImpairmentProfile
 
 def process_initial_positions(
-    args_positions: List[int], N: int, M: int, num_not_it: int, num_it: int = 1
+    args_positions: List[int],
+    N: int,
+    M: int,
+    num_not_it: int,
+    num_it: int = 1,
+    board: Optional[Board] = None,
 ) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
     """
-    Process the initial positions of agents.
+    Process the initial positions of agents, validating all of them in one vectorized pass.
 
     Args:
         args_positions (List[int]): List of positions as integers.
@@ -18,6 +33,7 @@ def process_initial_positions(
         M (int): Number of columns in the grid.
         num_not_it (int): Number of NotIt agents.
         num_it (int): Number of It agents.
+        board (Optional[Board]): The board with the walls agents cannot start in.
 
     Returns:
         Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]: Positions of It and NotIt agents.
@@ -32,31 +48,37 @@ def process_initial_positions(
             f"Number of positions does not match the number of agents. Expected {expected_num_agents}, got {len(args_positions) // 2}"
         )
 
-    not_it_agent_positions = []
-    it_agent_positions = []
-
-    for i in range(num_not_it):
-        x, y = args_positions[2 * i], args_positions[2 * i + 1]
-        if x < 0 or x >= M or y < 0 or y >= N:
-            raise ValueError(f"Agents are located out of bounds")
-
-        not_it_agent_positions.append((x, y))
-
-    for i in range(num_not_it, num_not_it + num_it):
-        x, y = args_positions[2 * i], args_positions[2 * i + 1]
-        if x < 0 or x >= M or y < 0 or y >= N:
-            raise ValueError(f"Agents are located out of bounds")
+    positions = np.asarray(args_positions, dtype=np.int64).reshape(-1, 2)
+    validate_positions(positions, N, M, board)
 
-        it_agent_positions.append((x, y))
+    not_it_agent_positions = [tuple(position) for position in positions[:num_not_it].tolist()]
+    it_agent_positions = [tuple(position) for position in positions[num_not_it:].tolist()]
 
     return it_agent_positions, not_it_agent_positions
 
 
-def launch_node(node: Node):
+def launch_node(node: Node) -> NodeStats:
     """
     Helper function to launch a node in a separate process.
     """
-    node.launch_node()
+    return node.launch_node()
+
+
+def launch_nodes(nodes: List[Node]) -> List[NodeStats]:
+    """
+    Helper function to launch several nodes in a separate process, each on its own thread.
+    """
+    stats: List[Optional[NodeStats]] = [None] * len(nodes)
+
+    def launch(i: int):
+        stats[i] = nodes[i].launch_node()
+
+    threads = [threading.Thread(target=launch, args=(i,)) for i in range(len(nodes))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return stats
 
 
 def setup_game(
@@ -64,6 +86,19 @@ def setup_game(
     not_it_agent_positions: List[Tuple[int, int]],
     N: int,
     M: int,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_interval_s: float = 5.0,
+    speed: float = 1.0,
+    agent_timeout_s: float = 5.0,
+    it_policy: str = "greedy_chase",
+    not_it_policy: str = "random_walk",
+    board: Optional[Board] = None,
+    it_rate_hz: float = 2.0,
+    not_it_rate_hz: float = 1.0,
+    impairment: Optional[ImpairmentProfile] = None,
+    impairment_seed: int = 0,
+    num_processes: Optional[int] = None,
 ):
     """
     Set up and launch the game with the specified agents and grid size.
@@ -73,23 +108,111 @@ def setup_game(
         not_it_agent_positions (List[Tuple[int, int]]): Positions of NotIt agents.
         N (int): Number of rows in the grid.
         M (int): Number of columns in the grid.
+        tile_size (int): The side length in cells of the tiles used for area-of-interest move channels.
+        checkpoint_path (Optional[str]): The file to which snapshots of the game are saved. Disabled if None.
+        checkpoint_interval_s (float): The interval in seconds between snapshots.
+        speed (float): The time dilation factor applied to the rates and timeouts of every node.
+        agent_timeout_s (float): The game seconds without messages from an agent after which it is evicted.
+        it_policy (str): The name of the policy of the It agents.
+        not_it_policy (str): The name of the policy of the NotIt agents.
+        board (Optional[Board]): The board with the walls agents cannot enter. Defaults to no walls.
+        it_rate_hz (float): The rate in Hz of the It agents.
+        not_it_rate_hz (float): The rate in Hz of the NotIt agents.
+        impairment (Optional[ImpairmentProfile]): The network impairments emulated on the messages received by every node. Disabled if None.
+        impairment_seed (int): The seed of the emulation. Every node uses its own seed derived from it.
+        num_processes (Optional[int]): The number of processes the agents are split across. Defaults to the number of CPUs.
     """
+    if num_processes is None:
+        num_processes = os.cpu_count() or 1
+    if num_processes < 1:
+        raise ValueError(f"Number of processes must be positive, got {num_processes}")
+
     num_agents = len(not_it_agent_positions) + len(it_agent_positions)
     nodes = []
 
-    game_node = GameNodeWithGUI(num_agents, N, M)
+    game_node = GameNodeWithGUI(
+        num_agents,
+        N,
+        M,
+        checkpoint_path=checkpoint_path,
+        checkpoint_interval_s=checkpoint_interval_s,
+        speed=speed,
+        agent_timeout_s=agent_timeout_s,
+        board=board,
+    )
 
     # Launch It agents
     for x, y in it_agent_positions:
-        nodes.append(ItAgent(x, y, N, M))
+        nodes.append(
+            ItAgent(
+                x,
+                y,
+                N,
+                M,
+                it_rate_hz,
+                tile_size=tile_size,
+                speed=speed,
+                policy=make_policy(it_policy, N, M, board=board),
+                board=board,
+            )
+        )
 
     # Launch NotIt agents
     for x, y in not_it_agent_positions:
-        nodes.append(NotItAgent(x, y, N, M))
+        nodes.append(
+            NotItAgent(
+                x,
+                y,
+                N,
+                M,
+                not_it_rate_hz,
+                tile_size=tile_size,
+                speed=speed,
+                policy=make_policy(not_it_policy, N, M, board=board),
+                board=board,
+            )
+        )
 
-    with multiprocessing.Pool(processes=len(nodes)) as pool:
-        pool.map_async(launch_node, nodes)
+    if impairment is not None:
+        # Every node loses and delays messages independently, like receivers on a multicast bus.
+        for i, node in enumerate([game_node] + nodes):
+            node.set_impairment(impairment, impairment_seed + 2 * i)
+
+    # Agents mostly sleep between ticks, so many of them share a process instead of one process each.
+    num_processes = min(num_processes, len(nodes))
+    groups = [nodes[i::num_processes] for i in range(num_processes)]
+
+    with multiprocessing.Pool(processes=num_processes) as pool:
+        pool.map_async(launch_nodes, groups)
 
         # Launch the game node
         game_node.launch_node()
+
+
+def resume_game(
+    checkpoint_path: str,
+    checkpoint_interval_s: float = 5.0,
+    speed: float = 1.0,
+    agent_timeout_s: float = 5.0,
+    board: Optional[Board] = None,
+):
+    """
+    Relaunch the game node from a checkpoint. The agents of the interrupted game keep running and
+    are re-admitted by the resumed game node.
+
+    Args:
+        checkpoint_path (str): The checkpoint to resume from.
+        checkpoint_interval_s (float): The interval in seconds between snapshots.
+        speed (float): The time dilation factor the agents of the interrupted game run at.
+        agent_timeout_s (float): The game seconds without messages from an agent after which it is evicted.
+        board (Optional[Board]): The board of the interrupted game. Defaults to the walls saved in the checkpoint.
+    """
+    game_node = GameNodeWithGUI.from_checkpoint(
+        checkpoint_path,
+        checkpoint_interval_s=checkpoint_interval_s,
+        speed=speed,
+        agent_timeout_s=agent_timeout_s,
+        board=board,
+    )
+    game_node.launch_node()
             
\ No newline at end of file
@@ -1,12 +1,26 @@
-from typing import Tuple, Dict, List, TypeAlias, TypedDict, Callable
+from typing import Tuple, Dict, List, Set, TypeAlias, TypedDict, Callable, Optional
 import time
 import random
+import queue
+import threading
 from uuid import uuid4
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.animation import FuncAnimation
 
 from coding_challenge.node import Node
+from coding_challenge.codec import ReusableDecoder
+from coding_challenge.board import Board
+from coding_challenge.channels import AGENT_MOVE_ALL, game_freeze_agent_channel
+from coding_challenge.checkpoint import (
+    CHECKPOINT_VERSION,
+    GameSnapshot,
+    save_checkpoint,
+    load_checkpoint,
+    remove_checkpoint,
+    encode_walls,
+    decode_walls,
+)
 import coding_challenge.messages as messages
 
 class AgentState(TypedDict):
@@ -18,12 +32,39 @@ GameBoard: TypeAlias = List[List[List[str]]]
 AgentId: TypeAlias = str
 AgentsDict: TypeAlias = Dict[AgentId, AgentState]
 
+class PositionSnapshot(TypedDict):
+    """
+    Read-only positions of the agents on the board at the end of a tick.
+    """
+
+    tick: int
+    agent_ids: Tuple[AgentId, ...]
+    positions: np.ndarray  # (A, 2) int, x and y of every agent
+    is_it: np.ndarray  # (A,) bool, whether the agent is an It agent
+
+
+def _make_snapshot_buffer(capacity: int) -> Tuple[np.ndarray, np.ndarray]:
+    return np.zeros((capacity, 2), dtype=np.int64), np.zeros(capacity, dtype=bool)
+
+
 class GameNode(Node):
     """
     A class to represent the game node which manages the game state and agents.
     """
 
-    def __init__(self, num_agents: int, N: int, M: int, rate_hz: float = 1.0, on_update: Callable[[AgentsDict], None] = None):
+    def __init__(
+        self,
+        num_agents: int,
+        N: int,
+        M: int,
+        rate_hz: float = 1.0,
+        on_update: Callable[[AgentsDict], None] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_interval_s: float = 5.0,
+        speed: float = 1.0,
+        agent_timeout_s: float = 5.0,
+        board: Optional[Board] = None,
+    ):
         """
         Initialize the GameNode with the given parameters.
 
@@ -33,15 +74,26 @@ class GameNode(Node):
             M (int): The number of columns in the grid.
             rate_hz (float): The rate in Hz at which the game state is updated.
             on_update (Callable[[GameBoard], None]): A callback function that is called when the game state is updated.
+            checkpoint_path (Optional[str]): The file to which snapshots of the game are saved. Disabled if None.
+            checkpoint_interval_s (float): The interval in seconds between snapshots.
+            speed (float): The time dilation factor by which the rate is multiplied and the game timeouts are divided.
+            agent_timeout_s (float): The game seconds without messages from an agent after which it is evicted.
+            board (Optional[Board]): The board with the walls agents cannot enter. Defaults to no walls.
         """
         print("Creating GameNode")
 
         super().__init__()
-        self.rate_hz = rate_hz
+        self.speed = speed
+        self.rate_hz = rate_hz * speed
+        self.agent_timeout_s = agent_timeout_s / speed
         self.num_agents = num_agents
         self.N = N
         self.M = M
+        self.board = board
+        self._encoded_walls = encode_walls(board.walls if board is not None else None)
         self.on_update = on_update
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval_s = checkpoint_interval_s
 
         self.agents: AgentsDict = {}
         self.game_board: List[List[List[str]]] = [
@@ -51,11 +103,163 @@ class GameNode(Node):
         self.num_it_agents = 0
         self.num_not_it_agents = 0
         self.has_game_started = False
+        self.has_game_ended = False
+
+        self._start_decoder = ReusableDecoder(messages.agent_start_t)
+        self._move_decoder = ReusableDecoder(messages.agent_move_t)
+        self._stop_decoder = ReusableDecoder(messages.agent_stop_t)
+        self._last_checkpoint_time = 0.0
+        self._checkpoint_queue: Optional[queue.SimpleQueue] = None
+        self._checkpoint_writer: Optional[threading.Thread] = None
+        self._last_move_seq: Dict[AgentId, int] = {}
+        self._last_seen: Dict[AgentId, float] = {}
+        self.evicted_agents: Set[AgentId] = set()
+        # Late messages of removed agents, e.g. delayed or reordered by the network, are ignored.
+        self.removed_agents: Set[AgentId] = set()
+        self._tick = 0
+
+        # Positions of the agents on the board in slots of arrays, written by the handler thread.
+        self._slots: Dict[AgentId, int] = {}
+        self._slot_ids: List[AgentId] = []
+        self._slot_positions, self._slot_is_it = _make_snapshot_buffer(max(num_agents, 1))
+        self._slot_ids_changed = False
+        self._is_snapshot_scheduled = False
+
+        # Readers get the latest snapshot, which is never written again.
+        self.position_snapshot: PositionSnapshot = {
+            "tick": -1,
+            "agent_ids": (),
+            "positions": np.zeros((0, 2), dtype=np.int64),
+            "is_it": np.zeros(0, dtype=bool),
+        }
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint_path: str, **kwargs) -> "GameNode":
+        """
+        Create a game node that resumes the game saved in a checkpoint.
+
+        Args:
+            checkpoint_path (str): The checkpoint to resume from. New snapshots are saved to the same file.
+            **kwargs: Additional arguments passed to the constructor. The board defaults to the walls saved in the checkpoint.
+
+        Returns:
+            GameNode: The game node with the restored state.
+
+        Raises:
+            ValueError: If the given board does not have the walls of the checkpoint.
+        """
+        snapshot = load_checkpoint(checkpoint_path)
+        walls = snapshot.get("walls")
+        board = kwargs.get("board")
+        if board is None and walls is not None:
+            kwargs["board"] = Board(decode_walls(walls, snapshot["N"], snapshot["M"]))
+        elif board is not None and (
+            (board.N, board.M) != (snapshot["N"], snapshot["M"]) or encode_walls(board.walls) != walls
+        ):
+            raise ValueError("The board differs from the board of the checkpoint")
+
+        node = cls(
+            snapshot["num_agents"],
+            snapshot["N"],
+            snapshot["M"],
+            checkpoint_path=checkpoint_path,
+            **kwargs,
+        )
+        node.restore_snapshot(snapshot)
+        return node
+
+    def get_snapshot(self) -> GameSnapshot:
+        """
+        Take a compact snapshot of the game state. Must run on the handler thread once the node is
+        launched, so that no handler moves an agent while its position is copied.
+        """
+        agents = {}
+        for agent_id, agent in self.agents.copy().items():
+            agent = agent.copy()
+            if "x" in agent:
+                agents[agent_id] = {"type": agent["type"], "x": agent["x"], "y": agent["y"]}
+
+        return {
+            "version": CHECKPOINT_VERSION,
+            "num_agents": self.num_agents,
+            "N": self.N,
+            "M": self.M,
+            "agents": agents,
+            "num_it_agents": self.num_it_agents,
+            "num_not_it_agents": self.num_not_it_agents,
+            "has_game_started": self.has_game_started,
+            "walls": self._encoded_walls,
+            "rng_state": random.getstate(),
+            "saved_at": time.time(),
+        }
+
+    def restore_snapshot(self, snapshot: GameSnapshot):
+        """
+        Restore the game state from a snapshot. Must be called before the node is launched.
+
+        Args:
+            snapshot (GameSnapshot): The snapshot to restore.
+
+        Raises:
+            ValueError: If an agent is out of bounds or inside a wall of the board.
+        """
+        self.agents = {}
+        self.game_board = [[[] for _ in range(self.M)] for _ in range(self.N)]
+        self._slots = {}
+        self._slot_ids = []
+        self._slot_ids_changed = True
+
+        for agent_id, agent in snapshot["agents"].items():
+            self.agents[agent_id] = {"type": agent["type"]}
+            if not self.set_agent_position(agent_id, agent["x"], agent["y"]):
+                raise ValueError(
+                    f"Agent {agent_id} cannot be restored at ({agent['x']}, {agent['y']})"
+                )
+
+        # The counters of the snapshot also count agents that had not been placed yet, which are
+        # not restored, so they are recomputed from the restored agents.
+        agent_types = [agent["type"] for agent in self.agents.values()]
+        self.num_it_agents = agent_types.count("it")
+        self.num_not_it_agents = agent_types.count("not_it")
+        self.has_game_started = snapshot["has_game_started"]
+        random.setstate(snapshot["rng_state"])
+
+    def save_checkpoint(self):
+        """
+        Save a snapshot of the game to the checkpoint file.
+        """
+        save_checkpoint(self.checkpoint_path, self.get_snapshot())
+        self._last_checkpoint_time = time.time()
+
+    def queue_checkpoint(self):
+        """
+        Take a snapshot of the game and hand it to the checkpoint writer thread, which saves it to the
+        checkpoint file. Must run on the handler thread.
+        """
+        self._checkpoint_queue.put(self.get_snapshot())
+
+    def _write_checkpoints(self):
+        while True:
+            snapshot = self._checkpoint_queue.get()
+            if snapshot is None:
+                return
+            try:
+                save_checkpoint(self.checkpoint_path, snapshot)
+            except OSError as e:
+                print(f"Error saving checkpoint: {e}")
 
     def agent_start_handler(self, _channel: str, data: bytes):
-        msg = messages.agent_start_t.decode(data)
+        msg = self._start_decoder.decode(data)
+
+        if msg.agent_id in self.removed_agents:
+            return
+
+        self._last_seen[msg.agent_id] = time.time()
 
         if msg.agent_id in self.agents:
+            if self.has_game_started:
+                # The agent missed the game start, e.g. because the game node was restarted.
+                self.publish("game_start", messages.game_start_t())
             return
 
         if msg.agent_type == "it":
@@ -68,9 +272,12 @@ class GameNode(Node):
 
         self.agents[msg.agent_id] = {"type": msg.agent_type}
 
-        self.set_agent_position(msg.agent_id, msg.x, msg.y)
+        if not self.set_agent_position(msg.agent_id, msg.x, msg.y):
+            print(f"Agent {msg.agent_id} cannot start inside a wall.")
+            return self.stop_node()
 
-        if len(self.agents) == self.num_agents:
+        # Agents that join later, e.g. agents respawned by the load generator, do not restart the game.
+        if not self.has_game_started and len(self.agents) == self.num_agents:
             self.publish("game_start", messages.game_start_t())
             print("Game started")
             self.has_game_started = True
@@ -79,26 +286,54 @@ class GameNode(Node):
             self.on_update(self.agents)
 
     def agent_move_handler(self, _channel: str, data: bytes):
-        msg = messages.agent_move_t.decode(data)
+        msg = self._move_decoder.decode(data)
+        if msg.agent_id in self.removed_agents:
+            return
+
         if msg.agent_id not in self.agents:
             print(f"Agent {msg.agent_id} was never initialized.")
             return self.stop_node()
 
+        # Every move doubles as a heartbeat of the agent.
+        self._last_seen[msg.agent_id] = time.time()
+
+        last_seq = self._last_move_seq.get(msg.agent_id)
+        if last_seq is not None:
+            if msg.seq <= last_seq:
+                # Stale move delivered out of order
+                return
+            self.stats["dropped"] += msg.seq - last_seq - 1
+        self._last_move_seq[msg.agent_id] = msg.seq
+
         agent_state = self.agents[msg.agent_id]
-        self.set_agent_position(msg.agent_id, msg.x, msg.y)
+        if not self.set_agent_position(msg.agent_id, msg.x, msg.y):
+            return
         self.verify_interception(agent_state)
         self.verify_game_over()
 
     def agent_stop_handler(self, _channel: str, data: bytes):
-        msg = messages.agent_stop_t.decode(data)
+        msg = self._stop_decoder.decode(data)
+
+        if msg.agent_id in self.removed_agents:
+            return
 
         if msg.agent_id not in self.agents:
             print(f"Agent {msg.agent_id} was never initialized.")
-            self.stop_node()
+            return self.stop_node()
+
+        self.remove_agent(msg.agent_id)
+
+    def remove_agent(self, agent_id: AgentId):
+        """
+        Remove an agent from the game and stop the game if no NotIt agents are left. Later messages
+        of the agent are ignored, so its ID cannot rejoin the game.
 
-        agent = self.agents[msg.agent_id]
+        Args:
+            agent_id (AgentId): The ID of the agent.
+        """
+        agent = self.agents[agent_id]
         x, y = agent["x"], agent["y"]
-        self.game_board[y][x].remove(msg.agent_id)
+        self.game_board[y][x].remove(agent_id)
 
         if agent["type"] == "it":
             self.num_it_agents -= 1
@@ -107,17 +342,44 @@ class GameNode(Node):
 
         if self.num_not_it_agents == 0:
             print("All NotIt agents have been frozen")
+            self.has_game_ended = True
             self.publish("game_stop", messages.game_stop_t())
             self.stop_node()
 
-        del self.agents[msg.agent_id]
+        del self.agents[agent_id]
+        self.removed_agents.add(agent_id)
+        self._release_slot(agent_id)
+        self._last_move_seq.pop(agent_id, None)
+        self._last_seen.pop(agent_id, None)
 
         if self.on_update is not None:
             self.on_update(self.agents)
 
+    def evict_silent_agents(self):
+        """
+        Evict the agents that have not sent any message within the agent timeout, e.g. because their
+        process crashed. Evicted agents are frozen, so that It agents chasing them pick a new target.
+        """
+        now = time.time()
+        for agent_id, last_seen in list(self._last_seen.items()):
+            if now - last_seen <= self.agent_timeout_s or agent_id not in self.agents:
+                continue
+
+            print(f"Agent {agent_id} has been silent for too long and is evicted")
+            self.evicted_agents.add(agent_id)
+            msg = messages.game_freeze_agent_t()
+            msg.agent_id = agent_id
+            self.publish(game_freeze_agent_channel(agent_id), msg)
+            self.remove_agent(agent_id)
+
+        if self.has_game_started and self.num_it_agents == 0 and self.running:
+            print("All It agents have left")
+            self.stop_node()
+
     def verify_game_over(self):
         if len(self.agents) == 1:
             print("Game over")
+            self.has_game_ended = True
             self.stop_node()
 
     def verify_interception(self, agent_state: AgentState):
@@ -141,57 +403,183 @@ class GameNode(Node):
                 if self.agents[agent_id]["type"] == "not_it":
                     msg = messages.game_freeze_agent_t()
                     msg.agent_id = agent_id
-                    self.publish("game_freeze_agent", msg)
+                    self.publish(game_freeze_agent_channel(agent_id), msg)
 
-    def set_agent_position(self, agent_id: str, x: int, y: int):
+    def set_agent_position(self, agent_id: str, x: int, y: int) -> bool:
         """
-        Set the position of an agent on the game board.
+        Set the position of an agent on the game board. Moves into walls are rejected and the agent
+        stays where it was.
 
         Args:
             agent_id (str): The ID of the agent.
             x (int): The x-coordinate of the agent's position.
             y (int): The y-coordinate of the agent's position.
+
+        Returns:
+            bool: Whether the agent was moved.
         """
         agent = self.agents[agent_id]
 
-        if "x" in agent and "y" in agent:
-            self.game_board[agent["y"]][agent["x"]].remove(agent_id)
-
         if x < 0 or x >= self.M or y < 0 or y >= self.N:
             print(f"Agent {agent_id} is located out of bounds")
-            return self.stop_node()
+            self.stop_node()
+            return False
+
+        if self.board is not None and self.board.is_wall(x, y):
+            print(f"Agent {agent_id} tried to move into a wall")
+            return False
+
+        if "x" in agent and "y" in agent:
+            self.game_board[agent["y"]][agent["x"]].remove(agent_id)
 
         self.game_board[y][x].append(agent_id)
         agent["x"] = x
         agent["y"] = y
+
+        slot = self._slots.get(agent_id)
+        if slot is None:
+            slot = self._allocate_slot(agent_id, agent["type"] == "it")
+        self._slot_positions[slot, 0] = x
+        self._slot_positions[slot, 1] = y
+        self._schedule_position_snapshot()
         
         if self.on_update is not None:
             self.on_update(self.agents)
 
+        return True
+
+    def _allocate_slot(self, agent_id: AgentId, is_it: bool) -> int:
+        slot = len(self._slot_ids)
+        if slot == len(self._slot_is_it):
+            positions, is_it_flags = _make_snapshot_buffer(2 * slot)
+            positions[:slot] = self._slot_positions
+            is_it_flags[:slot] = self._slot_is_it
+            self._slot_positions, self._slot_is_it = positions, is_it_flags
+
+        self._slots[agent_id] = slot
+        self._slot_ids.append(agent_id)
+        self._slot_is_it[slot] = is_it
+        self._slot_ids_changed = True
+        return slot
+
+    def _release_slot(self, agent_id: AgentId):
+        slot = self._slots.pop(agent_id, None)
+        if slot is None:
+            return
+
+        # Move the last slot into the freed one to keep the slots contiguous.
+        last = len(self._slot_ids) - 1
+        last_id = self._slot_ids.pop()
+        if slot != last:
+            self._slot_ids[slot] = last_id
+            self._slots[last_id] = slot
+            self._slot_positions[slot] = self._slot_positions[last]
+            self._slot_is_it[slot] = self._slot_is_it[last]
+        self._slot_ids_changed = True
+        self._schedule_position_snapshot()
+
+    def _schedule_position_snapshot(self):
+        # Publish the changed positions once the handler thread has handled the current message, so
+        # that readers like the GUI do not wait for the next game tick.
+        if self._is_snapshot_scheduled or not self.running:
+            return
+        self._is_snapshot_scheduled = True
+        self.call_in_handler_thread(self.swap_position_snapshot)
+
+    def swap_position_snapshot(self):
+        """
+        Publish the current positions as a new snapshot. Must run on the handler thread. Scheduled
+        whenever positions change, at most once per pass of the handler loop.
+
+        The contiguous slots are copied into new arrays, which replace the published snapshot with a
+        single reference assignment, so readers never lock or see a partial update. Published arrays
+        are never written again, so readers may keep a snapshot across ticks.
+        """
+        self._is_snapshot_scheduled = False
+        num_agents = len(self._slot_ids)
+        positions = self._slot_positions[:num_agents].copy()
+        is_it = self._slot_is_it[:num_agents].copy()
+        positions.flags.writeable = False
+        is_it.flags.writeable = False
+
+        agent_ids = self.position_snapshot["agent_ids"]
+        if self._slot_ids_changed:
+            agent_ids = tuple(self._slot_ids)
+            self._slot_ids_changed = False
+
+        self.position_snapshot = {
+            "tick": self._tick,
+            "agent_ids": agent_ids,
+            "positions": positions,
+            "is_it": is_it,
+        }
+
     def on_start(self):
-        self.subscribe("agent_move", self.agent_move_handler)
+        self.subscribe(AGENT_MOVE_ALL, self.agent_move_handler)
         self.subscribe("agent_start", self.agent_start_handler)
         self.subscribe("agent_stop", self.agent_stop_handler)
 
+        if self.checkpoint_path is not None:
+            # Snapshots are written to disk on their own thread, off the game loop and the handlers.
+            self._checkpoint_queue = queue.SimpleQueue()
+            self._checkpoint_writer = threading.Thread(target=self._write_checkpoints, daemon=True)
+            self._checkpoint_writer.start()
+
+        # Give the known agents a full timeout to show up, e.g. after resuming from a checkpoint.
+        now = time.time()
+        for agent_id in self.agents:
+            self._last_seen[agent_id] = now
+
+        if self.has_game_started:
+            # Resumed from a checkpoint, let the live agents continue.
+            print("Game resumed")
+            self.publish("game_start", messages.game_start_t())
+
     def run(self, timeout_s: float = 10.0):
         """
         Run the game loop.
 
         Args:
-            timeout_s (float): The timeout in seconds for waiting for agents to subscribe.
+            timeout_s (float): The timeout in game seconds for waiting for agents to subscribe.
         """
+        timeout_s /= self.speed
         start_time = time.time()
         while self.running:
-            if not self.has_game_started and len(self.agents) < self.num_agents and time.time() - start_time > timeout_s:
+            tick_start_time = time.time()
+
+            if not self.has_game_started and len(self.agents) < self.num_agents and tick_start_time - start_time > timeout_s:
                 print("Timeout waiting for agents to subscribe")
                 self.stop_node()
                 return
 
-            time.sleep(1.0 / self.rate_hz)
+            if (
+                self.checkpoint_path is not None
+                and time.time() - self._last_checkpoint_time >= self.checkpoint_interval_s
+            ):
+                self.call_in_handler_thread(self.queue_checkpoint)
+                self._last_checkpoint_time = time.time()
+
+            heartbeat = messages.game_heartbeat_t()
+            heartbeat.tick = self._tick
+            self.publish("game_heartbeat", heartbeat)
+            self._tick += 1
+
+            self.call_in_handler_thread(self.evict_silent_agents)
+
+            self.sleep_until_next_tick(tick_start_time, self.rate_hz)
 
     def on_stop(self):
         msg = messages.game_stop_t()
         self.publish("game_stop", msg)
+
+        if self._checkpoint_writer is not None:
+            # Finish the pending writes, so that no snapshot is saved after the checkpoint is removed.
+            self._checkpoint_queue.put(None)
+            self._checkpoint_writer.join()
+
+        if self.has_game_ended:
+            # The game ended cleanly, so there is nothing left to resume.
+            remove_checkpoint(self.checkpoint_path)
         print("Game stopped")
 
 
@@ -199,7 +587,18 @@ class GameNodeWithGUI(GameNode):
     """
     A class to represent the game node with a GUI for visualization.
     """
-    def __init__(self, num_agents: int, N: int, M: int, rate_hz: float = 1.0):
+    def __init__(
+        self,
+        num_agents: int,
+        N: int,
+        M: int,
+        rate_hz: float = 1.0,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_interval_s: float = 5.0,
+        speed: float = 1.0,
+        agent_timeout_s: float = 5.0,
+        board: Optional[Board] = None,
+    ):
         """
         Initialize the GameNode with the given parameters.
 
@@ -208,8 +607,23 @@ class GameNodeWithGUI(GameNode):
             N (int): The number of rows in the grid.
             M (int): The number of columns in the grid.
             rate_hz (float): The rate in Hz at which the game state is updated.
+            checkpoint_path (Optional[str]): The file to which snapshots of the game are saved. Disabled if None.
+            checkpoint_interval_s (float): The interval in seconds between snapshots.
+            speed (float): The time dilation factor by which the rate is multiplied and the game timeouts are divided.
+            agent_timeout_s (float): The game seconds without messages from an agent after which it is evicted.
+            board (Optional[Board]): The board with the walls agents cannot enter. Defaults to no walls.
         """
-        super().__init__(num_agents, N, M, rate_hz)
+        super().__init__(
+            num_agents,
+            N,
+            M,
+            rate_hz,
+            checkpoint_path=checkpoint_path,
+            checkpoint_interval_s=checkpoint_interval_s,
+            speed=speed,
+            agent_timeout_s=agent_timeout_s,
+            board=board,
+        )
         self.fig, self.ax = plt.subplots()
         self.ax.set_xlim(-1, self.M)
         self.ax.set_ylim(-1, self.N)
@@ -223,6 +637,10 @@ class GameNodeWithGUI(GameNode):
         self.ax.set_yticks(np.arange(0, self.N, 1))
         self.ax.grid(True)
 
+        if board is not None and board.has_walls:
+            wall_y, wall_x = np.nonzero(board.walls)
+            self.ax.scatter(wall_x, wall_y, c='black', marker='s', s=100)
+
     def update_plot(self, frame):
         """
         Update the plot with the new agent positions, triggered by Matplotlib animation.
@@ -231,20 +649,10 @@ class GameNodeWithGUI(GameNode):
             plt.close(self.fig)
             return self.scatter_not_it, self.scatter_it
 
-        try:
-            agents = self.agents
-
-            x_data = [agent["x"] for agent in agents.values() if agent["type"] == "not_it"]
-            y_data = [agent["y"] for agent in agents.values() if agent["type"] == "not_it"]
-            self.scatter_not_it.set_offsets(np.c_[x_data, y_data])
-
-            x_data = [agent["x"] for agent in agents.values() if agent["type"] == "it"]
-            y_data = [agent["y"] for agent in agents.values() if agent["type"] == "it"]
-            self.scatter_it.set_offsets(np.c_[x_data, y_data])
-
-        except Exception as e:
-            plt.close(self.fig)
-            return self.scatter_not_it, self.scatter_it
+        snapshot = self.position_snapshot
+        positions, is_it = snapshot["positions"], snapshot["is_it"]
+        self.scatter_not_it.set_offsets(positions[~is_it])
+        self.scatter_it.set_offsets(positions[is_it])
 
         return self.scatter_not_it, self.scatter_it
 
@@ -272,12 +680,14 @@ class GameNodeWithGUI(GameNode):
     
     def run(self, timeout_s: float = 10.0):
         """
-        Run the GUI before the game loop.
+        Run the game loop in a background thread while the GUI blocks the main thread.
 
         Args:
             timeout_s (float): The timeout in seconds for waiting for agents to subscribe.
         """
-       
+        game_loop = threading.Thread(target=super().run, args=(timeout_s,), daemon=True)
+        game_loop.start()
+
         self.start_gui()
-        super().run(timeout_s)
+        game_loop.join()
         plt.close(self.fig)
@@ -0,0 +1,197 @@
+# impairment.py
+"""
+Emulation of an impaired network between nodes on a single machine.
+
+An Impairment sits between a node and LCM and decides, for every message, whether it is dropped and
+when it is delivered: after a delay drawn from a distribution, possibly held back long enough to be
+overtaken by later messages, and no faster than a bandwidth cap allows. All decisions come from a
+seeded generator, so impaired runs are reproducible up to thread scheduling.
+"""
+from typing import Callable, Dict, List, Optional, Tuple, TypedDict
+import heapq
+import random
+import threading
+import time
+
+DELAY_DISTRIBUTIONS = ("constant", "uniform", "normal", "exponential")
+
+
+class ImpairmentProfile(TypedDict):
+    drop_rate: float  # Probability that a message is lost
+    delay_s: float  # Mean delay of a message
+    jitter_s: float  # Half width of the uniform or standard deviation of the normal delay distribution
+    delay_distribution: str  # One of DELAY_DISTRIBUTIONS
+    reorder_rate: float  # Probability that a message is held back by reorder_delay_s
+    reorder_delay_s: float
+    bandwidth_bytes_per_s: Optional[float]  # Unlimited if None
+    max_backlog_s: float  # Messages that would wait longer than this for the capped link are dropped
+
+
+class ImpairmentStats(TypedDict):
+    submitted: int
+    dropped: int
+    overflowed: int
+    reordered: int
+    delivered: int
+
+
+def make_profile(**kwargs) -> ImpairmentProfile:
+    """
+    Create a profile of an unimpaired link with the given impairments.
+
+    Args:
+        **kwargs: The fields of the profile that differ from the unimpaired link.
+
+    Returns:
+        ImpairmentProfile: The profile.
+
+    Raises:
+        ValueError: If a field is unknown or the delay distribution is not supported.
+    """
+    profile: ImpairmentProfile = {
+        "drop_rate": 0.0,
+        "delay_s": 0.0,
+        "jitter_s": 0.0,
+        "delay_distribution": "constant",
+        "reorder_rate": 0.0,
+        "reorder_delay_s": 0.0,
+        "bandwidth_bytes_per_s": None,
+        "max_backlog_s": 1.0,
+    }
+    unknown = set(kwargs) - set(profile)
+    if unknown:
+        raise ValueError(f"Unknown impairment fields: {', '.join(sorted(unknown))}")
+    profile.update(kwargs)
+    if profile["delay_distribution"] not in DELAY_DISTRIBUTIONS:
+        raise ValueError(f"Unknown delay distribution {profile['delay_distribution']}")
+    return profile
+
+
+PROFILES: Dict[str, ImpairmentProfile] = {
+    "clean": make_profile(),
+    "lossy": make_profile(drop_rate=0.05),
+    "jittery": make_profile(
+        delay_s=0.02,
+        jitter_s=0.01,
+        delay_distribution="normal",
+        reorder_rate=0.05,
+        reorder_delay_s=0.05,
+    ),
+    "congested": make_profile(delay_s=0.005, bandwidth_bytes_per_s=5000.0, max_backlog_s=0.5),
+    "wan": make_profile(
+        drop_rate=0.02,
+        delay_s=0.05,
+        jitter_s=0.02,
+        delay_distribution="exponential",
+        reorder_rate=0.01,
+        reorder_delay_s=0.05,
+        bandwidth_bytes_per_s=100000.0,
+    ),
+}
+
+
+class Impairment:
+    """
+    Queue that delivers messages as an impaired link would. Thread-safe.
+    """
+
+    def __init__(self, profile: ImpairmentProfile, seed: Optional[int] = None):
+        """
+        Initialize the link with the given profile.
+
+        Args:
+            profile (ImpairmentProfile): The impairments of the link.
+            seed (Optional[int]): The seed of the random decisions.
+        """
+        self.profile = profile
+        self.rng = random.Random(seed)
+        self.stats: ImpairmentStats = {
+            "submitted": 0,
+            "dropped": 0,
+            "overflowed": 0,
+            "reordered": 0,
+            "delivered": 0,
+        }
+
+        self._lock = threading.Lock()
+        self._queue: List[Tuple[float, int, str, bytes, Callable]] = []
+        self._count = 0
+        self._link_free_time = 0.0
+
+    def sample_delay(self) -> float:
+        """
+        Draw the delay of a message from the delay distribution.
+        """
+        profile = self.profile
+        distribution = profile["delay_distribution"]
+        if distribution == "uniform":
+            delay = self.rng.uniform(profile["delay_s"] - profile["jitter_s"], profile["delay_s"] + profile["jitter_s"])
+        elif distribution == "normal":
+            delay = self.rng.gauss(profile["delay_s"], profile["jitter_s"])
+        elif distribution == "exponential":
+            delay = self.rng.expovariate(1.0 / profile["delay_s"]) if profile["delay_s"] > 0 else 0.0
+        else:
+            delay = profile["delay_s"]
+        return max(0.0, delay)
+
+    def submit(self, channel: str, data: bytes, deliver: Callable[[str, bytes], None]):
+        """
+        Send a message over the link. Messages that are due are delivered right away on the calling
+        thread, the others by a later call to flush.
+
+        Args:
+            channel (str): The channel of the message.
+            data (bytes): The encoded message.
+            deliver (Callable[[str, bytes], None]): The function that delivers the message at the other end.
+        """
+        profile = self.profile
+        with self._lock:
+            self.stats["submitted"] += 1
+            if profile["drop_rate"] and self.rng.random() < profile["drop_rate"]:
+                self.stats["dropped"] += 1
+                return
+
+            now = time.monotonic()
+            send_time = now
+            bandwidth = profile["bandwidth_bytes_per_s"]
+            if bandwidth is not None:
+                # The message waits until the link has sent the previous ones.
+                start_time = max(now, self._link_free_time)
+                if start_time - now > profile["max_backlog_s"]:
+                    self.stats["overflowed"] += 1
+                    return
+                self._link_free_time = start_time + len(data) / bandwidth
+                send_time = self._link_free_time
+
+            due_time = send_time + self.sample_delay()
+            if profile["reorder_rate"] and self.rng.random() < profile["reorder_rate"]:
+                self.stats["reordered"] += 1
+                due_time += profile["reorder_delay_s"]
+
+            heapq.heappush(self._queue, (due_time, self._count, channel, data, deliver))
+            self._count += 1
+
+        self.flush()
+
+    def flush(self):
+        """
+        Deliver all messages that are due.
+        """
+        due = []
+        with self._lock:
+            now = time.monotonic()
+            while self._queue and self._queue[0][0] <= now:
+                due.append(heapq.heappop(self._queue))
+            self.stats["delivered"] += len(due)
+
+        for _, _, channel, data, deliver in due:
+            deliver(channel, data)
+
+    def get_time_to_next_delivery(self) -> Optional[float]:
+        """
+        Get the seconds until the next queued message is due, or None if the queue is empty.
+        """
+        with self._lock:
+            if not self._queue:
+                return None
+            return max(0.0, self._queue[0][0] - time.monotonic())
@@ -0,0 +1,436 @@
+# load_generator.py
+"""
+Synthetic load generator for stress-testing the GameNode.
+
+Every generator process impersonates many agents: it registers them with agent_start and publishes
+their agent_move messages at a configurable aggregate rate, as real agents would. Whenever one of
+its moves must freeze an agent, the generator measures the time until the freeze arrives. Frozen
+agents are respawned at a random cell, so the load stays constant during a run.
+
+Run with ``python -m coding_challenge.load_generator --help``.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+import argparse
+import multiprocessing
+import time
+
+import numpy as np
+
+from coding_challenge.node import Node, NodeStats
+from coding_challenge.game import launch_node
+from coding_challenge.game_node import GameNode
+from coding_challenge.codec import ReusableDecoder
+from coding_challenge.policies import RandomWalkPolicy, make_observations, apply_actions
+from coding_challenge.channels import (
+    DEFAULT_TILE_SIZE,
+    GAME_FREEZE_AGENT_ALL,
+    agent_move_channel,
+)
+import coding_challenge.messages as messages
+
+
+class LoadGeneratorStats(NodeStats):
+    moves_sent: int
+    freeze_latencies_s: List[float]
+    missed_freezes: int
+    unexpected_freezes: int
+
+
+class LoadGenerator(Node):
+    """
+    A node that impersonates many agents from a single process.
+    """
+
+    def __init__(
+        self,
+        generator_id: int,
+        num_it: int,
+        num_not_it: int,
+        N: int,
+        M: int,
+        rate_hz: float,
+        duration_s: float,
+        tick_hz: float = 200.0,
+        freeze_timeout_s: float = 2.0,
+        registration_rate_hz: float = 1000.0,
+        registration_timeout_s: float = 30.0,
+        tile_size: int = DEFAULT_TILE_SIZE,
+        seed: int = 0,
+    ):
+        """
+        Initialize the load generator with the given parameters.
+
+        Args:
+            generator_id (int): The ID of the generator, used to make the agent IDs unique.
+            num_it (int): The number of It agents impersonated by the generator.
+            num_not_it (int): The number of NotIt agents impersonated by the generator.
+            N (int): Number of rows in the grid.
+            M (int): Number of columns in the grid.
+            rate_hz (float): The number of moves per second published by the generator.
+            duration_s (float): The duration in seconds of the load once the game has started.
+            tick_hz (float): The rate in Hz at which batches of moves are published.
+            freeze_timeout_s (float): The time in seconds after which an expected freeze is counted as missed.
+            registration_rate_hz (float): The number of agent_start messages per second sent until the game starts.
+            registration_timeout_s (float): The time in seconds to wait for the game to start.
+            tile_size (int): The side length in cells of the tiles used for area-of-interest move channels.
+            seed (int): The seed of the random walk.
+        """
+        super().__init__()
+        self.N = N
+        self.M = M
+        self.rate_hz = rate_hz
+        self.duration_s = duration_s
+        self.tick_hz = tick_hz
+        self.freeze_timeout_s = freeze_timeout_s
+        self.registration_rate_hz = registration_rate_hz
+        self.registration_timeout_s = registration_timeout_s
+        self.tile_size = tile_size
+
+        num_agents = num_it + num_not_it
+        self.generator_id = generator_id
+        self.agent_ids = [f"load_{generator_id}_{i}" for i in range(num_agents)]
+        self.agent_indices = {agent_id: i for i, agent_id in enumerate(self.agent_ids)}
+        self.is_it = np.arange(num_agents) < num_it
+
+        self.rng = np.random.default_rng(seed)
+        self.policy = RandomWalkPolicy(N, M, seed=seed)
+        self.positions = np.stack(
+            [self.rng.integers(0, M, num_agents), self.rng.integers(0, N, num_agents)],
+            axis=1,
+        )
+        self.seqs = np.zeros(num_agents, dtype=np.int64)
+        self.respawns = np.zeros(num_agents, dtype=np.int64)
+
+        self.stats: LoadGeneratorStats = dict(
+            self.stats,
+            moves_sent=0,
+            freeze_latencies_s=[],
+            missed_freezes=0,
+            unexpected_freezes=0,
+        )
+
+        self._is_game_running = False
+        self._it_cells: Dict[Tuple[int, int], int] = {}
+        self._not_it_cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._pending_freezes: Dict[int, float] = {}
+        self._frozen: List[int] = []
+        self._freeze_decoder = ReusableDecoder(messages.game_freeze_agent_t)
+
+    def game_start_handler(self, _channel, data: bytes):
+        self._is_game_running = True
+
+    def game_freeze_agent_handler(self, _channel, data: bytes):
+        msg = self._freeze_decoder.decode(data)
+        index = self.agent_indices.get(msg.agent_id)
+        if index is None:
+            return
+
+        sent_time = self._pending_freezes.pop(index, None)
+        if sent_time is None:
+            # Caught by an agent of another generator, or the expected freeze already timed out.
+            self.stats["unexpected_freezes"] += 1
+        else:
+            self.stats["freeze_latencies_s"].append(time.time() - sent_time)
+        self._frozen.append(index)
+
+    def on_start(self):
+        self.subscribe("game_start", self.game_start_handler)
+        self.subscribe(GAME_FREEZE_AGENT_ALL, self.game_freeze_agent_handler)
+
+    def send_agent_start(self, index: int):
+        msg = messages.agent_start_t()
+        msg.agent_id = self.agent_ids[index]
+        msg.agent_type = "it" if self.is_it[index] else "not_it"
+        msg.x = int(self.positions[index, 0])
+        msg.y = int(self.positions[index, 1])
+        self.publish("agent_start", msg)
+
+    def send_agent_stop(self, index: int):
+        msg = messages.agent_stop_t()
+        msg.agent_id = self.agent_ids[index]
+        self.publish("agent_stop", msg)
+
+    def get_cell(self, index: int) -> Tuple[int, int]:
+        x, y = self.positions[index].tolist()
+        return x, y
+
+    def occupy(self, index: int, cell: Tuple[int, int], now: Optional[float] = None):
+        """
+        Place an agent on a cell and record the freezes the game node is expected to send. The game
+        node only checks for interceptions on moves, so no freezes are expected if now is None.
+        """
+        if self.is_it[index]:
+            self._it_cells[cell] = self._it_cells.get(cell, 0) + 1
+            if now is not None:
+                for other in self._not_it_cells.get(cell, ()):
+                    self._pending_freezes.setdefault(other, now)
+        else:
+            self._not_it_cells.setdefault(cell, set()).add(index)
+            if now is not None and self._it_cells.get(cell, 0):
+                self._pending_freezes.setdefault(index, now)
+
+    def vacate(self, index: int, cell: Tuple[int, int]):
+        """
+        Remove an agent from a cell.
+        """
+        if self.is_it[index]:
+            self._it_cells[cell] -= 1
+        else:
+            self._not_it_cells[cell].discard(index)
+
+    def respawn_frozen_agents(self):
+        """
+        Re-register the frozen agents at random cells, under new IDs since the game node ignores
+        agents that have left the game.
+        """
+        while self._frozen:
+            index = self._frozen.pop()
+            self._pending_freezes.pop(index, None)
+            self.vacate(index, self.get_cell(index))
+            self.send_agent_stop(index)
+
+            del self.agent_indices[self.agent_ids[index]]
+            self.respawns[index] += 1
+            agent_id = f"load_{self.generator_id}_{index}_{self.respawns[index]}"
+            self.agent_ids[index] = agent_id
+            self.agent_indices[agent_id] = index
+
+            self.positions[index] = self.rng.integers(0, self.M), self.rng.integers(0, self.N)
+            self.seqs[index] = 0
+            self.send_agent_start(index)
+            self.occupy(index, self.get_cell(index))
+
+    def publish_moves(self, indices: np.ndarray, now: float):
+        """
+        Move a batch of agents one random step and publish their moves.
+        """
+        positions = self.positions[indices]
+        actions = self.policy.act(make_observations(positions))
+        new_positions = apply_actions(positions, actions, self.N, self.M)
+
+        frozen = set(self._frozen)
+        msg = messages.agent_move_t()
+        num_sent = 0
+        for index, (x, y) in zip(indices.tolist(), new_positions.tolist()):
+            if index in frozen:
+                continue
+
+            self.vacate(index, self.get_cell(index))
+            self.positions[index] = x, y
+            self.occupy(index, (x, y), now)
+
+            msg.agent_id = self.agent_ids[index]
+            msg.x = x
+            msg.y = y
+            msg.seq = int(self.seqs[index])
+            self.seqs[index] += 1
+            self.publish(agent_move_channel(x, y, self.tile_size), msg)
+            num_sent += 1
+
+        self.stats["moves_sent"] += num_sent
+
+    def expire_pending_freezes(self, now: float):
+        for index, sent_time in list(self._pending_freezes.items()):
+            if now - sent_time > self.freeze_timeout_s:
+                if self._pending_freezes.pop(index, None) is not None:
+                    self.stats["missed_freezes"] += 1
+
+    def run(self):
+        num_agents = len(self.agent_ids)
+
+        # Registration is paced, because bursts of thousands of messages overflow the socket buffers
+        # and the same agents would be dropped on every retry.
+        start_time = time.time()
+        cursor, budget = 0, 0.0
+        while self.running and not self._is_game_running:
+            tick_start_time = time.time()
+            if tick_start_time - start_time > self.registration_timeout_s:
+                print("Timeout waiting for the game to start")
+                return self.stop_node()
+
+            budget += self.registration_rate_hz / self.tick_hz
+            num_starts = min(int(budget), num_agents)
+            budget -= num_starts
+            for i in range(num_starts):
+                self.send_agent_start((cursor + i) % num_agents)
+            cursor = (cursor + num_starts) % num_agents
+
+            self.sleep_until_next_tick(tick_start_time, self.tick_hz)
+
+        for index in range(num_agents):
+            self.occupy(index, self.get_cell(index))
+
+        end_time = time.time() + self.duration_s
+        cursor, budget = 0, 0.0
+        while self.running and time.time() < end_time:
+            tick_start_time = time.time()
+
+            self.respawn_frozen_agents()
+
+            budget += self.rate_hz / self.tick_hz
+            num_moves = int(budget)
+            budget -= num_moves
+            indices = (cursor + np.arange(num_moves)) % num_agents
+            cursor = (cursor + num_moves) % num_agents
+            self.publish_moves(indices, tick_start_time)
+
+            self.expire_pending_freezes(tick_start_time)
+            self.sleep_until_next_tick(tick_start_time, self.tick_hz)
+
+        # Let the last expected freezes arrive before reporting.
+        time.sleep(self.freeze_timeout_s)
+        self.expire_pending_freezes(time.time() + self.freeze_timeout_s)
+
+    def on_stop(self):
+        # Leaving the game with every agent ends it once no NotIt agents are left. Agents whose
+        # agent_stop is dropped are evicted by the game node.
+        for index in range(len(self.agent_ids)):
+            self.send_agent_stop(index)
+
+
+def run_load(
+    num_processes: int,
+    num_it: int,
+    num_not_it: int,
+    N: int,
+    M: int,
+    rate_hz: float,
+    duration_s: float,
+    seed: int = 0,
+) -> dict:
+    """
+    Run a GameNode against generator processes at a fixed aggregate rate.
+
+    Args:
+        num_processes (int): The number of generator processes.
+        num_it (int): The number of It agents per process.
+        num_not_it (int): The number of NotIt agents per process.
+        N (int): Number of rows in the grid.
+        M (int): Number of columns in the grid.
+        rate_hz (float): The aggregate number of moves per second.
+        duration_s (float): The duration in seconds of the load.
+        seed (int): The seed of the random walks.
+
+    Returns:
+        dict: The freeze latency percentiles, the dropped messages and the CPU usage of the game node.
+    """
+    num_agents = num_processes * (num_it + num_not_it)
+    # Every impersonated agent moves only every num_agents / rate_hz seconds.
+    agent_timeout_s = max(5.0, 5.0 * num_agents / rate_hz)
+    game_node = GameNode(num_agents, N, M, agent_timeout_s=agent_timeout_s)
+    generators = [
+        LoadGenerator(
+            i,
+            num_it,
+            num_not_it,
+            N,
+            M,
+            rate_hz / num_processes,
+            duration_s,
+            seed=seed + i,
+        )
+        for i in range(num_processes)
+    ]
+
+    with multiprocessing.Pool(processes=num_processes + 1) as pool:
+        game_result = pool.apply_async(launch_node, (game_node,))
+        time.sleep(0.5)  # Let the game node subscribe before the agents register
+        generator_stats = pool.map(launch_node, generators)
+        # Agents whose agent_stop was dropped are only evicted after the agent timeout.
+        game_stats = game_result.get(timeout=agent_timeout_s + 30.0)
+
+    latencies = np.array(
+        [latency for stats in generator_stats for latency in stats["freeze_latencies_s"]]
+    )
+    moves_sent = sum(stats["moves_sent"] for stats in generator_stats)
+    percentiles = (
+        np.percentile(latencies, [50, 90, 99]) if len(latencies) else [np.nan] * 3
+    )
+    return {
+        "rate_hz": rate_hz,
+        "duration_s": duration_s,
+        "achieved_rate_hz": moves_sent / duration_s,
+        "num_agents": num_agents,
+        "freezes": len(latencies),
+        "p50_ms": percentiles[0] * 1e3,
+        "p90_ms": percentiles[1] * 1e3,
+        "p99_ms": percentiles[2] * 1e3,
+        "missed_freezes": sum(stats["missed_freezes"] for stats in generator_stats),
+        "dropped_moves": game_stats["dropped"],
+        "game_node_cpu": game_stats["cpu_time_s"] / max(game_stats["wall_time_s"], 1e-9),
+        "generator_overruns": sum(stats["overruns"] for stats in generator_stats),
+    }
+
+
+def is_saturated(report: dict, max_p99_ms: float, max_drop_ratio: float) -> bool:
+    """
+    Check whether the game node fell behind the load.
+    """
+    sent = max(1.0, report["achieved_rate_hz"] * report["duration_s"])
+    return (
+        report["p99_ms"] > max_p99_ms
+        or (report["missed_freezes"] + report["dropped_moves"]) / sent > max_drop_ratio
+        or report["game_node_cpu"] > 0.95
+    )
+
+
+def format_report(report: dict) -> str:
+    return (
+        f"{report['rate_hz']:9.0f} moves/s target, {report['achieved_rate_hz']:9.0f} sent, "
+        f"{report['num_agents']} agents, {report['freezes']} freezes, "
+        f"latency p50 {report['p50_ms']:.1f} ms p90 {report['p90_ms']:.1f} ms p99 {report['p99_ms']:.1f} ms, "
+        f"{report['missed_freezes']} missed freezes, {report['dropped_moves']} dropped moves, "
+        f"game node average CPU {report['game_node_cpu'] * 100:.0f}%, {report['generator_overruns']} generator overruns"
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Synthetic load generator for the GameNode")
+    parser.add_argument("--width", type=int, default=100, help="Width of the game board")
+    parser.add_argument("--height", type=int, default=100, help="Height of the game board")
+    parser.add_argument("--processes", type=int, default=4, help="Number of generator processes")
+    parser.add_argument("--num-it", type=int, default=50, help="Number of It agents per process")
+    parser.add_argument("--num-not-it", type=int, default=950, help="Number of NotIt agents per process")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Aggregate moves per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Duration in seconds of each run")
+    parser.add_argument("--ramp", action="store_true", help="Double the rate until the game node saturates")
+    parser.add_argument("--max-rate", type=float, default=64000.0, help="Highest rate tried in ramp mode")
+    parser.add_argument("--max-p99-ms", type=float, default=100.0, help="Freeze latency p99 above which the game node is saturated")
+    parser.add_argument("--max-drop-ratio", type=float, default=0.001, help="Fraction of dropped moves and missed freezes above which the game node is saturated")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random walks")
+    return parser.parse_args()
+
+
+def main(args):
+    rate_hz = args.rate
+    saturation_rate_hz = None
+    while True:
+        report = run_load(
+            args.processes,
+            args.num_it,
+            args.num_not_it,
+            args.height,
+            args.width,
+            rate_hz,
+            args.duration,
+            args.seed,
+        )
+        print(format_report(report))
+
+        if not args.ramp:
+            return
+        if is_saturated(report, args.max_p99_ms, args.max_drop_ratio):
+            saturation_rate_hz = rate_hz
+            break
+        if rate_hz * 2 > args.max_rate:
+            break
+        rate_hz *= 2
+
+    if saturation_rate_hz is None:
+        print(f"The game node was not saturated up to {rate_hz:.0f} moves/s")
+    else:
+        print(f"The game node saturates at {saturation_rate_hz:.0f} moves/s")
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -1,22 +1,143 @@
 # node.py
 from abc import abstractmethod
+from typing import Callable, Optional, TypedDict
 import lcm
+import queue
 import threading
+import time
+
+from coding_challenge.impairment import Impairment, ImpairmentProfile
+
+
+class NodeStats(TypedDict):
+    ticks: int
+    overruns: int
+    max_tick_lag_s: float
+    published: int
+    received: int
+    dropped: int
+    wall_time_s: float
+    cpu_time_s: float
 
 
 class Node:
     def __init__(self):
         self.running = False
+        self.stats: NodeStats = {
+            "ticks": 0,
+            "overruns": 0,
+            "max_tick_lag_s": 0.0,
+            "published": 0,
+            "received": 0,
+            "dropped": 0,
+            "wall_time_s": 0.0,
+            "cpu_time_s": 0.0,
+        }
+        self._last_tick_start_time: Optional[float] = None
+
+        self.impairment_profile: Optional[ImpairmentProfile] = None
+        self.impairment_seed: Optional[int] = None
+        self.impair_publish = False
+        self.impair_receive = False
+        self._outgoing: Optional[Impairment] = None
+        self._incoming: Optional[Impairment] = None
+
+    def set_impairment(
+        self,
+        profile: Optional[ImpairmentProfile],
+        seed: Optional[int] = None,
+        publish: bool = False,
+        receive: bool = True,
+    ):
+        """
+        Emulate an impaired network for the messages of this node. Must be called before the node
+        is launched.
+
+        Args:
+            profile (Optional[ImpairmentProfile]): The impairments of the network. Disables the emulation if None.
+            seed (Optional[int]): The seed of the random decisions of the emulation.
+            publish (bool): Whether the published messages are impaired.
+            receive (bool): Whether the received messages are impaired, independently from other receivers like on a multicast bus.
+        """
+        self.impairment_profile = profile
+        self.impairment_seed = seed
+        self.impair_publish = publish
+        self.impair_receive = receive
 
     def subscribe(self, channel, handler):
-        self.lc.subscribe(channel, handler)
+        incoming = self._incoming
+        if incoming is not None:
+            def impaired_handler(channel, data):
+                incoming.submit(channel, data, handler)
+
+            return self.lc.subscribe(channel, impaired_handler)
+        return self.lc.subscribe(channel, handler)
+
+    def unsubscribe(self, subscription):
+        self.lc.unsubscribe(subscription)
 
     def publish(self, channel, msg):
-        self.lc.publish(channel, msg.encode())
+        if self._outgoing is not None:
+            self._outgoing.submit(channel, msg.encode(), self.lc.publish)
+        else:
+            self.lc.publish(channel, msg.encode())
+        self.stats["published"] += 1
+
+    def sleep_until_next_tick(self, tick_start_time: float, rate_hz: float):
+        """
+        Sleep for the rest of the tick and record whether the tick overran.
+
+        A tick overruns if its work takes longer than the period, or if it starts more than half a
+        period later than scheduled because the previous sleep overslept.
+
+        Args:
+            tick_start_time (float): The time at which the tick started.
+            rate_hz (float): The rate in Hz of the loop.
+        """
+        period = 1.0 / rate_hz
+        elapsed_time = time.time() - tick_start_time
+
+        lag = 0.0
+        if self._last_tick_start_time is not None:
+            lag = max(0.0, tick_start_time - self._last_tick_start_time - period)
+        self._last_tick_start_time = tick_start_time
+
+        self.stats["ticks"] += 1
+        self.stats["max_tick_lag_s"] = max(self.stats["max_tick_lag_s"], lag)
+        if elapsed_time > period or lag > 0.5 * period:
+            self.stats["overruns"] += 1
+
+        time.sleep(max(0, period - elapsed_time))
+
+    def call_in_handler_thread(self, callback: Callable, *args):
+        """
+        Schedule a callback on the LCM handler thread, so that it never runs concurrently with the
+        message handlers. Must be called after the node is launched.
+
+        Args:
+            callback (Callable): The function to call.
+            *args: The arguments passed to the callback.
+        """
+        self._pending_calls.put((callback, args))
+
+    def _get_handle_timeout_ms(self) -> int:
+        # 10ms timeout to check for messages, shorter if an impaired message is due earlier.
+        timeout_ms = 10
+        for impairment in (self._outgoing, self._incoming):
+            if impairment is not None:
+                impairment.flush()
+                time_to_next_delivery = impairment.get_time_to_next_delivery()
+                if time_to_next_delivery is not None:
+                    timeout_ms = min(timeout_ms, int(time_to_next_delivery * 1000))
+        return timeout_ms
 
     def _handle_loop(self):
         while self.running:
-            self.lc.handle_timeout(10)  # 10ms timeout to check for messages
+            self.stats["received"] += self.lc.handle_timeout(self._get_handle_timeout_ms())
+
+            while not self._pending_calls.empty():
+                callback, args = self._pending_calls.get_nowait()
+                callback(*args)
 
     def _stop(self):
         # This function has been made private because it should not be called directly. Use stop_node instead.
@@ -30,11 +151,39 @@ class Node:
 
         self.on_stop()
 
-    def launch_node(self):
+        if self._outgoing is not None:
+            # Deliver the delayed messages, including those published by on_stop.
+            self._drain_outgoing()
+
+    def _drain_outgoing(self, timeout_s: float = 1.0):
+        deadline = time.monotonic() + timeout_s
+        while True:
+            self._outgoing.flush()
+            time_to_next_delivery = self._outgoing.get_time_to_next_delivery()
+            remaining_time = deadline - time.monotonic()
+            if time_to_next_delivery is None or remaining_time <= 0:
+                return
+            time.sleep(min(time_to_next_delivery, remaining_time))
+
+    def launch_node(self) -> NodeStats:
         """
         Launches the node and starts the main loop.
+
+        Returns:
+            NodeStats: The statistics of the node once it has terminated.
         """
+        start_time, start_cpu_time = time.time(), time.process_time()
         self.lc = lcm.LCM()
+        self._pending_calls = queue.SimpleQueue()
+
+        # Impairments hold locks, so they are created in the process running the node.
+        if self.impairment_profile is not None:
+            seed = self.impairment_seed
+            if self.impair_publish:
+                self._outgoing = Impairment(self.impairment_profile, seed)
+            if self.impair_receive:
+                self._incoming = Impairment(self.impairment_profile, None if seed is None else seed + 1)
+
         self.running = True
         self.on_start()
 
@@ -45,6 +194,11 @@ class Node:
         self.run()
         self._stop()
 
+        # CPU time is measured for the whole process, which includes the other nodes sharing it.
+        self.stats["wall_time_s"] = time.time() - start_time
+        self.stats["cpu_time_s"] = time.process_time() - start_cpu_time
+        return self.stats
+
     def stop_node(self):
         """
         Stops the node safely.
@@ -0,0 +1,189 @@
+# policies.py
+from abc import abstractmethod
+from typing import Dict, Optional, Type, TypedDict
+
+import numpy as np
+
+from coding_challenge.board import Board
+
+# All actions an agent can take in one step, including staying in place.
+ACTIONS = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)], dtype=np.int64)
+
+
+class Observations(TypedDict):
+    """
+    Observations of a batch of B agents.
+    """
+
+    positions: np.ndarray  # (B, 2) int, x and y of every agent
+    targets: np.ndarray  # (B, 2) int, x and y of the agent's target, undefined without target
+    has_target: np.ndarray  # (B,) bool, whether the agent has a target
+
+
+def make_observations(positions, targets=None, has_target=None) -> Observations:
+    """
+    Build observations from array-likes, filling in missing targets.
+
+    Args:
+        positions: The (B, 2) positions of the agents.
+        targets: The (B, 2) positions of the targets. Defaults to the positions of the agents.
+        has_target: The (B,) flags telling which agents have a target. Defaults to targets being given.
+
+    Returns:
+        Observations: The observations of the batch.
+    """
+    positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+    if has_target is None:
+        has_target = np.full(len(positions), targets is not None)
+    has_target = np.asarray(has_target, dtype=bool).reshape(-1)
+    if targets is None:
+        targets = positions
+    targets = np.asarray(targets, dtype=np.int64).reshape(-1, 2)
+    return {"positions": positions, "targets": targets, "has_target": has_target}
+
+
+def apply_actions(
+    positions: np.ndarray, actions: np.ndarray, N: int, M: int, board: Optional[Board] = None
+) -> np.ndarray:
+    """
+    Apply a batch of actions. Agents whose action would leave the grid or enter a wall stay in place.
+
+    Args:
+        positions (np.ndarray): The (B, 2) positions of the agents.
+        actions (np.ndarray): The (B, 2) actions in {-1, 0, 1}.
+        N (int): Number of rows in the grid.
+        M (int): Number of columns in the grid.
+        board (Optional[Board]): The board with the walls. Defaults to no walls.
+
+    Returns:
+        np.ndarray: The (B, 2) new positions.
+    """
+    new_positions = positions + actions
+    valid = (
+        (new_positions[:, 0] >= 0)
+        & (new_positions[:, 0] < M)
+        & (new_positions[:, 1] >= 0)
+        & (new_positions[:, 1] < N)
+    )
+    if board is not None and board.has_walls:
+        x = np.where(valid, new_positions[:, 0], 0)
+        y = np.where(valid, new_positions[:, 1], 0)
+        valid &= ~board.walls[y, x]
+    return np.where(valid[:, None], new_positions, positions)
+
+
+class Policy:
+    """
+    Base class for policies that decide the actions of a batch of agents in one call.
+    """
+
+    def __init__(self, N: int, M: int, board: Optional[Board] = None, seed: Optional[int] = None):
+        """
+        Initialize the policy for the given grid.
+
+        Args:
+            N (int): Number of rows in the grid.
+            M (int): Number of columns in the grid.
+            board (Optional[Board]): The board with the walls. Defaults to no walls.
+            seed (Optional[int]): The seed of the random generator of stochastic policies.
+        """
+        self.N = N
+        self.M = M
+        self.board = board
+        self.rng = np.random.default_rng(seed)
+
+    @abstractmethod
+    def act(self, observations: Observations) -> np.ndarray:
+        """
+        Decide the actions of a batch of agents.
+
+        Args:
+            observations (Observations): The observations of the B agents.
+
+        Returns:
+            np.ndarray: The (B, 2) actions in {-1, 0, 1}.
+        """
+        pass
+
+
+class RandomWalkPolicy(Policy):
+    """
+    Policy that moves every agent to a uniformly random adjacent free cell inside the grid, or keeps
+    it in place, as NotItAgent always did.
+    """
+
+    def act(self, observations: Observations) -> np.ndarray:
+        positions = observations["positions"]
+        candidates = positions[:, None, :] + ACTIONS[None, :, :]
+        valid = (
+            (candidates[..., 0] >= 0)
+            & (candidates[..., 0] < self.M)
+            & (candidates[..., 1] >= 0)
+            & (candidates[..., 1] < self.N)
+        )
+        if self.board is not None and self.board.has_walls:
+            x = np.where(valid, candidates[..., 0], 0)
+            y = np.where(valid, candidates[..., 1], 0)
+            valid &= ~self.board.walls[y, x]
+
+        # The valid action with the highest random key is a uniform choice among the valid actions.
+        keys = self.rng.random(valid.shape)
+        keys[~valid] = -1.0
+        return ACTIONS[np.argmax(keys, axis=1)]
+
+
+class GreedyChasePolicy(Policy):
+    """
+    Policy that moves every agent one step towards its target, as ItAgent always did. On boards
+    with walls, the step follows a shortest path around the walls using the cached distance maps
+    of the board. Agents without a target stay in place.
+    """
+
+    def act(self, observations: Observations) -> np.ndarray:
+        positions = observations["positions"]
+        targets = observations["targets"]
+        has_target = observations["has_target"]
+
+        if self.board is None or not self.board.has_walls:
+            # Without walls, the straight step is a shortest path.
+            actions = np.clip(targets - positions, -1, 1)
+            return actions * has_target[:, None]
+
+        actions = np.zeros_like(positions)
+        chasing = np.flatnonzero(has_target)
+        if not chasing.size:
+            return actions
+
+        # Agents chasing the same target share one distance map.
+        unique_targets, groups = np.unique(targets[chasing], axis=0, return_inverse=True)
+        for group, (target_x, target_y) in enumerate(unique_targets.tolist()):
+            agents = chasing[groups.ravel() == group]
+            actions[agents] = self.board.step_towards(positions[agents], (target_x, target_y))
+        return actions
+
+
+POLICIES: Dict[str, Type[Policy]] = {
+    "random_walk": RandomWalkPolicy,
+    "greedy_chase": GreedyChasePolicy,
+}
+
+
+def make_policy(name: str, N: int, M: int, **kwargs) -> Policy:
+    """
+    Create a registered policy by name.
+
+    Args:
+        name (str): The name of the policy in POLICIES.
+        N (int): Number of rows in the grid.
+        M (int): Number of columns in the grid.
+        **kwargs: Additional arguments passed to the policy, e.g. the board or the seed.
+
+    Returns:
+        Policy: The policy.
+
+    Raises:
+        ValueError: If no policy is registered under the name.
+    """
+    if name not in POLICIES:
+        raise ValueError(f"Unknown policy {name}. Available policies: {', '.join(POLICIES)}")
+    return POLICIES[name](N, M, **kwargs)
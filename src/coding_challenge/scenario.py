@@ -0,0 +1,300 @@
+# scenario.py
+from typing import Optional, TypedDict
+import json
+import os
+
+import numpy as np
+
+from coding_challenge.board import Board
+
+PLACEMENTS = ("uniform", "clustered")
+
+
+class Scenario(TypedDict):
+    N: int
+    M: int
+    it_positions: np.ndarray  # (K, 2) int, x and y of every It agent
+    not_it_positions: np.ndarray  # (L, 2) int, x and y of every NotIt agent
+    it_rate_hz: float
+    not_it_rate_hz: float
+    map: Optional[str]  # Map file of the board, relative paths are relative to the scenario file
+
+
+def make_scenario(
+    N: int,
+    M: int,
+    it_positions,
+    not_it_positions,
+    it_rate_hz: float = 2.0,
+    not_it_rate_hz: float = 1.0,
+    map: Optional[str] = None,
+) -> Scenario:
+    """
+    Build a scenario from array-likes of positions.
+
+    Args:
+        N (int): Number of rows in the grid.
+        M (int): Number of columns in the grid.
+        it_positions: The (K, 2) positions of the It agents.
+        not_it_positions: The (L, 2) positions of the NotIt agents.
+        it_rate_hz (float): The rate in Hz of the It agents.
+        not_it_rate_hz (float): The rate in Hz of the NotIt agents.
+        map (Optional[str]): The map file of the board.
+
+    Returns:
+        Scenario: The scenario.
+    """
+    return {
+        "N": int(N),
+        "M": int(M),
+        "it_positions": np.asarray(it_positions, dtype=np.int64).reshape(-1, 2),
+        "not_it_positions": np.asarray(not_it_positions, dtype=np.int64).reshape(-1, 2),
+        "it_rate_hz": float(it_rate_hz),
+        "not_it_rate_hz": float(not_it_rate_hz),
+        "map": map,
+    }
+
+
+def validate_positions(positions: np.ndarray, N: int, M: int, board: Optional[Board] = None):
+    """
+    Check that all positions are on free cells of the grid, in one vectorized pass.
+
+    Args:
+        positions (np.ndarray): The (B, 2) positions of the agents.
+        N (int): Number of rows in the grid.
+        M (int): Number of columns in the grid.
+        board (Optional[Board]): The board with the walls agents cannot start in.
+
+    Raises:
+        ValueError: If the positions are not (B, 2) or any agent is out of bounds or inside a wall.
+    """
+    if positions.ndim != 2 or positions.shape[1] != 2:
+        raise ValueError("Positions must be pairs of x and y coordinates")
+
+    x, y = positions[:, 0], positions[:, 1]
+    outside = (x < 0) | (x >= M) | (y < 0) | (y >= N)
+    if outside.any():
+        index = int(np.argmax(outside))
+        raise ValueError(
+            f"{int(outside.sum())} agents are located out of bounds, e.g. agent {index} at {tuple(positions[index].tolist())}"
+        )
+
+    if board is not None and board.has_walls:
+        inside_wall = board.walls[y, x]
+        if inside_wall.any():
+            index = int(np.argmax(inside_wall))
+            raise ValueError(
+                f"{int(inside_wall.sum())} agents are located inside a wall, e.g. agent {index} at {tuple(positions[index].tolist())}"
+            )
+
+
+def validate_scenario(scenario: Scenario, board: Optional[Board] = None):
+    """
+    Check that a scenario is consistent with its board.
+
+    Args:
+        scenario (Scenario): The scenario to check.
+        board (Optional[Board]): The board loaded from the map of the scenario.
+
+    Raises:
+        ValueError: If the scenario is invalid.
+    """
+    if scenario["N"] <= 0 or scenario["M"] <= 0:
+        raise ValueError("The grid must have at least one row and one column")
+    if board is not None and (board.N, board.M) != (scenario["N"], scenario["M"]):
+        raise ValueError(
+            f"The map is {board.M}x{board.N} but the scenario is {scenario['M']}x{scenario['N']}"
+        )
+    if len(scenario["it_positions"]) == 0 or len(scenario["not_it_positions"]) == 0:
+        raise ValueError("A scenario needs at least one It and one NotIt agent")
+    if scenario["it_rate_hz"] <= 0 or scenario["not_it_rate_hz"] <= 0:
+        raise ValueError("Rates must be positive")
+
+    validate_positions(scenario["it_positions"], scenario["N"], scenario["M"], board)
+    validate_positions(scenario["not_it_positions"], scenario["N"], scenario["M"], board)
+
+
+def _load_positions(value, directory: str) -> np.ndarray:
+    if isinstance(value, str):
+        # Large scenarios keep their positions in NPY files next to the JSON file.
+        return np.load(os.path.join(directory, value))
+    return np.asarray(value, dtype=np.int64).reshape(-1, 2)
+
+
+def load_scenario(path: str) -> Scenario:
+    """
+    Load a scenario from a JSON or NPZ file.
+
+    In JSON files, the positions are either lists of [x, y] pairs or the names of NPY files with
+    (B, 2) arrays, relative to the JSON file. NPZ files hold all fields as arrays.
+
+    Args:
+        path (str): The path of the scenario file.
+
+    Returns:
+        Scenario: The loaded scenario. A relative map path is resolved against the scenario file.
+
+    Raises:
+        ValueError: If the file type is not supported.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+
+    if path.endswith(".json"):
+        with open(path) as f:
+            data = json.load(f)
+        data["it_positions"] = _load_positions(data["it_positions"], directory)
+        data["not_it_positions"] = _load_positions(data["not_it_positions"], directory)
+    elif path.endswith(".npz"):
+        with np.load(path) as archive:
+            data = {key: archive[key] for key in archive.files}
+        data = {key: value if value.ndim else value.item() for key, value in data.items()}
+    else:
+        raise ValueError(f"Unsupported scenario file {path}, expected .json or .npz")
+
+    scenario = make_scenario(
+        data["N"],
+        data["M"],
+        data["it_positions"],
+        data["not_it_positions"],
+        data.get("it_rate_hz", 2.0),
+        data.get("not_it_rate_hz", 1.0),
+        data.get("map") or None,
+    )
+    if scenario["map"] is not None:
+        scenario["map"] = os.path.normpath(os.path.join(directory, scenario["map"]))
+    return scenario
+
+
+def save_scenario(path: str, scenario: Scenario):
+    """
+    Save a scenario to a JSON or NPZ file.
+
+    Args:
+        path (str): The path of the scenario file.
+        scenario (Scenario): The scenario to save.
+
+    Raises:
+        ValueError: If the file type is not supported.
+    """
+    if path.endswith(".json"):
+        data = dict(
+            scenario,
+            it_positions=scenario["it_positions"].tolist(),
+            not_it_positions=scenario["not_it_positions"].tolist(),
+        )
+        with open(path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+    elif path.endswith(".npz"):
+        np.savez(path, **dict(scenario, map=scenario["map"] or ""))
+    else:
+        raise ValueError(f"Unsupported scenario file {path}, expected .json or .npz")
+
+
+def _free_cells(N: int, M: int, board: Optional[Board]) -> np.ndarray:
+    if board is not None:
+        return board.free_cells()
+    y, x = np.divmod(np.arange(N * M), M)
+    return np.stack([x, y], axis=1)
+
+
+def generate_uniform_positions(
+    num_agents: int, N: int, M: int, rng: np.random.Generator, board: Optional[Board] = None
+) -> np.ndarray:
+    """
+    Place agents uniformly at random on the free cells of the grid.
+
+    Args:
+        num_agents (int): The number of agents to place.
+        N (int): Number of rows in the grid.
+        M (int): Number of columns in the grid.
+        rng (np.random.Generator): The random generator.
+        board (Optional[Board]): The board with the walls agents cannot start in.
+
+    Returns:
+        np.ndarray: The (num_agents, 2) positions.
+    """
+    cells = _free_cells(N, M, board)
+    return cells[rng.integers(0, len(cells), num_agents)]
+
+
+def generate_clustered_positions(
+    num_agents: int,
+    N: int,
+    M: int,
+    rng: np.random.Generator,
+    board: Optional[Board] = None,
+    num_clusters: int = 4,
+    spread: float = 2.0,
+) -> np.ndarray:
+    """
+    Place agents in clusters around random centers on the free cells of the grid.
+
+    Args:
+        num_agents (int): The number of agents to place.
+        N (int): Number of rows in the grid.
+        M (int): Number of columns in the grid.
+        rng (np.random.Generator): The random generator.
+        board (Optional[Board]): The board with the walls agents cannot start in.
+        num_clusters (int): The number of clusters.
+        spread (float): The standard deviation in cells of the distance of the agents to their cluster center.
+
+    Returns:
+        np.ndarray: The (num_agents, 2) positions.
+    """
+    centers = generate_uniform_positions(num_clusters, N, M, rng, board)
+    positions = np.empty((num_agents, 2), dtype=np.int64)
+    pending = np.arange(num_agents)
+
+    # Redraw the agents that landed outside the grid or inside a wall. The centers are free cells,
+    # so the remaining agents become fewer with every round.
+    while pending.size:
+        offsets = np.rint(rng.normal(0.0, spread, (pending.size, 2))).astype(np.int64)
+        candidates = centers[rng.integers(0, num_clusters, pending.size)] + offsets
+        x, y = candidates[:, 0], candidates[:, 1]
+        valid = (x >= 0) & (x < M) & (y >= 0) & (y < N)
+        if board is not None and board.has_walls:
+            valid[valid] = ~board.walls[y[valid], x[valid]]
+        positions[pending[valid]] = candidates[valid]
+        pending = pending[~valid]
+
+    return positions
+
+
+def generate_scenario(
+    N: int,
+    M: int,
+    num_it: int,
+    num_not_it: int,
+    placement: str = "uniform",
+    seed: Optional[int] = None,
+    board: Optional[Board] = None,
+    **kwargs,
+) -> Scenario:
+    """
+    Generate a scenario with seeded random placements.
+
+    Args:
+        N (int): Number of rows in the grid.
+        M (int): Number of columns in the grid.
+        num_it (int): Number of It agents.
+        num_not_it (int): Number of NotIt agents.
+        placement (str): The placement of the agents, one of PLACEMENTS.
+        seed (Optional[int]): The seed of the random generator.
+        board (Optional[Board]): The board with the walls agents cannot start in.
+        **kwargs: Additional arguments passed to the placement generator, e.g. num_clusters.
+
+    Returns:
+        Scenario: The generated scenario.
+
+    Raises:
+        ValueError: If the placement is unknown.
+    """
+    rng = np.random.default_rng(seed)
+    if placement == "uniform":
+        positions = generate_uniform_positions(num_it + num_not_it, N, M, rng, board, **kwargs)
+    elif placement == "clustered":
+        positions = generate_clustered_positions(num_it + num_not_it, N, M, rng, board, **kwargs)
+    else:
+        raise ValueError(f"Unknown placement {placement}. Available placements: {', '.join(PLACEMENTS)}")
+
+    return make_scenario(N, M, positions[:num_it], positions[num_it:])
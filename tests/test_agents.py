@@ -2,8 +2,10 @@ import threading
 import lcm
 import time
 from coding_challenge.agents import NotItAgent, ItAgent
+from coding_challenge.board import Board
 import unittest
 import coding_challenge.messages as messages
+from coding_challenge.channels import agent_move_channel, game_freeze_agent_channel
 import random
 
 random.seed(0) # set seed for reproducibility
@@ -44,10 +46,26 @@ class TestNotItAgent(unittest.TestCase):
 
         msg = messages.game_freeze_agent_t()
         msg.agent_id = self.agent.agent_id
-        self.lc.publish("game_freeze_agent", msg.encode())
+        self.lc.publish(game_freeze_agent_channel(self.agent.agent_id), msg.encode())
         time.sleep(time_sleep_s)
         self.assertFalse(self.agent.running)
     
+    def test_speed_scales_rate(self):
+        self.assertEqual(NotItAgent(0, 0, self.N, self.M, speed=4.0).rate_hz, 4.0)
+        self.assertEqual(ItAgent(0, 0, self.N, self.M, speed=4.0).rate_hz, 8.0)
+
+    def test_game_node_timeout(self):
+        self.test_game_start()
+        self.agent.game_node_timeout_s = 5 * time_sleep_s
+
+        msg = messages.game_heartbeat_t()
+        self.lc.publish("game_heartbeat", msg.encode())
+        time.sleep(time_sleep_s)
+        self.assertTrue(self.agent.is_game_node_alive())
+
+        time.sleep(1.0 / self.agent.rate_hz + 5 * time_sleep_s)
+        self.assertFalse(self.agent.running)
+
     def test_get_random_adjacent_cell(self):
         for _ in range(10):
             cell = self.agent.get_random_adjacent_cell(self.N, self.M)
@@ -56,6 +74,12 @@ class TestNotItAgent(unittest.TestCase):
             self.assertGreaterEqual(cell[1], 0)
             self.assertLess(cell[1], self.M)
 
+    def test_get_random_adjacent_cell_avoids_walls(self):
+        board = Board.from_lines(["..#", "#.#", "###"])
+        agent = NotItAgent(0, 0, 3, 3, board=board)
+        for _ in range(10):
+            self.assertIn(agent.get_random_adjacent_cell(0, 0), [(0, 0), (1, 0), (1, 1)])
+
 class TestItAgent(unittest.TestCase):
     def setUp(self):
         self.N = 10
@@ -92,13 +116,58 @@ class TestItAgent(unittest.TestCase):
         msg.agent_id = "some_id"
         msg.x = 5
         msg.y = 5
-        self.lc.publish("agent_move", msg.encode())
+        self.lc.publish(agent_move_channel(msg.x, msg.y), msg.encode())
         time.sleep(time_sleep_s)
         target = self.agent.target
         self.assertIsNotNone(target)
         self.assertEqual(target[0], 5)
         self.assertEqual(target[1], 5)
 
+    def test_agent_move_outside_area_of_interest(self):
+        msg = messages.agent_move_t()
+        msg.agent_id = "some_id"
+        msg.x = 9
+        msg.y = 9
+        self.lc.publish(agent_move_channel(msg.x, msg.y), msg.encode())
+        time.sleep(time_sleep_s)
+        self.assertIsNone(self.agent.target)
+
+    def test_area_of_interest_grows_without_target(self):
+        initial_radius = self.agent.aoi_radius
+        self.agent.update_subscriptions()
+        self.assertEqual(self.agent.aoi_radius, initial_radius + 1)
+
+        msg = messages.agent_move_t()
+        msg.agent_id = "some_id"
+        msg.x = 9
+        msg.y = 9
+        self.lc.publish(agent_move_channel(msg.x, msg.y), msg.encode())
+        time.sleep(time_sleep_s)
+        self.assertEqual(self.agent.target, (9, 9))
+
+    def test_target_freeze_resets_target(self):
+        self.test_agent_move_handler()
+        self.agent.update_subscriptions()
+
+        msg = messages.game_freeze_agent_t()
+        msg.agent_id = "some_id"
+        self.lc.publish(game_freeze_agent_channel(msg.agent_id), msg.encode())
+        time.sleep(time_sleep_s)
+        self.assertIsNone(self.agent.target)
+
+    def test_step_updates_subscriptions_in_handler_thread(self):
+        threads = []
+        update_subscriptions = self.agent.update_subscriptions
+
+        def record_thread():
+            threads.append(threading.current_thread())
+            update_subscriptions()
+
+        self.agent.update_subscriptions = record_thread
+        self.agent.step()
+        time.sleep(time_sleep_s)
+        self.assertEqual(threads, [self.agent.thread])
+
     def test_get_action(self):
         self.agent.target = (5, 5)
         self.agent.current_position_x = self.N
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+import lcm
+import numpy as np
+from coding_challenge.analytics import GameAnalytics, AGENT_TYPES, replay_log
+from coding_challenge.channels import agent_move_channel, game_freeze_agent_channel
+import coding_challenge.messages as messages
+
+
+def encode_start(agent_id: str, agent_type: str, x: int, y: int) -> bytes:
+    msg = messages.agent_start_t()
+    msg.agent_id = agent_id
+    msg.agent_type = agent_type
+    msg.x = x
+    msg.y = y
+    return msg.encode()
+
+
+def encode_move(agent_id: str, x: int, y: int, seq: int = 0) -> bytes:
+    msg = messages.agent_move_t()
+    msg.agent_id = agent_id
+    msg.x = x
+    msg.y = y
+    msg.seq = seq
+    return msg.encode()
+
+
+def encode_freeze(agent_id: str) -> bytes:
+    msg = messages.game_freeze_agent_t()
+    msg.agent_id = agent_id
+    return msg.encode()
+
+
+EVENTS = [
+    ("agent_start", encode_start("a", "not_it", 0, 0), 0.0),
+    ("agent_start", encode_start("b", "it", 4, 4), 0.5),
+    ("game_start", messages.game_start_t().encode(), 1.0),
+    (agent_move_channel(1, 1), encode_move("a", 1, 1, 0), 1.5),
+    (agent_move_channel(3, 3), encode_move("b", 3, 3, 0), 1.6),
+    (agent_move_channel(2, 2), encode_move("b", 2, 2, 1), 2.0),
+    (agent_move_channel(2, 2), encode_move("a", 2, 2, 1), 2.5),
+    (game_freeze_agent_channel("a"), encode_freeze("a"), 2.6),
+    (game_freeze_agent_channel("a"), encode_freeze("a"), 2.7),
+    ("game_stop", messages.game_stop_t().encode(), 3.0),
+]
+
+
+class TestGameAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.analytics = GameAnalytics(5, 5, max_time_to_freeze_s=10.0, num_bins=10, initial_agent_capacity=1)
+        for channel, data, timestamp_s in EVENTS:
+            self.analytics.handle(channel, data, timestamp_s)
+
+    def test_occupancy(self):
+        not_it = AGENT_TYPES.index("not_it")
+        it = AGENT_TYPES.index("it")
+        self.assertEqual(self.analytics.occupancy.sum(), 4)
+        self.assertEqual(self.analytics.occupancy[not_it, 2, 2], 1)
+        self.assertEqual(self.analytics.occupancy[it, 3, 3], 1)
+
+    def test_distances(self):
+        self.assertEqual(self.analytics.get_distances(), {"a": 2, "b": 2})
+
+    def test_time_to_freeze_is_counted_once(self):
+        summary = self.analytics.summary()
+        self.assertEqual(summary["freezes"], 1)
+        self.assertAlmostEqual(summary["mean_time_to_freeze_s"], 1.6)
+        self.assertEqual(self.analytics.freeze_histogram[1], 1)
+        self.assertEqual(summary["p50_time_to_freeze_s"], 2.0)
+
+    def test_unknown_agents_and_overflow(self):
+        self.analytics.handle(agent_move_channel(0, 4), encode_move("c", 0, 4), 3.0)
+        self.analytics.handle(game_freeze_agent_channel("c"), encode_freeze("c"), 20.0)
+        self.assertEqual(self.analytics.occupancy[AGENT_TYPES.index("unknown"), 4, 0], 1)
+        self.assertEqual(self.analytics.freeze_overflow, 1)
+        self.assertEqual(self.analytics.get_time_to_freeze_percentile(90), float("inf"))
+
+    def test_respawned_agent_is_tracked_again(self):
+        self.analytics.handle("agent_start", encode_start("a", "not_it", 0, 0), 5.0)
+        self.analytics.handle(agent_move_channel(0, 1), encode_move("a", 0, 1, 2), 5.5)
+        self.analytics.handle(game_freeze_agent_channel("a"), encode_freeze("a"), 6.0)
+        self.assertEqual(self.analytics.num_freezes, 2)
+        self.assertEqual(self.analytics.get_distances()["a"], 3)
+
+    def test_export(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "analytics.npz")
+            self.analytics.export(path)
+            with np.load(path) as exported:
+                np.testing.assert_array_equal(exported["occupancy"], self.analytics.occupancy)
+                self.assertEqual(exported["agent_ids"].tolist(), ["a", "b"])
+                self.assertEqual(exported["distances"].tolist(), [2, 2])
+
+    def test_replay_log(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "game.lcmlog")
+            log = lcm.EventLog(path, "w", overwrite=True)
+            for channel, data, timestamp_s in EVENTS:
+                log.write_event(int(timestamp_s * 1e6), channel, data)
+            log.close()
+
+            replayed = replay_log(path, GameAnalytics(5, 5, max_time_to_freeze_s=10.0, num_bins=10))
+
+        np.testing.assert_array_equal(replayed.occupancy, self.analytics.occupancy)
+        self.assertEqual(replayed.summary(), self.analytics.summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from coding_challenge.board import Board, load_board
+
+MAP = [
+    "....",
+    ".##.",
+    "....",
+]
+
+
+class TestBoard(unittest.TestCase):
+    def setUp(self):
+        self.board = Board.from_lines(MAP)
+
+    def test_walls(self):
+        self.assertEqual((self.board.N, self.board.M), (3, 4))
+        self.assertTrue(self.board.is_wall(1, 1))
+        self.assertTrue(self.board.is_wall(2, 1))
+        self.assertFalse(self.board.is_wall(0, 1))
+        self.assertFalse(self.board.is_free(4, 0))
+        self.assertEqual(len(self.board.free_cells()), 10)
+
+    def test_wall_bitset_matches_walls(self):
+        walls = np.random.default_rng(0).random((7, 13)) < 0.3
+        board = Board(walls)
+        for y in range(7):
+            for x in range(13):
+                self.assertEqual(board.is_wall(x, y), walls[y, x])
+
+    def test_distance_map_goes_around_walls(self):
+        expected = np.array([[0, 1, 2, 3], [1, -1, -1, 3], [2, 2, 3, 4]])
+        np.testing.assert_array_equal(self.board.distance_map(0, 0), expected)
+        self.assertEqual(self.board.distance(3, 2, 0, 0), 4)
+
+    def test_unreachable_cells(self):
+        board = Board.from_lines([".#.", "##.", "..."])
+        self.assertIsNone(board.distance(0, 0, 2, 2))
+        np.testing.assert_array_equal(board.step_towards(np.array([[0, 0]]), (2, 2)), [[0, 0]])
+
+    def test_step_towards_follows_shortest_path(self):
+        positions = np.array([[3, 2], [0, 0], [0, 2]])
+        actions = self.board.step_towards(positions, (0, 0))
+        np.testing.assert_array_equal(actions, [[0, -1], [0, 0], [0, -1]])
+
+    def test_distance_maps_are_lru_cached(self):
+        board = Board.from_lines(MAP, max_cached_distance_maps=2)
+        first = board.distance_map(0, 0)
+        board.distance_map(3, 0)
+        self.assertIs(board.distance_map(0, 0).base, first.base)
+        board.distance_map(3, 2)
+        self.assertEqual(list(board._distance_maps), [(0, 0), (3, 2)])
+
+    def test_distance_map_cache_is_bounded_by_bytes(self):
+        board = Board.empty(500, 500, max_cached_distance_bytes=3 * 2**20)
+        self.assertEqual(board.max_cached_distance_maps, 3)
+        for x in range(5):
+            board.distance_map(x, 0)
+        self.assertEqual(list(board._distance_maps), [(2, 0), (3, 0), (4, 0)])
+        cached_bytes = sum(distance_map.nbytes for distance_map in board._distance_maps.values())
+        self.assertLessEqual(cached_bytes, 3 * 2**20)
+
+        # Small boards keep many more maps within the same budget.
+        self.assertGreater(Board.empty(10, 10).max_cached_distance_maps, 1000)
+
+    def test_invalid_maps(self):
+        with self.assertRaises(ValueError):
+            Board.from_lines(["...", ".."])
+        with self.assertRaises(ValueError):
+            Board.from_lines(["..x"])
+        with self.assertRaises(ValueError):
+            Board.from_lines([])
+
+    def test_load_board(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "map.txt")
+            with open(path, "w") as f:
+                f.write("\n".join(MAP) + "\n")
+            board = load_board(path)
+        np.testing.assert_array_equal(board.walls, self.board.walls)
+
+
+if __name__ == "__main__":
+    unittest.main()
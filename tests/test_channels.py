@@ -0,0 +1,40 @@
+import unittest
+from coding_challenge.channels import (
+    get_tile,
+    get_num_tiles,
+    agent_move_channel,
+    agent_move_channels_around,
+    game_freeze_agent_channel,
+)
+
+
+class TestChannels(unittest.TestCase):
+    def test_get_tile(self):
+        self.assertEqual(get_tile(0, 0, 4), (0, 0))
+        self.assertEqual(get_tile(3, 4, 4), (0, 1))
+        self.assertEqual(get_tile(9, 7, 4), (2, 1))
+
+    def test_get_num_tiles(self):
+        self.assertEqual(get_num_tiles(5, 10, 4), (3, 2))
+        self.assertEqual(get_num_tiles(8, 8, 4), (2, 2))
+
+    def test_agent_move_channel(self):
+        self.assertEqual(agent_move_channel(5, 2, 4), "agent_move/1/0")
+
+    def test_agent_move_channels_around_clipped_to_grid(self):
+        channels = agent_move_channels_around(0, 0, 1, 10, 10, 4)
+        self.assertEqual(
+            sorted(channels),
+            ["agent_move/0/0", "agent_move/0/1", "agent_move/1/0", "agent_move/1/1"],
+        )
+
+    def test_agent_move_channels_around_cover_grid(self):
+        channels = agent_move_channels_around(5, 5, 3, 10, 10, 4)
+        self.assertEqual(len(channels), 9)
+
+    def test_game_freeze_agent_channel(self):
+        self.assertEqual(game_freeze_agent_channel("some_id"), "game_freeze_agent/some_id")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import random
+import tempfile
+import unittest
+from coding_challenge.checkpoint import save_checkpoint, load_checkpoint, remove_checkpoint
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "game.json")
+        self.snapshot = {
+            "version": 1,
+            "num_agents": 2,
+            "N": 5,
+            "M": 5,
+            "agents": {"a": {"type": "it", "x": 1, "y": 2}, "b": {"type": "not_it", "x": 3, "y": 4}},
+            "num_it_agents": 1,
+            "num_not_it_agents": 1,
+            "has_game_started": True,
+            "rng_state": random.getstate(),
+            "saved_at": 0.0,
+        }
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        save_checkpoint(self.path, self.snapshot)
+        self.assertEqual(load_checkpoint(self.path), self.snapshot)
+
+    def test_overwrite_leaves_no_temporary_files(self):
+        save_checkpoint(self.path, self.snapshot)
+        save_checkpoint(self.path, dict(self.snapshot, num_agents=3))
+        self.assertEqual(os.listdir(self.directory.name), ["game.json"])
+        self.assertEqual(load_checkpoint(self.path)["num_agents"], 3)
+
+    def test_unsupported_version(self):
+        save_checkpoint(self.path, dict(self.snapshot, version=0))
+        with self.assertRaises(ValueError):
+            load_checkpoint(self.path)
+
+    def test_remove_checkpoint(self):
+        save_checkpoint(self.path, self.snapshot)
+        remove_checkpoint(self.path)
+        remove_checkpoint(self.path)
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import pickle
+import unittest
+from coding_challenge.codec import ReusableDecoder
+import coding_challenge.messages as messages
+
+
+class TestReusableDecoder(unittest.TestCase):
+    def setUp(self):
+        self.decoder = ReusableDecoder(messages.agent_start_t)
+
+    def encode_agent_start(self, agent_id: str, x: int, y: int) -> bytes:
+        msg = messages.agent_start_t()
+        msg.agent_id = agent_id
+        msg.agent_type = "not_it"
+        msg.x = x
+        msg.y = y
+        return msg.encode()
+
+    def test_decode_matches_generated_decode(self):
+        data = self.encode_agent_start("some_id", 3, -4)
+        expected = messages.agent_start_t.decode(data)
+        msg = self.decoder.decode(data)
+        for attribute in messages.agent_start_t.__slots__:
+            self.assertEqual(getattr(msg, attribute), getattr(expected, attribute))
+
+    def test_decode_reuses_instance_and_strings(self):
+        first = self.decoder.decode(self.encode_agent_start("some_id", 1, 2))
+        agent_id = first.agent_id
+        second = self.decoder.decode(bytearray(self.encode_agent_start("some_id", 5, 6)))
+        self.assertIs(first, second)
+        self.assertIs(second.agent_id, agent_id)
+        self.assertEqual((second.x, second.y), (5, 6))
+
+    def test_decode_rejects_wrong_fingerprint(self):
+        msg = messages.agent_stop_t()
+        msg.agent_id = "some_id"
+        with self.assertRaises(ValueError):
+            self.decoder.decode(msg.encode())
+
+    def test_decode_rejects_string_past_buffer(self):
+        data = bytearray(self.encode_agent_start("some_id", 1, 2))
+        # Declare the agent_id longer than the rest of the message.
+        data[8:12] = (len(data)).to_bytes(4, "big")
+        with self.assertRaises(ValueError):
+            self.decoder.decode(data)
+
+    def test_decode_rejects_short_buffer(self):
+        data = self.encode_agent_start("some_id", 1, 2)
+        for length in (4, 10, len(data) - 1):
+            with self.assertRaises(ValueError):
+                self.decoder.decode(data[:length])
+
+    def test_string_cache_is_bounded(self):
+        decoder = ReusableDecoder(messages.agent_stop_t, max_cached_strings=2)
+        for i in range(5):
+            msg = messages.agent_stop_t()
+            msg.agent_id = f"agent_{i}"
+            self.assertEqual(decoder.decode(msg.encode()).agent_id, f"agent_{i}")
+        self.assertLessEqual(len(decoder._strings), 2)
+
+    def test_arrays_are_not_supported(self):
+        with self.assertRaises(TypeError):
+            ReusableDecoder(messages.game_state_t)
+
+    def test_pickle(self):
+        decoder = pickle.loads(pickle.dumps(self.decoder))
+        msg = decoder.decode(self.encode_agent_start("some_id", 1, 2))
+        self.assertEqual(msg.agent_id, "some_id")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import numpy as np
+from coding_challenge.board import Board
+from coding_challenge.env import VecFreezeTagEnv, SubprocVecFreezeTagEnv
+from coding_challenge.scenario import make_scenario
+
+
+class TestVecFreezeTagEnv(unittest.TestCase):
+    def setUp(self):
+        self.scenario = make_scenario(5, 5, [[0, 0]], [[2, 0], [4, 4]], 2.0, 1.0)
+
+    def test_reset_shapes(self):
+        env = VecFreezeTagEnv(8, 10, 12, num_it=2, num_not_it=3, seed=0)
+        observations = env.reset()
+        self.assertEqual(observations["it_positions"].shape, (8, 2, 2))
+        self.assertEqual(observations["not_it_positions"].shape, (8, 3, 2))
+        self.assertTrue(observations["active"].all())
+        self.assertTrue((observations["not_it_positions"][..., 0] < 12).all())
+
+    def test_seeded_reset_is_reproducible(self):
+        first = VecFreezeTagEnv(4, 10, 10, seed=1).reset()
+        second = VecFreezeTagEnv(4, 10, 10, seed=1).reset()
+        np.testing.assert_array_equal(first["it_positions"], second["it_positions"])
+
+    def test_seeded_reset_reproduces_trajectories(self):
+        env = VecFreezeTagEnv(4, 10, 10, num_not_it=2, controlled=None, max_steps=20, seed=1)
+        trajectories = []
+        for _ in range(2):
+            observations = env.reset(seed=5)
+            trajectory = [observations["not_it_positions"]]
+            for _ in range(20):
+                observations, _, _, _ = env.step()
+                trajectory.append(observations["not_it_positions"])
+            trajectories.append(np.stack(trajectory))
+        np.testing.assert_array_equal(trajectories[0], trajectories[1])
+
+    def test_controlled_it_freezes_not_it(self):
+        env = VecFreezeTagEnv.from_scenario(2, self.scenario, controlled="it", not_it_policy="greedy_chase")
+        env.reset()
+        # NotIt agents chase the nearest It agent only on even ticks, so the first step moves the It agent alone.
+        observations, reward, done, info = env.step(np.array([[[1, 0]], [[0, 1]]]))
+        np.testing.assert_array_equal(observations["it_positions"][:, 0], [[1, 0], [0, 1]])
+        np.testing.assert_array_equal(observations["not_it_positions"][:, 0], [[2, 0], [2, 0]])
+        np.testing.assert_array_equal(reward, [0, 0])
+
+        # The NotIt agents step next to the It agents, which stay in place.
+        observations, reward, done, info = env.step(np.zeros((2, 1, 2), dtype=np.int64))
+        np.testing.assert_array_equal(observations["not_it_positions"][:, 0], [[1, 0], [1, 1]])
+        np.testing.assert_array_equal(reward, [1, 0])
+        np.testing.assert_array_equal(observations["active"][0], [False, True])
+        self.assertFalse(done.any())
+
+    def test_auto_reset(self):
+        scenario = make_scenario(5, 5, [[0, 0]], [[1, 0]])
+        env = VecFreezeTagEnv.from_scenario(3, scenario, controlled="it", max_steps=5)
+        env.reset()
+        actions = np.array([[[1, 0]], [[0, 0]], [[0, 1]]])
+        observations, reward, done, info = env.step(actions)
+        self.assertTrue(done[0] and info["terminated"][0])
+        self.assertFalse(info["final_observations"]["active"][0].any())
+        self.assertTrue(observations["active"][0].all())
+        self.assertEqual(observations["steps"][0], 0)
+
+    def test_truncation(self):
+        scenario = make_scenario(9, 9, [[0, 0]], [[8, 8]])
+        env = VecFreezeTagEnv.from_scenario(2, scenario, controlled="it", max_steps=5, seed=0)
+        env.reset()
+        for _ in range(5):
+            observations, reward, done, info = env.step(np.zeros((2, 1, 2), dtype=np.int64))
+        np.testing.assert_array_equal(info["truncated"], [True, True])
+        np.testing.assert_array_equal(observations["steps"], [0, 0])
+
+    def test_walls_block_moves(self):
+        board = Board.from_lines([".#", ".."])
+        scenario = make_scenario(2, 2, [[0, 0]], [[1, 1]])
+        env = VecFreezeTagEnv.from_scenario(1, scenario, controlled="it", board=board)
+        env.reset()
+        observations, _, _, _ = env.step(np.array([[[1, 0]]]))
+        np.testing.assert_array_equal(observations["it_positions"][0], [[0, 0]])
+
+    def test_invalid_actions(self):
+        env = VecFreezeTagEnv(2, 5, 5, num_it=1, controlled="it", seed=0)
+        env.reset()
+        with self.assertRaisesRegex(ValueError, r"\(2, 1, 2\)"):
+            env.step()
+        with self.assertRaisesRegex(ValueError, r"\(2, 1, 2\)"):
+            env.step(np.zeros((2, 2)))
+        np.testing.assert_array_equal(env.steps, [0, 0])
+
+        with self.assertRaises(ValueError):
+            VecFreezeTagEnv(2, 5, 5, controlled=None).step(np.zeros((2, 1, 2)))
+
+    def test_policies_finish_games(self):
+        env = VecFreezeTagEnv(16, 6, 6, num_not_it=2, controlled=None, max_steps=1000, seed=0)
+        env.reset()
+        finished = np.zeros(16, dtype=bool)
+        for _ in range(200):
+            _, reward, done, info = env.step()
+            finished |= info["terminated"]
+        self.assertTrue(finished.all())
+
+
+class TestSubprocVecFreezeTagEnv(unittest.TestCase):
+    def test_matches_single_process(self):
+        kwargs = {"N": 8, "M": 8, "num_not_it": 2, "controlled": None, "max_steps": 10}
+        env = SubprocVecFreezeTagEnv(6, 2, seed=0, **kwargs)
+        try:
+            observations = env.reset(seed=0)
+            self.assertEqual(observations["it_positions"].shape, (6, 1, 2))
+            first = VecFreezeTagEnv(3, seed=0, **kwargs)
+            np.testing.assert_array_equal(observations["it_positions"][:3], first.reset(seed=0)["it_positions"])
+
+            finished = np.zeros(6, dtype=bool)
+            for _ in range(10):
+                observations, reward, done, info = env.step()
+                finished |= done
+                np.testing.assert_array_equal(
+                    observations["not_it_positions"][:3], first.step()[0]["not_it_positions"]
+                )
+            self.assertEqual(reward.shape, (6,))
+            self.assertEqual(info["frozen"].shape, (6, 2))
+            self.assertTrue(finished.all())
+            self.assertIn("final_observations", info)
+        finally:
+            env.close()
+
+    def test_invalid_actions(self):
+        env = SubprocVecFreezeTagEnv(4, 2, seed=0, N=5, M=5, num_not_it=3, controlled="not_it")
+        try:
+            self.assertEqual(env.action_shape, (4, 3, 2))
+            env.reset()
+            with self.assertRaisesRegex(ValueError, r"\(4, 3, 2\)"):
+                env.step()
+            _, reward, _, _ = env.step(np.zeros((4, 3, 2), dtype=np.int64))
+            self.assertEqual(reward.shape, (4,))
+        finally:
+            env.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
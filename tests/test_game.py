@@ -1,5 +1,7 @@
+import threading
 import unittest
-from coding_challenge.game import process_initial_positions
+from coding_challenge.game import process_initial_positions, launch_nodes
+from coding_challenge.node import Node
 
 class TestProcessInitialPositions(unittest.TestCase):
     def test_valid_positions(self):
@@ -39,5 +41,19 @@ class TestProcessInitialPositions(unittest.TestCase):
         with self.assertRaises(ValueError):
             process_initial_positions(args_positions, N, M, num_not_it, num_it)
 
+class ThreadRecordingNode(Node):
+    def on_start(self):
+        self.launch_thread = threading.current_thread()
+
+    def run(self):
+        pass
+
+class TestLaunchNodes(unittest.TestCase):
+    def test_nodes_run_on_their_own_threads(self):
+        nodes = [ThreadRecordingNode() for _ in range(3)]
+        stats = launch_nodes(nodes)
+        self.assertEqual(stats, [node.stats for node in nodes])
+        self.assertEqual(len({node.launch_thread for node in nodes}), 3)
+
 if __name__ == "__main__":
     unittest.main()
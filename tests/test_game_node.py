@@ -1,7 +1,14 @@
+import os
+import queue
+import tempfile
 import threading
 import lcm
+import numpy as np
 import time
 from coding_challenge.agents import NotItAgent
+from coding_challenge.game_node import GameNode
+from coding_challenge.board import Board
+from coding_challenge.checkpoint import encode_walls
 import unittest
 import coding_challenge.messages as messages
 
@@ -34,5 +41,317 @@ class TestGameNode(unittest.TestCase):
         self.assertFalse(self.agent._is_game_running)
         self.assertFalse(self.agent.running)
 
+class TestGameNodeMoves(unittest.TestCase):
+    def setUp(self):
+        self.game_node = GameNode(2, 5, 5)
+        self.game_node.agents["a"] = {"type": "not_it"}
+        self.game_node.set_agent_position("a", 0, 0)
+
+    def send_move(self, x: int, y: int, seq: int):
+        msg = messages.agent_move_t()
+        msg.agent_id = "a"
+        msg.x = x
+        msg.y = y
+        msg.seq = seq
+        self.game_node.agent_move_handler("agent_move", msg.encode())
+
+    def test_dropped_moves_are_counted(self):
+        self.send_move(1, 0, 0)
+        self.send_move(2, 0, 3)
+        self.assertEqual(self.game_node.stats["dropped"], 2)
+        self.assertEqual(self.game_node.agents["a"]["x"], 2)
+
+    def test_moves_into_walls_are_rejected(self):
+        self.game_node.board = Board.from_lines([".#...", ".....", ".....", ".....", "....."])
+        self.send_move(1, 0, 0)
+        self.assertEqual((self.game_node.agents["a"]["x"], self.game_node.agents["a"]["y"]), (0, 0))
+        self.assertEqual(self.game_node.game_board[0][0], ["a"])
+        self.send_move(1, 1, 1)
+        self.assertEqual((self.game_node.agents["a"]["x"], self.game_node.agents["a"]["y"]), (1, 1))
+
+    def test_stale_moves_are_ignored(self):
+        self.send_move(2, 0, 5)
+        self.send_move(1, 0, 4)
+        self.assertEqual(self.game_node.agents["a"]["x"], 2)
+
+    def test_speed_scales_rate(self):
+        self.assertEqual(GameNode(2, 5, 5, rate_hz=1.0, speed=8.0).rate_hz, 8.0)
+
+    def test_silent_agent_is_evicted(self):
+        self.game_node.lc = lcm.LCM()
+        self.game_node.agents["b"] = {"type": "it"}
+        self.game_node.set_agent_position("b", 4, 4)
+        self.game_node.num_it_agents = 1
+        self.game_node.num_not_it_agents = 1
+        self.send_move(1, 0, 0)
+        self.game_node._last_seen["b"] = time.time() - 2 * self.game_node.agent_timeout_s
+
+        self.game_node.evict_silent_agents()
+        self.assertNotIn("b", self.game_node.agents)
+        self.assertIn("a", self.game_node.agents)
+        self.assertEqual(self.game_node.game_board[4][4], [])
+
+        msg = messages.agent_move_t()
+        msg.agent_id = "b"
+        self.game_node.agent_move_handler("agent_move", msg.encode())
+        self.assertNotIn("b", self.game_node.agents)
+
+    def test_respawned_agent_does_not_restart_the_game(self):
+        published = []
+        self.game_node.publish = lambda channel, msg: published.append(channel)
+        self.game_node.agents["b"] = {"type": "not_it"}
+        self.game_node.set_agent_position("b", 4, 4)
+        self.game_node.num_not_it_agents = 2
+        self.game_node.has_game_started = True
+
+        # The load generator stops a frozen agent and starts it again under a new ID.
+        stop = messages.agent_stop_t()
+        stop.agent_id = "a"
+        self.game_node.agent_stop_handler("agent_stop", stop.encode())
+        start = messages.agent_start_t()
+        start.agent_id = "a_1"
+        start.agent_type = "not_it"
+        self.game_node.agent_start_handler("agent_start", start.encode())
+
+        self.assertIn("a_1", self.game_node.agents)
+        self.assertNotIn("game_start", published)
+
+    def test_late_messages_of_stopped_agent_are_ignored(self):
+        self.game_node.lc = lcm.LCM()
+        self.game_node._pending_calls = queue.SimpleQueue()
+        self.game_node.running = True
+        self.game_node.agents["b"] = {"type": "it"}
+        self.game_node.set_agent_position("b", 4, 4)
+        self.game_node.num_it_agents = 1
+        self.game_node.num_not_it_agents = 1
+
+        stop = messages.agent_stop_t()
+        stop.agent_id = "b"
+        self.game_node.agent_stop_handler("agent_stop", stop.encode())
+        self.assertNotIn("b", self.game_node.agents)
+
+        # A move sent before the stop but delayed by the network arrives after it.
+        move = messages.agent_move_t()
+        move.agent_id = "b"
+        move.x, move.y = 3, 3
+        self.game_node.agent_move_handler("agent_move", move.encode())
+        start = messages.agent_start_t()
+        start.agent_id = "b"
+        start.agent_type = "it"
+        self.game_node.agent_start_handler("agent_start", start.encode())
+        self.game_node.agent_stop_handler("agent_stop", stop.encode())
+
+        self.assertTrue(self.game_node.running)
+        self.assertNotIn("b", self.game_node.agents)
+        self.assertEqual(self.game_node.num_it_agents, 0)
+
+
+class TestGameNodePositionSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.game_node = GameNode(1, 5, 5)
+        for agent_id, agent_type, x, y in [("a", "it", 0, 0), ("b", "not_it", 1, 1), ("c", "not_it", 2, 2)]:
+            self.game_node.agents[agent_id] = {"type": agent_type}
+            self.game_node.set_agent_position(agent_id, x, y)
+        self.game_node.num_it_agents = 1
+        self.game_node.num_not_it_agents = 2
+
+    def test_snapshot_is_published_on_swap(self):
+        self.assertEqual(len(self.game_node.position_snapshot["positions"]), 0)
+        self.game_node.swap_position_snapshot()
+        snapshot = self.game_node.position_snapshot
+        self.assertEqual(snapshot["agent_ids"], ("a", "b", "c"))
+        np.testing.assert_array_equal(snapshot["positions"], [[0, 0], [1, 1], [2, 2]])
+        np.testing.assert_array_equal(snapshot["is_it"], [True, False, False])
+        with self.assertRaises(ValueError):
+            snapshot["positions"][0, 0] = 4
+
+        self.game_node.set_agent_position("b", 1, 2)
+        np.testing.assert_array_equal(snapshot["positions"][1], [1, 1])
+        self.game_node.swap_position_snapshot()
+        np.testing.assert_array_equal(self.game_node.position_snapshot["positions"][1], [1, 2])
+
+    def test_snapshot_is_published_between_ticks(self):
+        game_node = GameNode(2, 5, 5, rate_hz=1.0)
+        thread = threading.Thread(target=game_node.launch_node)
+        thread.start()
+        time.sleep(0.05)
+
+        lc = lcm.LCM()
+        msg = messages.agent_start_t()
+        msg.agent_id = "a"
+        msg.agent_type = "it"
+        msg.x, msg.y = 3, 4
+        lc.publish("agent_start", msg.encode())
+        time.sleep(0.05)
+        snapshot = game_node.position_snapshot
+        game_node.stop_node()
+        thread.join()
+
+        self.assertEqual(snapshot["agent_ids"], ("a",))
+        np.testing.assert_array_equal(snapshot["positions"], [[3, 4]])
+
+    def test_held_snapshot_is_not_overwritten(self):
+        self.game_node.swap_position_snapshot()
+        snapshot = self.game_node.position_snapshot
+        for i in range(3):
+            self.game_node.set_agent_position("b", 4, i)
+            self.game_node.swap_position_snapshot()
+        self.assertEqual(snapshot["tick"], 0)
+        np.testing.assert_array_equal(snapshot["positions"], [[0, 0], [1, 1], [2, 2]])
+        np.testing.assert_array_equal(self.game_node.position_snapshot["positions"][1], [4, 2])
+
+    def test_removed_agents_leave_the_snapshot(self):
+        self.game_node.remove_agent("a")
+        self.game_node.swap_position_snapshot()
+        snapshot = self.game_node.position_snapshot
+        self.assertEqual(snapshot["agent_ids"], ("c", "b"))
+        np.testing.assert_array_equal(snapshot["positions"], [[2, 2], [1, 1]])
+        self.assertFalse(snapshot["is_it"].any())
+
+    def test_buffers_grow(self):
+        for i in range(10):
+            agent_id = f"d{i}"
+            self.game_node.agents[agent_id] = {"type": "not_it"}
+            self.game_node.set_agent_position(agent_id, i % 5, 4)
+        self.game_node.swap_position_snapshot()
+        self.game_node.swap_position_snapshot()
+        self.assertEqual(len(self.game_node.position_snapshot["positions"]), 13)
+        self.assertEqual(self.game_node.position_snapshot["agent_ids"][-1], "d9")
+
+    def test_concurrent_reader(self):
+        stop = threading.Event()
+        errors = []
+
+        def read():
+            while not stop.is_set():
+                snapshot = self.game_node.position_snapshot
+                try:
+                    self.assertEqual(len(snapshot["positions"]), len(snapshot["is_it"]))
+                    snapshot["positions"][~snapshot["is_it"]]
+                except Exception as e:
+                    errors.append(e)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        for i in range(2000):
+            self.game_node.set_agent_position("b", i % 5, (i // 5) % 5)
+            self.game_node.swap_position_snapshot()
+        stop.set()
+        reader.join()
+        self.assertEqual(errors, [])
+
+
+class TestGameNodeCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "game.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def create_game_node(self) -> GameNode:
+        game_node = GameNode(3, 5, 5, checkpoint_path=self.path)
+        for agent_id, agent_type, x, y in [("a", "it", 0, 0), ("b", "not_it", 2, 3), ("c", "not_it", 2, 3)]:
+            game_node.agents[agent_id] = {"type": agent_type}
+            game_node.set_agent_position(agent_id, x, y)
+        game_node.num_it_agents = 1
+        game_node.num_not_it_agents = 2
+        game_node.has_game_started = True
+        return game_node
+
+    def test_snapshot_round_trip(self):
+        game_node = self.create_game_node()
+        game_node.save_checkpoint()
+
+        resumed = GameNode.from_checkpoint(self.path)
+        self.assertEqual(resumed.agents, game_node.agents)
+        self.assertEqual(resumed.game_board, game_node.game_board)
+        self.assertEqual(resumed.num_not_it_agents, 2)
+        self.assertTrue(resumed.has_game_started)
+
+    def test_resume_publishes_game_start(self):
+        self.create_game_node().save_checkpoint()
+        resumed = GameNode.from_checkpoint(self.path)
+
+        lc = lcm.LCM()
+        received = []
+        lc.subscribe("game_start", lambda channel, data: received.append(channel))
+        thread = threading.Thread(target=resumed.launch_node)
+        thread.start()
+        lc.handle_timeout(1000)
+        resumed.stop_node()
+        thread.join()
+
+        self.assertEqual(received, ["game_start"])
+        # The game was stopped without ending, so it can still be resumed.
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_checkpoints_are_written_off_the_game_loop(self):
+        game_node = self.create_game_node()
+        game_node.rate_hz = 100.0
+        game_node.checkpoint_interval_s = 0.0
+        snapshot_threads = []
+        get_snapshot = game_node.get_snapshot
+
+        def record_thread():
+            snapshot_threads.append(threading.current_thread())
+            return get_snapshot()
+
+        game_node.get_snapshot = record_thread
+        thread = threading.Thread(target=game_node.launch_node)
+        thread.start()
+        time.sleep(0.1)
+        game_node.stop_node()
+        thread.join()
+
+        self.assertTrue(snapshot_threads)
+        self.assertTrue(all(t is game_node.thread for t in snapshot_threads))
+        self.assertFalse(game_node._checkpoint_writer.is_alive())
+        self.assertEqual(set(GameNode.from_checkpoint(self.path).agents), {"a", "b", "c"})
+
+    def test_checkpoint_is_removed_when_the_game_ends(self):
+        game_node = self.create_game_node()
+        game_node.lc = lcm.LCM()
+        game_node.save_checkpoint()
+        game_node.remove_agent("b")
+        game_node.remove_agent("c")
+        game_node.on_stop()
+        self.assertTrue(game_node.has_game_ended)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_counters_are_recomputed_on_restore(self):
+        game_node = self.create_game_node()
+        # An agent whose agent_start was handled but who has no position yet is not saved.
+        game_node.agents["d"] = {"type": "not_it"}
+        game_node.num_not_it_agents = 3
+        game_node.save_checkpoint()
+
+        resumed = GameNode.from_checkpoint(self.path)
+        self.assertEqual(resumed.num_it_agents, 1)
+        self.assertEqual(resumed.num_not_it_agents, 2)
+
+    def test_walls_are_restored(self):
+        walls = np.zeros((5, 5), dtype=bool)
+        walls[4, 4] = True
+        game_node = self.create_game_node()
+        game_node.board = Board(walls)
+        game_node._encoded_walls = encode_walls(walls)
+        game_node.save_checkpoint()
+
+        resumed = GameNode.from_checkpoint(self.path)
+        np.testing.assert_array_equal(resumed.board.walls, walls)
+        resumed = GameNode.from_checkpoint(self.path, board=Board(walls))
+        np.testing.assert_array_equal(resumed.board.walls, walls)
+        with self.assertRaises(ValueError):
+            GameNode.from_checkpoint(self.path, board=Board.empty(5, 5))
+
+    def test_restore_into_wall_fails(self):
+        snapshot = self.create_game_node().get_snapshot()
+        walls = np.zeros((5, 5), dtype=bool)
+        walls[3, 2] = True
+        with self.assertRaises(ValueError):
+            GameNode(3, 5, 5, board=Board(walls)).restore_snapshot(snapshot)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,156 @@
+import threading
+import time
+import unittest
+import lcm
+from coding_challenge.impairment import Impairment, make_profile, PROFILES
+from coding_challenge.node import Node
+import coding_challenge.messages as messages
+
+
+def drain(impairment: Impairment, timeout_s: float = 2.0):
+    deadline = time.monotonic() + timeout_s
+    while impairment.get_time_to_next_delivery() is not None and time.monotonic() < deadline:
+        time.sleep(0.001)
+        impairment.flush()
+
+
+class TestImpairment(unittest.TestCase):
+    def setUp(self):
+        self.delivered = []
+
+    def deliver(self, channel: str, data: bytes):
+        self.delivered.append(data)
+
+    def submit(self, impairment: Impairment, num_messages: int, size: int = 1):
+        for i in range(num_messages):
+            impairment.submit("channel", i.to_bytes(4, "big") * size, self.deliver)
+
+    def test_clean_link_delivers_immediately(self):
+        impairment = Impairment(PROFILES["clean"])
+        self.submit(impairment, 100)
+        self.assertEqual(len(self.delivered), 100)
+        self.assertEqual(self.delivered, sorted(self.delivered))
+
+    def test_drop_rate_is_seeded(self):
+        profile = make_profile(drop_rate=0.3)
+        impairment = Impairment(profile, seed=0)
+        self.submit(impairment, 10000)
+        first = list(self.delivered)
+        self.assertAlmostEqual(impairment.stats["dropped"] / 10000, 0.3, delta=0.02)
+
+        self.delivered = []
+        self.submit(Impairment(profile, seed=0), 10000)
+        self.assertEqual(self.delivered, first)
+
+    def test_delay(self):
+        impairment = Impairment(make_profile(delay_s=0.05))
+        start_time = time.monotonic()
+        self.submit(impairment, 1)
+        self.assertEqual(self.delivered, [])
+        self.assertGreater(impairment.get_time_to_next_delivery(), 0.03)
+        drain(impairment)
+        self.assertEqual(len(self.delivered), 1)
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.05)
+
+    def test_reordering(self):
+        impairment = Impairment(make_profile(reorder_rate=0.5, reorder_delay_s=0.01), seed=0)
+        self.submit(impairment, 100)
+        drain(impairment)
+        self.assertEqual(len(self.delivered), 100)
+        self.assertNotEqual(self.delivered, sorted(self.delivered))
+        self.assertGreater(impairment.stats["reordered"], 0)
+
+    def test_bandwidth_cap(self):
+        impairment = Impairment(make_profile(bandwidth_bytes_per_s=10000.0, max_backlog_s=0.05))
+        start_time = time.monotonic()
+        self.submit(impairment, 20, size=25)
+        # 100 bytes per message take 10ms each, so only the first ones fit into the backlog.
+        self.assertGreater(impairment.stats["overflowed"], 10)
+        drain(impairment)
+        self.assertEqual(len(self.delivered), 20 - impairment.stats["overflowed"])
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.01 * len(self.delivered) - 0.005)
+
+    def test_delay_distributions(self):
+        for distribution in ("uniform", "normal", "exponential"):
+            impairment = Impairment(make_profile(delay_s=0.01, jitter_s=0.005, delay_distribution=distribution), seed=0)
+            delays = [impairment.sample_delay() for _ in range(2000)]
+            self.assertTrue(all(delay >= 0 for delay in delays))
+            self.assertAlmostEqual(sum(delays) / len(delays), 0.01, delta=0.002)
+
+    def test_invalid_profile(self):
+        with self.assertRaises(ValueError):
+            make_profile(loss=0.1)
+        with self.assertRaises(ValueError):
+            make_profile(delay_distribution="pareto")
+
+
+class ListenerNode(Node):
+    def __init__(self):
+        super().__init__()
+        self.received = []
+
+    def handler(self, _channel, data: bytes):
+        self.received.append(time.monotonic())
+
+    def on_start(self):
+        self.subscribe("impairment_test", self.handler)
+
+    def run(self):
+        while self.running:
+            time.sleep(0.01)
+
+    def on_stop(self):
+        pass
+
+
+class StoppingNode(ListenerNode):
+    def on_stop(self):
+        self.publish("impairment_stop", messages.game_stop_t())
+
+
+class TestNodeImpairment(unittest.TestCase):
+    def launch(self, profile) -> ListenerNode:
+        node = ListenerNode()
+        node.set_impairment(profile, seed=0)
+        thread = threading.Thread(target=node.launch_node)
+        thread.start()
+        time.sleep(0.05)
+
+        lc = lcm.LCM()
+        self.sent_time = time.monotonic()
+        for _ in range(10):
+            lc.publish("impairment_test", messages.game_start_t().encode())
+        time.sleep(0.2)
+        node.stop_node()
+        thread.join()
+        return node
+
+    def test_received_messages_are_delayed(self):
+        node = self.launch(make_profile(delay_s=0.1))
+        self.assertEqual(len(node.received), 10)
+        self.assertGreaterEqual(min(node.received) - self.sent_time, 0.1)
+
+    def test_received_messages_are_dropped(self):
+        node = self.launch(make_profile(drop_rate=1.0))
+        self.assertEqual(node.received, [])
+        self.assertEqual(node.stats["received"], 10)
+
+    def test_delayed_messages_are_sent_on_stop(self):
+        lc = lcm.LCM()
+        received = []
+        lc.subscribe("impairment_stop", lambda channel, data: received.append(channel))
+
+        node = StoppingNode()
+        node.set_impairment(make_profile(delay_s=0.1), seed=0, publish=True, receive=False)
+        thread = threading.Thread(target=node.launch_node)
+        thread.start()
+        time.sleep(0.05)
+        node.stop_node()
+        thread.join()
+
+        lc.handle_timeout(100)
+        self.assertEqual(received, ["impairment_stop"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import lcm
+import numpy as np
+import coding_challenge.messages as messages
+from coding_challenge.load_generator import LoadGenerator, is_saturated
+
+
+class TestLoadGenerator(unittest.TestCase):
+    def setUp(self):
+        self.generator = LoadGenerator(0, 1, 2, 10, 10, rate_hz=100.0, duration_s=1.0)
+        self.generator.positions[:] = [[0, 0], [5, 5], [6, 6]]
+        for index in range(3):
+            self.generator.occupy(index, self.generator.get_cell(index))
+
+    def send_freeze(self, agent_id: str):
+        msg = messages.game_freeze_agent_t()
+        msg.agent_id = agent_id
+        self.generator.game_freeze_agent_handler("game_freeze_agent", msg.encode())
+
+    def test_registration_expects_no_freezes(self):
+        self.generator.occupy(1, (0, 0))
+        self.assertEqual(self.generator._pending_freezes, {})
+
+    def test_move_onto_it_expects_freeze(self):
+        self.generator.vacate(1, (5, 5))
+        self.generator.occupy(1, (0, 0), now=1.0)
+        self.assertEqual(self.generator._pending_freezes, {1: 1.0})
+
+    def test_it_move_expects_freezes_in_cell(self):
+        self.generator.vacate(0, (0, 0))
+        self.generator.occupy(0, (5, 5), now=1.0)
+        self.assertEqual(self.generator._pending_freezes, {1: 1.0})
+
+    def test_freeze_records_latency(self):
+        self.generator.occupy(1, (0, 0), now=0.0)
+        self.send_freeze("load_0_1")
+        self.send_freeze("load_0_2")
+        self.send_freeze("some_id")
+        self.assertEqual(len(self.generator.stats["freeze_latencies_s"]), 1)
+        self.assertEqual(self.generator.stats["unexpected_freezes"], 1)
+        self.assertEqual(self.generator._frozen, [1, 2])
+
+    def test_frozen_agents_are_not_counted_as_moves(self):
+        self.generator.lc = lcm.LCM()
+        self.generator._frozen.append(2)
+        self.generator.publish_moves(np.arange(3), now=0.0)
+        self.assertEqual(self.generator.stats["moves_sent"], 2)
+
+    def test_respawned_agents_get_new_ids(self):
+        self.generator.lc = lcm.LCM()
+        self.send_freeze("load_0_1")
+        self.generator.respawn_frozen_agents()
+        self.assertEqual(self.generator.agent_ids[1], "load_0_1_1")
+        self.assertEqual(self.generator.agent_indices["load_0_1_1"], 1)
+        self.assertNotIn("load_0_1", self.generator.agent_indices)
+
+    def test_expired_freezes_are_missed(self):
+        self.generator.occupy(1, (0, 0), now=0.0)
+        self.generator.expire_pending_freezes(self.generator.freeze_timeout_s + 1.0)
+        self.assertEqual(self.generator.stats["missed_freezes"], 1)
+
+
+class TestIsSaturated(unittest.TestCase):
+    def setUp(self):
+        self.report = {
+            "achieved_rate_hz": 1000.0,
+            "duration_s": 10.0,
+            "p99_ms": 5.0,
+            "missed_freezes": 0,
+            "dropped_moves": 5,
+            "game_node_cpu": 0.5,
+        }
+
+    def test_healthy(self):
+        self.assertFalse(is_saturated(self.report, 100.0, 0.001))
+
+    def test_latency(self):
+        self.assertTrue(is_saturated(dict(self.report, p99_ms=500.0), 100.0, 0.001))
+
+    def test_drops(self):
+        self.assertTrue(is_saturated(dict(self.report, dropped_moves=50), 100.0, 0.001))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import time
+import unittest
+from coding_challenge.node import Node
+
+
+class TestNodeTicks(unittest.TestCase):
+    def setUp(self):
+        self.node = Node()
+
+    def test_tick_within_period(self):
+        start_time = time.time()
+        self.node.sleep_until_next_tick(start_time, 100.0)
+        self.assertGreaterEqual(time.time() - start_time, 0.009)
+        self.assertEqual(self.node.stats["ticks"], 1)
+        self.assertEqual(self.node.stats["overruns"], 0)
+
+    def test_tick_overrun(self):
+        start_time = time.time()
+        time.sleep(0.02)
+        self.node.sleep_until_next_tick(start_time, 100.0)
+        self.assertEqual(self.node.stats["overruns"], 1)
+
+    def test_late_tick_start_is_overrun(self):
+        start_time = time.time()
+        self.node.sleep_until_next_tick(start_time, 100.0)
+        self.node.sleep_until_next_tick(start_time + 0.03, 100.0)
+        self.assertEqual(self.node.stats["overruns"], 1)
+        self.assertAlmostEqual(self.node.stats["max_tick_lag_s"], 0.02, places=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import numpy as np
+from coding_challenge.board import Board
+from coding_challenge.policies import (
+    RandomWalkPolicy,
+    GreedyChasePolicy,
+    make_observations,
+    make_policy,
+    apply_actions,
+)
+
+
+class TestRandomWalkPolicy(unittest.TestCase):
+    def setUp(self):
+        self.N = 5
+        self.M = 10
+        self.policy = RandomWalkPolicy(self.N, self.M, seed=0)
+
+    def test_actions_stay_inside_grid(self):
+        positions = np.array([[0, 0], [9, 4], [0, 4], [9, 0], [5, 2]] * 100)
+        for _ in range(10):
+            actions = self.policy.act(make_observations(positions))
+            self.assertTrue(np.all(np.abs(actions) <= 1))
+            new_positions = positions + actions
+            self.assertTrue(np.all(new_positions >= 0))
+            self.assertTrue(np.all(new_positions[:, 0] < self.M))
+            self.assertTrue(np.all(new_positions[:, 1] < self.N))
+
+    def test_corner_uses_all_valid_actions(self):
+        positions = np.zeros((1000, 2), dtype=np.int64)
+        actions = self.policy.act(make_observations(positions))
+        self.assertEqual(len(np.unique(actions, axis=0)), 4)
+
+    def test_avoids_walls(self):
+        board = Board.from_lines(["...", ".##", "..."])
+        policy = RandomWalkPolicy(3, 3, board, seed=0)
+        positions = np.zeros((1000, 2), dtype=np.int64)
+        actions = policy.act(make_observations(positions))
+        np.testing.assert_array_equal(np.unique(actions, axis=0), [[0, 0], [0, 1], [1, 0]])
+
+
+class TestGreedyChasePolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = GreedyChasePolicy(10, 10)
+
+    def test_moves_towards_target(self):
+        observations = make_observations([[0, 0], [5, 5], [3, 3]], [[4, 0], [2, 9], [3, 3]])
+        actions = self.policy.act(observations)
+        np.testing.assert_array_equal(actions, [[1, 0], [-1, 1], [0, 0]])
+
+    def test_without_target_stays(self):
+        observations = make_observations([[0, 0], [5, 5]], [[4, 4], [0, 0]], [True, False])
+        actions = self.policy.act(observations)
+        np.testing.assert_array_equal(actions, [[1, 1], [0, 0]])
+
+    def test_goes_around_walls(self):
+        board = Board.from_lines([".#.", ".#.", "..."])
+        policy = GreedyChasePolicy(3, 3, board)
+        positions = np.array([[0, 0], [0, 0]])
+        observations = make_observations(positions, [[2, 0], [0, 1]], [True, False])
+        for _ in range(4):
+            actions = policy.act(observations)
+            observations["positions"] = apply_actions(observations["positions"], actions, 3, 3, board)
+        np.testing.assert_array_equal(observations["positions"], [[2, 0], [0, 0]])
+
+
+class TestPolicyHelpers(unittest.TestCase):
+    def test_apply_actions_keeps_agents_inside_grid(self):
+        positions = np.array([[0, 0], [9, 4]])
+        actions = np.array([[-1, 0], [0, 1]])
+        np.testing.assert_array_equal(apply_actions(positions, actions, 5, 10), positions)
+        np.testing.assert_array_equal(
+            apply_actions(positions, -actions, 5, 10), [[1, 0], [9, 3]]
+        )
+
+    def test_apply_actions_rejects_walls(self):
+        board = Board.from_lines([".#", ".."])
+        positions = np.array([[0, 0], [0, 0]])
+        actions = np.array([[1, 0], [0, 1]])
+        np.testing.assert_array_equal(apply_actions(positions, actions, 2, 2, board), [[0, 0], [0, 1]])
+
+    def test_make_observations_without_targets(self):
+        observations = make_observations([[1, 2]])
+        self.assertFalse(observations["has_target"][0])
+
+    def test_make_policy(self):
+        self.assertIsInstance(make_policy("greedy_chase", 5, 5), GreedyChasePolicy)
+        with self.assertRaises(ValueError):
+            make_policy("unknown", 5, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from coding_challenge.board import Board
+from coding_challenge.scenario import (
+    make_scenario,
+    generate_scenario,
+    load_scenario,
+    save_scenario,
+    validate_positions,
+    validate_scenario,
+)
+
+
+class TestScenarioFiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.scenario = make_scenario(5, 6, [[0, 0]], [[1, 2], [3, 4]], 4.0, 2.0, "map.txt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assert_scenarios_equal(self, loaded, expected):
+        np.testing.assert_array_equal(loaded["it_positions"], expected["it_positions"])
+        np.testing.assert_array_equal(loaded["not_it_positions"], expected["not_it_positions"])
+        for key in ("N", "M", "it_rate_hz", "not_it_rate_hz"):
+            self.assertEqual(loaded[key], expected[key])
+        self.assertEqual(loaded["map"], os.path.join(self.directory.name, "map.txt"))
+
+    def test_json_round_trip(self):
+        path = os.path.join(self.directory.name, "scenario.json")
+        save_scenario(path, self.scenario)
+        self.assert_scenarios_equal(load_scenario(path), self.scenario)
+
+    def test_npz_round_trip(self):
+        path = os.path.join(self.directory.name, "scenario.npz")
+        save_scenario(path, self.scenario)
+        self.assert_scenarios_equal(load_scenario(path), self.scenario)
+
+    def test_json_with_npy_positions(self):
+        np.save(os.path.join(self.directory.name, "not_it.npy"), self.scenario["not_it_positions"])
+        path = os.path.join(self.directory.name, "scenario.json")
+        with open(path, "w") as f:
+            f.write('{"N": 5, "M": 6, "it_positions": [[0, 0]], "not_it_positions": "not_it.npy", '
+                    '"it_rate_hz": 4.0, "not_it_rate_hz": 2.0, "map": "map.txt"}')
+        self.assert_scenarios_equal(load_scenario(path), self.scenario)
+
+    def test_unsupported_file(self):
+        with self.assertRaises(ValueError):
+            save_scenario(os.path.join(self.directory.name, "scenario.txt"), self.scenario)
+
+
+class TestScenarioValidation(unittest.TestCase):
+    def test_out_of_bounds(self):
+        with self.assertRaises(ValueError):
+            validate_positions(np.array([[0, 0], [6, 0]]), 5, 6)
+        with self.assertRaises(ValueError):
+            validate_positions(np.array([[0, -1]]), 5, 6)
+
+    def test_inside_wall(self):
+        board = Board.from_lines(["..", ".#"])
+        validate_positions(np.array([[0, 0], [1, 0]]), 2, 2, board)
+        with self.assertRaises(ValueError):
+            validate_positions(np.array([[0, 0], [1, 1]]), 2, 2, board)
+
+    def test_map_size_mismatch(self):
+        scenario = make_scenario(3, 3, [[0, 0]], [[1, 1]])
+        with self.assertRaises(ValueError):
+            validate_scenario(scenario, Board.empty(3, 4))
+
+    def test_missing_agents(self):
+        with self.assertRaises(ValueError):
+            validate_scenario(make_scenario(3, 3, [[0, 0]], []))
+
+
+class TestScenarioGeneration(unittest.TestCase):
+    def test_seeded_generation_is_reproducible(self):
+        for placement in ("uniform", "clustered"):
+            first = generate_scenario(50, 40, 2, 1000, placement, seed=3)
+            second = generate_scenario(50, 40, 2, 1000, placement, seed=3)
+            np.testing.assert_array_equal(first["not_it_positions"], second["not_it_positions"])
+            self.assertEqual(first["it_positions"].shape, (2, 2))
+            validate_scenario(first)
+
+    def test_generation_avoids_walls(self):
+        walls = np.random.default_rng(0).random((20, 30)) < 0.4
+        walls[10, 15] = False
+        board = Board(walls)
+        for placement in ("uniform", "clustered"):
+            scenario = generate_scenario(20, 30, 1, 5000, placement, seed=0, board=board)
+            validate_scenario(scenario, board)
+
+    def test_clusters_are_compact(self):
+        scenario = generate_scenario(
+            1000, 1000, 1, 1000, "clustered", seed=0, num_clusters=1, spread=1.0
+        )
+        self.assertLess(np.ptp(scenario["not_it_positions"], axis=0).max(), 20)
+
+    def test_unknown_placement(self):
+        with self.assertRaises(ValueError):
+            generate_scenario(5, 5, 1, 1, "diagonal")
+
+
+if __name__ == "__main__":
+    unittest.main()